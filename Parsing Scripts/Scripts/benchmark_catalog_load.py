@@ -0,0 +1,52 @@
+# Description: Benchmark of a bare pd.read_csv against load_catalog (catalog_schema.py) on the full catalog.
+# Both load the same CSV text; prints the load time and the in-memory size (memory_usage(deep=True)) of each.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/benchmark_catalog_load.py" [catalog.csv | directory of program CSVs]
+#
+# With no argument the per-program CSVs in New_Work/Seperate_Programs_and_degrees-CSV_Files are joined into
+# one catalog (a single header followed by every row), which is the layout of the ISRS export.
+
+import io
+import os
+import sys
+import glob
+import timeit
+import pandas as pd
+from catalog_schema import load_catalog
+
+DEFAULT_SOURCE = "New_Work/Seperate_Programs_and_degrees-CSV_Files"
+
+
+def read_catalog_text(source):
+    """
+    Returns the catalog as CSV text, joining the program files of a directory under one header.
+    """
+    if not os.path.isdir(source):
+        with open(source, encoding="utf-8") as f:
+            return f.read()
+
+    parts = []
+    for index, file in enumerate(sorted(glob.glob(os.path.join(source, "*.csv")))):
+        with open(file, encoding="utf-8") as f:
+            header = f.readline()
+            if index == 0:
+                parts.append(header)
+            parts.append(f.read())
+    return "".join(parts)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SOURCE
+    text = read_catalog_text(source)
+
+    loaders = [("read_csv", lambda: pd.read_csv(io.StringIO(text))),
+               ("load_catalog", lambda: load_catalog(io.StringIO(text)))]
+    results = {}
+    for name, loader in loaders:
+        df = loader()
+        best = min(timeit.repeat(loader, number=1, repeat=10))
+        results[name] = df.memory_usage(deep=True).sum()
+        print(f"{name:>12}: {len(df)} rows, {best * 1000:7.1f} ms, {results[name] / 1e6:6.2f} MB in memory")
+
+    print(f"Memory saved: {1 - results['load_catalog'] / results['read_csv']:.0%}")
@@ -0,0 +1,58 @@
+# Description: Micro-benchmark of the row-wise ProgramName/credit label code against normalize_catalog.
+# Runs both versions on the full catalog, checks they give the same result and prints the timings.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/benchmark_normalization.py" [catalog.csv | directory of program CSVs]
+#
+# With no argument the per-program CSVs in New_Work/Seperate_Programs_and_degrees-CSV_Files are
+# concatenated, which together hold every row of the ISRS catalog export.
+
+import os
+import sys
+import glob
+import timeit
+import pandas as pd
+from requirement_extraction import update_program_name, extract_credits, normalize_catalog
+
+DEFAULT_SOURCE = "New_Work/Seperate_Programs_and_degrees-CSV_Files"
+
+
+def load_full_catalog(source):
+    """
+    Loads the catalog from a single CSV file or from every CSV file in a directory.
+    """
+    if os.path.isdir(source):
+        files = sorted(glob.glob(os.path.join(source, "*.csv")))
+        return pd.concat([pd.read_csv(file) for file in files], ignore_index=True)
+    return pd.read_csv(source)
+
+
+def row_wise(main_record):
+    """
+    The original maximusV2 steps: apply(update_program_name) and extract_credits inside iterrows.
+    """
+    main_record = main_record.copy()
+    main_record['ProgramName'] = main_record.apply(update_program_name, axis=1)
+    credit_labels = []
+    for _, row in main_record.iterrows():
+        category_note = str(row["Group_CategoryNotes"]).strip() if pd.notna(row["Group_CategoryNotes"]) else ""
+        credit_labels.append(extract_credits(row["GroupCredits"], category_note))
+    return main_record['ProgramName'].tolist(), credit_labels
+
+
+def vectorized(main_record):
+    main_record = normalize_catalog(main_record.copy())
+    return main_record['ProgramName'].tolist(), main_record['CreditLabel'].tolist()
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SOURCE
+    catalog = load_full_catalog(source)
+    print(f"Loaded {len(catalog)} rows from {source}")
+
+    if row_wise(catalog) != vectorized(catalog):
+        sys.exit("Error: row-wise and vectorized results differ")
+
+    for name, function, repeat in [("row-wise", row_wise, 3), ("vectorized", vectorized, 20)]:
+        best = min(timeit.repeat(lambda: function(catalog), number=1, repeat=repeat))
+        print(f"{name:>10}: {best * 1000:8.1f} ms")
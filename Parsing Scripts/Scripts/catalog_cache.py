@@ -0,0 +1,297 @@
+# Description: Columnar cache of the ISRS catalog workbook.
+# pd.read_excel of the full catalog xlsx is the slowest load in the project. The first load converts the workbook
+# (or a CSV export of it) once to a Parquet file; later loads read that file with the catalog_schema.py dtypes,
+# which takes a fraction of the time and can read only the columns a script needs. The conversion streams the
+# workbook row by row (openpyxl's read-only mode never builds the whole sheet) and writes every chunk of rows as
+# one Parquet row group, so memory stays bounded by the chunk size however large the workbook is, and a
+# workbook with one sheet per catalog year can be converted in one pass with --sheets. A small JSON file next to
+# the Parquet file records the source's modification time, size and SHA-256: when the time and size still match
+# the cache is used as is, and when they changed the source is hashed so that a touched but unchanged file does
+# not cause a new conversion.
+#
+# Needs pyarrow for the Parquet file and openpyxl for xlsx sources (pip install pyarrow openpyxl).
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/catalog_cache.py" "Data/2024-25_Academic_Program_Catalog_with_Courses_with_pre-req,_co-req_diverse_cultures_10-1-24.xlsx"
+#   python "Parsing Scripts/Scripts/catalog_cache.py" catalog_all_years.xlsx --sheets 2023-24 2024-25 --chunk-rows 20000
+
+import os
+import csv
+import sys
+import json
+import time
+import hashlib
+import argparse
+import pandas as pd
+from collections import namedtuple
+from catalog_schema import CATALOG_DTYPES, apply_catalog_dtypes
+from program_output import atomic_open
+
+# Bump when the conversion changes, so files converted by an older version are converted again
+CATALOG_CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = "Data/.catalog_cache"
+DEFAULT_CHUNK_ROWS = 50000
+
+# Integer columns of the ISRS layout; every other column is stored as text (CourseNumber 200 becomes "200")
+INTEGER_COLUMNS = [column for column, dtype in CATALOG_DTYPES.items() if dtype.startswith("Int")]
+# Text columns with few distinct values are dictionary-encoded in the Parquet file
+DICTIONARY_COLUMNS = [column for column, dtype in CATALOG_DTYPES.items() if dtype == "category"]
+
+# source:    path of the workbook or CSV the cache was converted from
+# version:   CATALOG_CACHE_VERSION at conversion time
+# mtime_ns:  modification time of the source at conversion (or last verification)
+# size:      size of the source in bytes
+# sha256:    hash of the source's content
+# sheets:    workbook sheets that were converted (None for the first sheet or a CSV source)
+CacheInfo = namedtuple("CacheInfo", ["source", "version", "mtime_ns", "size", "sha256", "sheets"])
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Error: the catalog cache needs pyarrow. Install it with: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def _require_openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        sys.exit("Error: reading xlsx workbooks needs openpyxl. Install it with: pip install openpyxl")
+    return openpyxl
+
+
+def file_sha256(path):
+    """
+    Returns the SHA-256 of a file, read in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(source, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the (Parquet file, info file) paths of a source; sources with the same name in different
+    folders get different entries.
+    """
+    name = os.path.splitext(os.path.basename(source))[0]
+    key = hashlib.sha256(os.path.abspath(source).encode("utf-8")).hexdigest()[:12]
+    base = os.path.join(cache_dir, f"{name[:60]}-{key}")
+    return base + ".parquet", base + ".json"
+
+
+def is_workbook(source):
+    return source.lower().endswith((".xlsx", ".xlsm"))
+
+
+def iter_source_rows(source, sheets=None):
+    """
+    Streams the rows of a workbook or CSV export.
+
+    A workbook is opened in read-only mode, which reads the sheet XML as it goes instead of loading
+    every cell. With several sheets, each must start with the same header row; the header rows after
+    the first sheet's are skipped.
+
+    Parameters:
+    source (str): The xlsx workbook or CSV export.
+    sheets (list of str): Sheets to read, in order; None reads the first sheet.
+
+    Returns:
+    tuple: (header as a list of str, iterator over the data rows as tuples of cell values)
+    """
+    if not is_workbook(source):
+        # utf-8-sig drops the byte order mark Excel writes at the start of a CSV export
+        f = open(source, newline="", encoding="utf-8-sig")
+        reader = csv.reader(f)
+        header = next(reader, [])
+
+        def csv_rows():
+            with f:
+                yield from reader
+        return header, csv_rows()
+
+    workbook = _require_openpyxl().load_workbook(source, read_only=True, data_only=True)
+    worksheets = [workbook[name] for name in sheets] if sheets else [workbook.worksheets[0]]
+    row_iters = [worksheet.iter_rows(values_only=True) for worksheet in worksheets]
+    header = [str(value).strip() if value is not None else "" for value in next(row_iters[0], ())]
+
+    def workbook_rows():
+        try:
+            for number, rows in enumerate(row_iters):
+                if number > 0:
+                    sheet_header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+                    if sheet_header != header:
+                        raise ValueError(f"Sheet {worksheets[number].title} does not have the header of {worksheets[0].title}")
+                for row in rows:
+                    # Trailing rows that only hold formatting come back as all None
+                    if any(value is not None for value in row):
+                        yield row
+        finally:
+            workbook.close()
+    return header, workbook_rows()
+
+
+def _text_cell(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _integer_cell(value):
+    if value is None or value == "":
+        return None
+    return int(float(value))
+
+
+def write_parquet_chunks(header, rows, parquet_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Writes streamed rows to a Parquet file, one row group per chunk of rows, so at most chunk_rows rows are
+    held in memory. Cells are typed while they are copied into the chunk: integer columns as integers, all
+    others as text, and empty cells as nulls (the same values load_catalog reads from a CSV).
+
+    Returns:
+    int: Number of rows written.
+    """
+    pa, pq = _require_pyarrow()
+    columns = [(index, name) for index, name in enumerate(header) if name]
+    schema = pa.schema([pa.field(name, pa.int64() if name in INTEGER_COLUMNS else pa.string()) for _, name in columns])
+    converters = [_integer_cell if name in INTEGER_COLUMNS else _text_cell for _, name in columns]
+
+    total = 0
+    with atomic_open(parquet_path, "wb") as f:
+        with pq.ParquetWriter(f, schema, use_dictionary=[name for _, name in columns if name in DICTIONARY_COLUMNS],
+                              compression="zstd") as writer:
+            chunk = [[] for _ in columns]
+
+            def flush():
+                writer.write_table(pa.Table.from_arrays([pa.array(values, type=field.type)
+                                                         for values, field in zip(chunk, schema)], schema=schema))
+                for values in chunk:
+                    values.clear()
+
+            for row in rows:
+                width = len(row)
+                for values, (index, _), convert in zip(chunk, columns, converters):
+                    values.append(convert(row[index]) if index < width else None)
+                total += 1
+                if len(chunk[0]) >= chunk_rows:
+                    flush()
+            if chunk and chunk[0] or total == 0:
+                flush()
+    return total
+
+
+def _read_info(info_path):
+    try:
+        with open(info_path, encoding="utf-8") as f:
+            return CacheInfo(**json.load(f))
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+
+
+def _write_info(info_path, info):
+    with atomic_open(info_path, "w", encoding="utf-8") as f:
+        json.dump(info._asdict(), f, indent=2)
+
+
+def is_cache_valid(source, cache_dir=DEFAULT_CACHE_DIR, sheets=None):
+    """
+    Checks whether the cache of a source can be used, refreshing its recorded modification time when the
+    source was touched but its content did not change.
+
+    Returns:
+    bool: True if the Parquet file matches the current source and sheets.
+    """
+    parquet_path, info_path = cache_paths(source, cache_dir)
+    info = _read_info(info_path)
+    if (info is None or info.version != CATALOG_CACHE_VERSION or info.sheets != (list(sheets) if sheets else None)
+            or not os.path.exists(parquet_path)):
+        return False
+    stat = os.stat(source)
+    if info.mtime_ns == stat.st_mtime_ns and info.size == stat.st_size:
+        return True
+    if info.size != stat.st_size or info.sha256 != file_sha256(source):
+        return False
+    _write_info(info_path, info._replace(mtime_ns=stat.st_mtime_ns))
+    return True
+
+
+def convert_catalog(source, cache_dir=DEFAULT_CACHE_DIR, sheets=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Converts a source to its cache entry in one streaming pass, replacing any previous entry.
+
+    Parameters:
+    source (str): The xlsx workbook or CSV export.
+    cache_dir (str): Cache directory.
+    sheets (list of str): Workbook sheets to convert; None converts the first sheet.
+    chunk_rows (int): Rows per Parquet row group, which bounds the memory the conversion uses.
+
+    Returns:
+    int: Number of rows converted.
+    """
+    parquet_path, info_path = cache_paths(source, cache_dir)
+    # Stat before reading, so a change made during the conversion makes the next load convert again
+    stat = os.stat(source)
+    sha256 = file_sha256(source)
+    header, rows = iter_source_rows(source, sheets)
+    total = write_parquet_chunks(header, rows, parquet_path, chunk_rows)
+    _write_info(info_path, CacheInfo(os.path.abspath(source), CATALOG_CACHE_VERSION, stat.st_mtime_ns, stat.st_size,
+                                     sha256, list(sheets) if sheets else None))
+    return total
+
+
+def load_cached_catalog(source, columns=None, cache_dir=DEFAULT_CACHE_DIR, rebuild=False, sheets=None):
+    """
+    Loads the catalog through the cache, converting the source first if the cache is missing or stale.
+
+    Parameters:
+    source (str): The xlsx workbook or CSV export.
+    columns (list of str): Columns to load; None loads all of them.
+    cache_dir (str): Cache directory.
+    rebuild (bool): Convert the source again even if the cache is valid.
+    sheets (list of str): Workbook sheets to convert; None converts the first sheet.
+
+    Returns:
+    tuple: (pd.DataFrame with the catalog_schema dtypes, bool telling whether the cache was used)
+    """
+    cached = not rebuild and is_cache_valid(source, cache_dir, sheets)
+    if not cached:
+        convert_catalog(source, cache_dir, sheets)
+    _require_pyarrow()
+    catalog = pd.read_parquet(cache_paths(source, cache_dir)[0], columns=columns)
+    return apply_catalog_dtypes(catalog), cached
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the ISRS catalog workbook to the columnar cache.")
+    parser.add_argument("source", help="catalog xlsx workbook or CSV export")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--rebuild", action="store_true", help="convert again even if the cache is valid")
+    parser.add_argument("--sheets", nargs="+", help="workbook sheets to convert, e.g. one per catalog year (default: the first sheet)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="rows held in memory per Parquet row group (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} not found.")
+        return 1
+    start = time.perf_counter()
+    parquet_path = cache_paths(args.source, args.cache_dir)[0]
+    if not args.rebuild and is_cache_valid(args.source, args.cache_dir, args.sheets):
+        print(f"Already cached: {parquet_path}")
+        return 0
+    total = convert_catalog(args.source, args.cache_dir, args.sheets, max(1, args.chunk_rows))
+    print(f"{total} rows converted in {time.perf_counter() - start:.2f} s: {parquet_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
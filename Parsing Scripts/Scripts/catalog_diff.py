@@ -0,0 +1,168 @@
+# Description: Diff of two ISRS catalog years, and a refresh that re-extracts only the programs that changed.
+# Every catalog row is normalized (catalog_text_normalizer.py rules, CatalogYear left out) and hashed. Rows are
+# keyed by (ProgID, SubjectAbbreviation, CourseNumber, Description); a key can hold several rows (the same course
+# in two emphases or groups), so each key is summarized by its row count and the wrapping sum of its row hashes,
+# which does not depend on row order. The two years are then compared with one outer hash join on the key:
+# a key only in the new year is added, only in the old year removed, and in both with a different summary changed.
+# With --output the changed and added programs are run through the requirement extraction and upserted into the
+# Maximus output (and its course_programs.py index), so a yearly refresh only costs what actually changed.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/catalog_diff.py" catalog_2024-25.csv catalog_2025-26.xlsx -r catalog_diff.csv
+#   python "Parsing Scripts/Scripts/catalog_diff.py" all_years.csv all_years.csv --old-year 2024-2025 --new-year 2025-2026 --output "Parsing Scripts/Scripts/new_csv.csv"
+
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from catalog_schema import CATALOG_COLUMNS, load_catalog
+from catalog_text_normalizer import normalize_text
+from program_output import atomic_open, upsert_programs
+
+KEY_COLUMNS = ["ProgID", "SubjectAbbreviation", "CourseNumber", "Description"]
+# Columns that are expected to differ between years and are left out of the row hash
+IGNORED_COLUMNS = ["CatalogYear"]
+CHANGE_TYPES = ["added", "removed", "changed"]
+
+# keys:     one row per changed key: the KEY_COLUMNS, Program and Change ("added", "removed" or "changed")
+# programs: one row per ProgID with any change: ProgID, Program and the number of added, removed and changed keys
+# new_programs: ProgIDs with any change that are still in the new year, whose requirements must be extracted again
+CatalogDiff = namedtuple("CatalogDiff", ["keys", "programs", "new_programs"])
+
+
+def read_catalog(source, year=None):
+    """
+    Reads a catalog CSV export or workbook (through catalog_cache.py) and keeps one CatalogYear if given.
+    """
+    if source.lower().endswith((".xlsx", ".xlsm")):
+        from catalog_cache import load_cached_catalog
+        catalog = load_cached_catalog(source)[0]
+    else:
+        catalog = load_catalog(source)
+    if year is not None:
+        catalog = catalog[catalog["CatalogYear"].astype("string") == year].reset_index(drop=True)
+        if catalog.empty:
+            raise ValueError(f"{source} has no rows for CatalogYear {year}")
+    return catalog
+
+
+def _normalized_text(column):
+    """
+    Normalizes every distinct value of a column once and maps the results back to the rows.
+    """
+    values = column.astype("string").fillna("")
+    uniques = pd.unique(values)
+    normalized = {value: normalize_text(value) for value in uniques}
+    return values.map(normalized)
+
+
+def summarize_rows(catalog):
+    """
+    Hashes the normalized rows of a catalog and sums them per key.
+
+    Returns:
+    pd.DataFrame: One row per key with the KEY_COLUMNS, Program, Rows and Hash (uint64).
+    """
+    keys = pd.DataFrame({column: _normalized_text(catalog[column]) for column in KEY_COLUMNS})
+    hashed = [column for column in CATALOG_COLUMNS if column in catalog.columns
+              and column not in KEY_COLUMNS and column not in IGNORED_COLUMNS]
+    row_hash = pd.util.hash_pandas_object(
+        pd.DataFrame({column: _normalized_text(catalog[column]) for column in hashed}), index=False)
+    program = catalog["Program"].astype("string").fillna("") if "Program" in catalog.columns else ""
+    rows = keys.assign(Program=program, Hash=row_hash.to_numpy(dtype=np.uint64))
+    # uint64 sums wrap around, which keeps the summary independent of row order
+    return rows.groupby(KEY_COLUMNS, sort=False).agg(Program=("Program", "first"), Rows=("Hash", "size"),
+                                                     Hash=("Hash", "sum")).reset_index()
+
+
+def diff_catalogs(old_catalog, new_catalog):
+    """
+    Compares two catalog years key by key in one hash join.
+
+    Parameters:
+    old_catalog (pd.DataFrame): Rows of the earlier year.
+    new_catalog (pd.DataFrame): Rows of the later year.
+
+    Returns:
+    CatalogDiff: The changed keys, the per-program counts and the programs to extract again.
+    """
+    joined = summarize_rows(old_catalog).merge(summarize_rows(new_catalog), on=KEY_COLUMNS, how="outer",
+                                               suffixes=("_old", "_new"), indicator=True)
+    change = np.select(
+        [joined["_merge"] == "right_only", joined["_merge"] == "left_only",
+         (joined["Rows_old"] != joined["Rows_new"]) | (joined["Hash_old"] != joined["Hash_new"])],
+        CHANGE_TYPES, default="")
+    keys = joined.assign(Program=joined["Program_new"].fillna(joined["Program_old"]), Change=change)
+    keys = keys.loc[keys["Change"] != "", KEY_COLUMNS + ["Program", "Change"]]
+    keys = keys.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)
+
+    programs = pd.crosstab([keys["ProgID"], keys["Program"]], keys["Change"]).reindex(columns=CHANGE_TYPES, fill_value=0)
+    programs = programs.rename(columns=str.capitalize).reset_index()
+    programs.columns.name = None
+    # Programs dropped from the new year have nothing to extract; their rows stay in the output until removed by hand
+    new_programs = sorted(set(keys["ProgID"]).intersection(_normalized_text(new_catalog["ProgID"])))
+    return CatalogDiff(keys, programs, new_programs)
+
+
+def extract_changed_programs(new_catalog, prog_ids, output_file):
+    """
+    Runs the requirement extraction on the rows of the given programs only and upserts the results into
+    the Maximus output and its course -> program index.
+
+    Returns:
+    tuple: (number of programs added to the output, number replaced)
+    """
+    from requirement_extraction import normalize_catalog, extract_requirements
+    from course_programs import upsert_index
+    rows = new_catalog[_normalized_text(new_catalog["ProgID"]).isin(prog_ids)].reset_index(drop=True)
+    if rows.empty:
+        return 0, 0
+    new_df = extract_requirements(normalize_catalog(rows))
+    added, replaced = upsert_programs(new_df, output_file)
+    upsert_index(new_df, output_file)
+    return added, replaced
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two ISRS catalog years and re-extract only the programs that changed.")
+    parser.add_argument("old", help="catalog CSV or xlsx of the earlier year")
+    parser.add_argument("new", help="catalog CSV or xlsx of the later year (may be the same file with --old-year/--new-year)")
+    parser.add_argument("--old-year", help="CatalogYear to take from the old file, e.g. 2024-2025")
+    parser.add_argument("--new-year", help="CatalogYear to take from the new file, e.g. 2025-2026")
+    parser.add_argument("-r", "--report", default="catalog_diff.csv", help="per-program change counts (default: %(default)s)")
+    parser.add_argument("--details", help="also write every added, removed and changed key to this CSV")
+    parser.add_argument("--output", help="Maximus output to refresh with the changed programs, e.g. Parsing Scripts/Scripts/new_csv.csv")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        old_catalog = read_catalog(args.old, args.old_year)
+        new_catalog = read_catalog(args.new, args.new_year)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    diff = diff_catalogs(old_catalog, new_catalog)
+    seconds = time.perf_counter() - start
+
+    with atomic_open(args.report, "w", newline='', encoding='utf-8') as f:
+        diff.programs.to_csv(f, index=False, lineterminator='\n')
+    if args.details:
+        with atomic_open(args.details, "w", newline='', encoding='utf-8') as f:
+            diff.keys.to_csv(f, index=False, lineterminator='\n')
+    counts = diff.keys["Change"].value_counts()
+    print(f"Compared {len(old_catalog)} and {len(new_catalog)} rows in {seconds:.2f} s: "
+          + ", ".join(f"{counts.get(change, 0)} {change}" for change in CHANGE_TYPES)
+          + f" key(s) in {len(diff.programs)} program(s); report written to {args.report}")
+
+    if args.output:
+        start = time.perf_counter()
+        added, replaced = extract_changed_programs(new_catalog, diff.new_programs, args.output)
+        print(f"Re-extracted {len(diff.new_programs)} changed program(s) in {time.perf_counter() - start:.2f} s: "
+              f"{added} added to and {replaced} replaced in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Description: Column layout and dtypes of the 21-column ISRS catalog export, and the one loader every script uses.
+# A bare pd.read_csv stores every text column as one Python string per row. Most ISRS columns only hold a
+# handful of distinct values (26 degrees, 2 catalog types, 17 descriptions across the whole catalog), so they
+# are loaded as categoricals instead, and the numeric columns get fixed integer types rather than inferred ones.
+
+import pandas as pd
+
+# Columns of the ISRS export, in file order
+CATALOG_COLUMNS = [
+    "ProgramName", "Degree", "Program", "ProgID", "TotalCredits", "EmphasisName", "CatalogType", "CatalogYear",
+    "Description", "SeriesHeading", "Group_CategoryTitle", "Group_CategoryNotes", "GroupCredits",
+    "SubjectAbbreviation", "CourseNumber", "Course", "Title", "Credits", "PreReq", "CoReq", "DiverseCultures",
+]
+
+# Columns not listed here (CourseNumber, Course, Title, Group_CategoryNotes, PreReq) are free text with
+# thousands of distinct values and keep pandas' default string dtype.
+CATALOG_DTYPES = {
+    "ProgramName": "category",
+    "Degree": "category",
+    "Program": "category",
+    "ProgID": "Int32",
+    "TotalCredits": "Int16",
+    "EmphasisName": "category",
+    "CatalogType": "category",
+    "CatalogYear": "category",
+    "Description": "category",
+    "SeriesHeading": "category",
+    "Group_CategoryTitle": "category",
+    "GroupCredits": "category",
+    "SubjectAbbreviation": "category",
+    "Credits": "category",
+    "CoReq": "category",
+    "DiverseCultures": "category",
+}
+
+
+def load_catalog(file_path, columns=None):
+    """
+    Loads an ISRS catalog CSV (the full export or one program's file) with the schema above.
+
+    Columns outside the ISRS layout (for example an index column added by another tool) are not loaded,
+    and missing ones are not an error.
+
+    Parameters:
+    file_path (str or file-like): The CSV file.
+    columns (list of str): ISRS columns to load; None loads all of them.
+
+    Returns:
+    pd.DataFrame: The catalog rows.
+    """
+    wanted = set(CATALOG_COLUMNS if columns is None else columns)
+    dtypes = {column: dtype for column, dtype in CATALOG_DTYPES.items() if column in wanted}
+    return pd.read_csv(file_path, usecols=lambda column: column in wanted, dtype=dtypes)
+
+
+def apply_catalog_dtypes(catalog):
+    """
+    Converts the ISRS columns of an already loaded catalog (e.g. from pd.read_excel) to the schema above.
+    """
+    return catalog.astype({column: dtype for column, dtype in CATALOG_DTYPES.items() if column in catalog.columns})
@@ -0,0 +1,327 @@
+# Description: Extracts course rows (Course ID, Title, Credits, PreReq) from the catalog PDF and DOCX files.
+# Replaces copying the catalog into "Course List.txt" by hand. Text extraction is the slow part (about 0.1 s per
+# PDF page), so pages are extracted in a pool of worker processes and each page's text is cached under a hash of
+# the page's content stream: running again, or on next year's catalog where most pages did not change, only
+# extracts the new pages. The page texts are then joined in page order and parsed in one pass, because a course
+# block (header line, description, "Prerequisites:" line) often continues on the next page.
+#
+# Sources:
+#   Old_Work_from_Previous_team/Input Data/CourseList.pdf   course descriptions with prerequisites
+#   Data/Programs.pdf, Data/Programs.docx                   program requirements (courses without prerequisites)
+#   a .txt file                                             text already extracted, e.g. "Course List.txt"
+#
+# Needs pypdf for PDF files and python-docx for DOCX files (pip install pypdf python-docx).
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/catalog_text_extraction.py" "Old_Work_from_Previous_team/Input Data/CourseList.pdf" -o course_list.csv
+#   python "Parsing Scripts/Scripts/catalog_text_extraction.py" Data/Programs.pdf --workers 0 --text Programs.txt
+
+import os
+import re
+import csv
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from program_output import atomic_open
+
+# Bump when the page text extraction changes, so pages cached by an older version are extracted again
+PAGE_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = "Parsing Scripts/Scripts/.page_cache"
+OUTPUT_COLUMNS = ["Course ID", "Title", "Credits", "PreReq"]
+
+# Course block header, e.g. "ACCT 200 Financial Accounting 3 credits" or "ACCT 330 (3.00) Individual Income Tax 3 credits"
+# The subject may come out of the PDF split by kerning, e.g. "SP AN 101"
+COURSE_HEADER = re.compile(
+    r'^([A-Z]{1,4}(?: [A-Z]{1,4})?)\s+(\d{3}[A-Z]?)(?:\s+\(\d+\.\d+\))?\s+(.+?)\s*(\d+(?:\s*-\s*\d+)?)\s+credits?$')
+# Requirement line of a program document, e.g. "ENG 273W Agricultural Communication 4" (a tab in the DOCX)
+REQUIREMENT_LINE = re.compile(r'^([A-Z]{2,5})\s+(\d{3}[A-Z]?)\s+(.+?)\s+(\d+(?:\s*-\s*\d+)?)$')
+COURSE_START = re.compile(r'^[A-Z]{1,4}(?: [A-Z]{1,4})?\s+\d{3}[A-Z]?\b')
+PREREQ_LABEL = re.compile(r'^(?:Prerequisites?|Prereq)\s*:\s*')
+# Running page header/footer, e.g. "200 2024-2025 Undergraduate Catalog www.mnsu.edu"
+PAGE_HEADER = re.compile(r'^(?:\d+\s+)?\d{4}-\d{4} Undergraduate Catalog\b|Undergraduate Catalog\s+\d+$')
+# A prerequisite line ending like this is cut mid-sentence, so the next line is part of it
+# (including a subject whose course number went to the next line)
+CONTINUED_ENDING = re.compile(r'(?:[,;(/&-]|\b(?:or|and|of|for|with|in|to|the|a|an)|\b[A-Z]{2,5})$')
+
+# course_id: "SUBJ NUMBER"
+# title:     course title
+# credits:   credits as printed, e.g. "3" or "1-4"
+# prereq:    prerequisite text, "" when the course lists none
+CourseRow = namedtuple("CourseRow", ["course_id", "title", "credits", "prereq"])
+
+
+def _require(module, package):
+    try:
+        return __import__(module)
+    except ImportError:
+        sys.exit(f"Error: reading this file needs {package} (pip install {package})")
+
+
+def page_hash(page):
+    """
+    Returns the cache key of a PDF page: a hash of its content stream and the fonts it uses, which is all
+    its extracted text depends on.
+    """
+    digest = hashlib.sha256(f"{PAGE_CACHE_VERSION}:".encode("utf-8"))
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    # Either level may be missing or an indirect object; a plain {} default has no get_object
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    fonts = resources.get("/Font")
+    fonts = fonts.get_object() if fonts is not None else {}
+    for name in sorted(fonts):
+        digest.update(f"{name}={fonts[name].get_object().get('/BaseFont')}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key + ".txt")
+
+
+def load_page_text(cache_dir, key):
+    """
+    Returns the cached text of a page, or None on a miss.
+    """
+    try:
+        with open(_cache_path(cache_dir, key), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def store_page_text(cache_dir, key, text):
+    """
+    Stores the text of a page. The entry is written to a temporary file first so readers never see half of it.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, _cache_path(cache_dir, key))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# Each worker process opens the PDF once and keeps the reader for all of its pages
+_worker_reader = None
+
+
+def _open_worker_reader(pdf_path):
+    global _worker_reader
+    _worker_reader = _require("pypdf", "pypdf").PdfReader(pdf_path)
+
+
+def _extract_pages(page_numbers):
+    return [(number, _worker_reader.pages[number].extract_text()) for number in page_numbers]
+
+
+def extract_pdf_pages(pdf_path, workers=1, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Extracts the text of every page of a PDF, using cached page texts where the page did not change.
+
+    Parameters:
+    pdf_path (str): The PDF file.
+    workers (int): Number of worker processes for the pages not in the cache (1 extracts in this process).
+    cache_dir (str): Page text cache directory, or None to extract every page without caching.
+
+    Returns:
+    tuple: (list of page texts in page order, number of pages read from the cache)
+    """
+    reader = _require("pypdf", "pypdf").PdfReader(pdf_path)
+    texts = [None] * len(reader.pages)
+    keys = {}
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        for number, page in enumerate(reader.pages):
+            keys[number] = page_hash(page)
+            texts[number] = load_page_text(cache_dir, keys[number])
+    todo = [number for number, text in enumerate(texts) if text is None]
+    cached = len(texts) - len(todo)
+
+    if workers <= 1 or len(todo) < 2:
+        results = [(number, reader.pages[number].extract_text()) for number in todo]
+    else:
+        # A few chunks per worker keeps all of them busy when some pages are slower than others
+        size = max(1, -(-len(todo) // (workers * 4)))
+        chunks = [todo[start:start + size] for start in range(0, len(todo), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_reader, initargs=(pdf_path,)) as executor:
+            results = [result for chunk in executor.map(_extract_pages, chunks) for result in chunk]
+
+    for number, text in results:
+        texts[number] = text
+        if cache_dir is not None:
+            store_page_text(cache_dir, keys[number], text)
+    return texts, cached
+
+
+def extract_docx_text(docx_path):
+    """
+    Returns the text of a DOCX file, one paragraph per line. A DOCX has no pages, so nothing is cached.
+    """
+    document = _require("docx", "python-docx").Document(docx_path)
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+
+def clean_lines(texts):
+    """
+    Joins page texts into one list of lines without the running page headers, empty lines and
+    trailing spaces.
+    """
+    lines = []
+    for text in texts:
+        for line in text.splitlines():
+            line = " ".join(line.replace("\xa0", " ").split())
+            if line and not PAGE_HEADER.search(line):
+                lines.append(line)
+    return lines
+
+
+def _join(text, line):
+    # A word broken over two lines ("full-" / "time") keeps its hyphen without a space
+    return text + line if text.endswith("-") else f"{text} {line}"
+
+
+def parse_course_rows(lines):
+    """
+    Parses course blocks from catalog lines.
+
+    A block starts at a course header line (a title wrapped onto a second line is joined first). The
+    "Prerequisites:" line of the block runs on while the next line starts in lower case or with a number or
+    Course ID, or the line before it was cut after a comma, "or"/"and" or a subject. Subjects split by the
+    PDF's kerning ("SP AN 101") are joined again. Documents with more
+    "SUBJ NUM Title N" lines than "N credits" headers (the program requirement lists) are read with
+    those lines instead. The first block of a Course ID wins.
+
+    Parameters:
+    lines (list of str): Lines as returned by clean_lines.
+
+    Returns:
+    list of CourseRow: One row per course, in document order.
+    """
+    course_headers = sum(1 for line in lines if COURSE_HEADER.match(line))
+    requirement_lines = sum(1 for line in lines if REQUIREMENT_LINE.match(line))
+    header = COURSE_HEADER if course_headers >= requirement_lines else REQUIREMENT_LINE
+
+    rows = {}
+    split_subjects = {}
+    current = None
+    prereq = None
+    in_prereq = False
+
+    def finish():
+        if current is not None and current.course_id not in rows:
+            # The PDF sometimes leaves a space before punctuation ("ENGR 312W .")
+            rows[current.course_id] = current._replace(prereq=re.sub(r'\s+([.,;:])', r'\1', prereq or ""))
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        match = header.match(line)
+        if match is None and COURSE_START.match(line) and index + 1 < len(lines):
+            # Title wrapped onto the next line: "ANTH 260 Vampires, ... Folklore" / "of Fear 4 credits"
+            next_line = lines[index + 1]
+            if not COURSE_START.match(next_line):
+                match = header.match(f"{line} {next_line}")
+                if match is not None:
+                    index += 1
+        index += 1
+
+        if match is not None:
+            finish()
+            subject, number, title, credits = match.groups()
+            if " " in subject:
+                split_subjects[subject] = subject.replace(" ", "")
+                subject = split_subjects[subject]
+            if len(subject) < 2:
+                continue
+            current = CourseRow(f"{subject} {number}", title, credits.replace(" ", ""), "")
+            prereq = None
+            in_prereq = False
+            continue
+        if current is None:
+            continue
+
+        label = PREREQ_LABEL.match(line)
+        if label is not None and prereq is None:
+            prereq = line[label.end():]
+            in_prereq = True
+        elif in_prereq and (line[0].islower() or line[0].isdigit() or COURSE_START.match(line)
+                            or CONTINUED_ENDING.search(prereq)):
+            prereq = _join(prereq, line)
+        else:
+            in_prereq = False
+    finish()
+    if not split_subjects:
+        return list(rows.values())
+    # Course IDs inside prerequisite text are split the same way as in the headers
+    split = re.compile(r'\b(' + "|".join(map(re.escape, split_subjects)) + r')(?= \d{3})')
+    return [row._replace(prereq=split.sub(lambda m: split_subjects[m.group(1)], row.prereq)) for row in rows.values()]
+
+
+def write_course_rows(rows, output_file):
+    """
+    Writes course rows in the cleaned_course_list.csv layout (Course ID, Title, Credits, PreReq).
+    """
+    with atomic_open(output_file, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(OUTPUT_COLUMNS)
+        writer.writerows(rows)
+
+
+def read_source_text(source, workers=1, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the page texts of a PDF, DOCX or text file, and how many of them came from the cache.
+    """
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".pdf":
+        return extract_pdf_pages(source, workers, cache_dir)
+    if extension == ".docx":
+        return [extract_docx_text(source)], 0
+    with open(source, encoding="utf-8", errors="replace") as f:
+        return [f.read()], 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract course rows from the catalog PDF/DOCX files.")
+    parser.add_argument("source", help="PDF, DOCX or text file")
+    parser.add_argument("-o", "--output", default="course_list.csv", help="output CSV file (default: %(default)s)")
+    parser.add_argument("--text", help="also write the extracted text to this file")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes, 0 for one per CPU (default: 1, no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the page text cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"page text cache directory (default: {DEFAULT_CACHE_DIR})")
+    args = parser.parse_args(argv)
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} not found.")
+        return 1
+
+    start = time.perf_counter()
+    texts, cached = read_source_text(args.source, workers, None if args.no_cache else args.cache_dir)
+    print(f"Read {len(texts)} page(s) ({cached} from the cache) in {time.perf_counter() - start:.2f} s")
+    lines = clean_lines(texts)
+    if args.text:
+        with atomic_open(args.text, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    rows = parse_course_rows(lines)
+    if not rows:
+        print(f"Error: no courses found in {args.source}.")
+        return 1
+    write_course_rows(rows, args.output)
+    print(f"Wrote {len(rows)} course(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
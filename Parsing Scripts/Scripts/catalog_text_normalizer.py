@@ -0,0 +1,322 @@
+# Description: Single-pass normalizer for the text problems documented in "Old_Work_from_Previous_team/Catalog Inconsistences".
+# The previous team fixed each problem with its own script and intermediate file (Cleaned_Course_List_Problem1_Fixed.csv,
+# ..._Fully_Corrected.csv, ...). Here every fix is a rule in one registry: character fixes are merged into one
+# translation table and pattern fixes into one combined regular expression, so a line or cell is normalized in
+# two passes however many rules there are. Lines and CSV rows are streamed through generators, and every rule
+# counts how often it fired; --profile also times each rule on its own to show what it costs.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/catalog_text_normalizer.py" New_Work/Final_CSV_Files/cleaned_course_list.csv -o cleaned_course_list_normalized.csv
+#   python "Parsing Scripts/Scripts/catalog_text_normalizer.py" "Old_Work_from_Previous_team/Input Data/Course List.txt" -o "Course List normalized.txt" --profile
+
+import os
+import re
+import csv
+import sys
+import time
+import argparse
+from collections import Counter, namedtuple
+from catalog_text_extraction import COURSE_HEADER, COURSE_START, PREREQ_LABEL, PAGE_HEADER, CONTINUED_ENDING
+from program_output import atomic_open
+
+# name:  short identifier of the rule, used in the hit counts
+# chars: character -> replacement, applied with str.translate
+CharRule = namedtuple("CharRule", ["name", "chars"])
+
+# name:        short identifier of the rule (a valid Python identifier)
+# pattern:     regular expression, matched in MULTILINE mode
+# replacement: replacement template; \1, \2 refer to the rule's own groups
+PatternRule = namedtuple("PatternRule", ["name", "pattern", "replacement"])
+
+# Character fixes, applied first
+CHAR_RULES = [
+    # Mix of non-standard quotations: “ ” ‘ ’ next to " and '
+    CharRule("curly_quotes", {"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"}),
+    # "Learners¿ Diverse Development": an apostrophe lost in an encoding round trip
+    CharRule("inverted_question_mark", {"\u00bf": "'"}),
+    CharRule("dashes", {"\u2013": "-", "\u2014": "-"}),
+    CharRule("odd_spaces", {"\t": " ", "\xa0": " ", "\u200b": ""}),
+]
+
+# Pattern fixes, applied after the character fixes
+PATTERN_RULES = [
+    # Comma instead of dash in a credit range: "Private Piano 1 1,3" or a Credits cell of "1,3"
+    PatternRule("credit_range_comma", r'(?<![\d,])(\d{1,2}),(\d{1,2})[ ]*$', r'\1-\2'),
+    # A cell that still holds a wrapped line
+    PatternRule("line_break", r'[ ]*\r?\n[ ]*', " "),
+    PatternRule("space_run", r'(?<=\S)[ ]{2,}(?=\S)', " "),
+    # Space left before punctuation by PDF extraction: "ENGR 312W ."
+    PatternRule("space_before_punctuation", r'(?<=\w)[ ]+(?=[.,;:](?:[ ]|$))', ""),
+    PatternRule("edge_space", r'^[ ]+|[ ]+$', ""),
+]
+
+# Name of the line stage that joins "Prerequisites:" lines wrapped onto the following lines
+WRAPPED_PREREQUISITES = "wrapped_prerequisites"
+
+# table:          str.translate table of every CharRule
+# char_pattern:   character class of every translated character, for counting hits
+# char_rules:     translated character -> rule name
+# pattern:        combined regular expression of every PatternRule, one named group per rule
+# replacements:   rule name -> replacement template with the group numbers of the combined pattern
+Normalizer = namedtuple("Normalizer", ["table", "char_pattern", "char_rules", "pattern", "replacements"])
+
+# hits:    rule name -> number of replacements made
+# seconds: stage ("translate", "patterns", WRAPPED_PREREQUISITES) -> time spent in it
+NormalizeStats = namedtuple("NormalizeStats", ["hits", "seconds"])
+
+DEFAULT_RULES = CHAR_RULES + PATTERN_RULES
+
+
+def _shift_groups(template, offset):
+    # Rewrites \1 / \g<1> to the group number the rule's group has inside the combined pattern
+    return re.sub(r'\\(?:g<(\d+)>|(\d+))', lambda m: rf'\g<{offset + int(m.group(1) or m.group(2))}>', template)
+
+
+def compile_normalizer(rules=DEFAULT_RULES):
+    """
+    Compiles the rules into one translation table and one combined regular expression.
+
+    Args:
+        rules (list of CharRule and PatternRule): The rules; pattern rules are tried in list order
+            at each position of the text.
+
+    Returns:
+        Normalizer: The compiled normalizer.
+    """
+    char_rules = {}
+    for rule in rules:
+        if isinstance(rule, CharRule):
+            char_rules.update((char, rule.name) for char in rule.chars)
+    table = str.maketrans({char: replacement for rule in rules if isinstance(rule, CharRule)
+                           for char, replacement in rule.chars.items()})
+    char_pattern = re.compile("[" + "".join(map(re.escape, char_rules)) + "]") if char_rules else None
+
+    parts = []
+    replacements = {}
+    group = 0
+    for rule in rules:
+        if not isinstance(rule, PatternRule):
+            continue
+        # Each rule is wrapped in a named group, so its own groups come right after that one
+        parts.append(f"(?P<{rule.name}>{rule.pattern})")
+        replacements[rule.name] = _shift_groups(rule.replacement, group + 1)
+        group += 1 + re.compile(rule.pattern).groups
+    pattern = re.compile("|".join(parts), re.MULTILINE) if parts else None
+    return Normalizer(table, char_pattern, char_rules, pattern, replacements)
+
+
+DEFAULT_NORMALIZER = compile_normalizer()
+
+
+def new_stats():
+    """
+    Returns empty hit counts and timings.
+    """
+    return NormalizeStats(Counter(), Counter())
+
+
+def normalize_text(text, normalizer=DEFAULT_NORMALIZER, stats=None):
+    """
+    Applies every rule to a string (a line or a cell) and returns the normalized string.
+    """
+    if stats is None:
+        stats = new_stats()
+    start = time.perf_counter()
+    if normalizer.char_pattern is not None:
+        found = normalizer.char_pattern.findall(text)
+        if found:
+            for char in found:
+                stats.hits[normalizer.char_rules[char]] += 1
+            text = text.translate(normalizer.table)
+    middle = time.perf_counter()
+    stats.seconds["translate"] += middle - start
+
+    if normalizer.pattern is not None:
+        def replace(match):
+            name = match.lastgroup
+            stats.hits[name] += 1
+            return match.expand(normalizer.replacements[name])
+        text = normalizer.pattern.sub(replace, text)
+    stats.seconds["patterns"] += time.perf_counter() - middle
+    return text
+
+
+def _continues_prerequisite(prereq, line, next_line):
+    if not line or COURSE_HEADER.match(line) or PREREQ_LABEL.match(line) or PAGE_HEADER.search(line):
+        return False
+    if COURSE_START.match(line):
+        # A course header whose title was wrapped onto the next line is not part of the prerequisite
+        return next_line is None or not COURSE_HEADER.match(f"{line} {next_line}")
+    return line[0].islower() or line[0].isdigit() or bool(CONTINUED_ENDING.search(prereq))
+
+
+def join_wrapped_prerequisites(lines, stats=None):
+    """
+    Joins a "Prerequisites:" line with the lines it was wrapped onto, using the catalog extraction's rule:
+    the next line starts in lower case, with a number or a Course ID, or the line was cut after a comma,
+    "or"/"and" or a subject. Course headers (also when their title is wrapped), other "Prerequisites:"
+    lines and page headers are never joined.
+
+    Args:
+        lines (iterable of str): Normalized lines without line endings.
+        stats (NormalizeStats): Receives one WRAPPED_PREREQUISITES hit per joined line.
+
+    Yields:
+        str: The lines, with wrapped prerequisites on one line.
+    """
+    if stats is None:
+        stats = new_stats()
+    pending = None
+    # Each line is handled once the line after it is known, which the wrapped title check needs
+    lines = iter(lines)
+    line = next(lines, None)
+    while line is not None:
+        next_line = next(lines, None)
+        if pending is not None:
+            start = time.perf_counter()
+            continues = _continues_prerequisite(pending, line, next_line)
+            stats.seconds[WRAPPED_PREREQUISITES] += time.perf_counter() - start
+            if continues:
+                stats.hits[WRAPPED_PREREQUISITES] += 1
+                pending = pending + line if pending.endswith("-") else f"{pending} {line}"
+                line = next_line
+                continue
+            yield pending
+            pending = None
+        if PREREQ_LABEL.match(line):
+            pending = line
+        else:
+            yield line
+        line = next_line
+    if pending is not None:
+        yield pending
+
+
+def normalize_lines(lines, normalizer=DEFAULT_NORMALIZER, stats=None, join_prerequisites=True):
+    """
+    Normalizes a stream of text lines, e.g. an open catalog text file.
+
+    Args:
+        lines (iterable of str): Lines, with or without line endings.
+        normalizer (Normalizer): Compiled rules.
+        stats (NormalizeStats): Receives the hit counts and timings.
+        join_prerequisites (bool): Also join wrapped "Prerequisites:" lines.
+
+    Yields:
+        str: Normalized lines without line endings.
+    """
+    if stats is None:
+        stats = new_stats()
+    normalized = (normalize_text(line.rstrip("\r\n"), normalizer, stats) for line in lines)
+    if join_prerequisites:
+        normalized = join_wrapped_prerequisites(normalized, stats)
+    return normalized
+
+
+def normalize_rows(rows, normalizer=DEFAULT_NORMALIZER, stats=None, columns=None):
+    """
+    Normalizes a stream of CSV rows, e.g. a csv.reader over cleaned_course_list.csv.
+
+    Args:
+        rows (iterable of list of str): Rows without the header.
+        normalizer (Normalizer): Compiled rules.
+        stats (NormalizeStats): Receives the hit counts and timings.
+        columns (set of int): Indexes of the cells to normalize; None normalizes every cell.
+
+    Yields:
+        list of str: Normalized rows.
+    """
+    if stats is None:
+        stats = new_stats()
+    for row in rows:
+        yield [normalize_text(cell, normalizer, stats) if columns is None or index in columns else cell
+               for index, cell in enumerate(row)]
+
+
+def profile_rules(texts, rules=DEFAULT_RULES):
+    """
+    Times each rule on its own over the same texts, since inside the combined pass the rules share one scan.
+
+    Returns:
+        list of tuple: (rule name, hits, seconds) in rule order.
+    """
+    results = []
+    for rule in rules:
+        normalizer = compile_normalizer([rule])
+        stats = new_stats()
+        start = time.perf_counter()
+        for text in texts:
+            normalize_text(text, normalizer, stats)
+        results.append((rule.name, stats.hits[rule.name], time.perf_counter() - start))
+    return results
+
+
+def _print_stats(stats, rules):
+    print(f"{'rule':<26}{'hits':>8}")
+    for name in [rule.name for rule in rules] + [WRAPPED_PREREQUISITES]:
+        if name in stats.hits or name != WRAPPED_PREREQUISITES:
+            print(f"{name:<26}{stats.hits[name]:>8}")
+    print("time: " + ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in stats.seconds.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize catalog text or CSV files in one pass.")
+    parser.add_argument("input", help="CSV file (every cell is normalized) or text file (every line)")
+    parser.add_argument("-o", "--output", help="output file (default: only print the hit counts)")
+    parser.add_argument("--rules", nargs="+", choices=[rule.name for rule in DEFAULT_RULES],
+                        help="rules to apply (default: all)")
+    parser.add_argument("--columns", nargs="+", help="CSV columns to normalize (default: all)")
+    parser.add_argument("--keep-wrapped", action="store_true", help="do not join wrapped Prerequisites: lines in text files")
+    parser.add_argument("--profile", action="store_true", help="also time each rule on its own")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print(f"Error: {args.input} not found.")
+        return 1
+    rules = [rule for rule in DEFAULT_RULES if args.rules is None or rule.name in args.rules]
+    normalizer = compile_normalizer(rules)
+    stats = new_stats()
+    is_csv = args.input.lower().endswith(".csv")
+
+    with open(args.input, newline='' if is_csv else None, encoding="utf-8", errors="replace") as source:
+        if is_csv:
+            reader = csv.reader(source)
+            header = next(reader, [])
+            columns = None
+            if args.columns:
+                missing = [column for column in args.columns if column not in header]
+                if missing:
+                    print(f"Error: {args.input} has no column(s) {', '.join(missing)}.")
+                    return 1
+                columns = {header.index(column) for column in args.columns}
+            output = normalize_rows(reader, normalizer, stats, columns)
+        else:
+            output = normalize_lines(source, normalizer, stats, not args.keep_wrapped)
+
+        if args.output:
+            with atomic_open(args.output, "w", newline='', encoding="utf-8") as f:
+                if is_csv:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(header)
+                    writer.writerows(output)
+                else:
+                    f.writelines(line + "\n" for line in output)
+        else:
+            for _ in output:
+                pass
+
+    print(f"Normalized {args.input}" + (f" into {args.output}" if args.output else ""))
+    _print_stats(stats, rules)
+
+    if args.profile:
+        with open(args.input, newline='' if is_csv else None, encoding="utf-8", errors="replace") as source:
+            texts = ([cell for row in csv.reader(source) for cell in row] if is_csv
+                     else [line.rstrip("\r\n") for line in source])
+        print(f"\n{'rule (on its own)':<26}{'hits':>8}{'ms':>10}")
+        for name, hits, seconds in profile_rules(texts, rules):
+            print(f"{name:<26}{hits:>8}{seconds * 1000:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
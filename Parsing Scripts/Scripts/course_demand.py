@@ -0,0 +1,188 @@
+# Description: Program x course demand matrix for enrollment projections.
+# The requirement lists are compiled once with degree_audit.py and turned into a sparse CSR matrix whose entry
+# (program, course) is the expected number of seats one student of the program takes in the course: 1 for a
+# required course and, for a "choose N credits" group, the group's credits divided by the credits of all
+# its courses (each course's share of the choice, assuming students spread evenly), times the weight of the
+# requirement category. Projected seat demand for an enrollment scenario is then one sparse mat-vec,
+# demand = matrix.T @ enrollment, so new scenarios never rerun the parsing.
+#
+# Needs scipy (pip install scipy).
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/course_demand.py" build -o New_Work/course_demand.npz --weight reqGenEds=0.5
+#   python "Parsing Scripts/Scripts/course_demand.py" project New_Work/course_demand.npz enrollment.csv -o projected_demand.csv
+#
+# enrollment.csv has the columns Program and Enrollment (students per program).
+
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from degree_audit import AUDIT_CATEGORIES, DEFAULT_COURSE_LIST, DEFAULT_PROGRAMS, load_audit
+from program_output import atomic_open
+
+# Weight of each requirement category in the demand; lower a category whose courses students often
+# satisfy some other way (e.g. reqGenEds transferred in) with --weight
+DEFAULT_CATEGORY_WEIGHTS = {category.name: 1.0 for category in AUDIT_CATEGORIES}
+
+# matrix:       scipy.sparse.csr_matrix (programs x courses) of expected seats per enrolled student
+# programs:     program name of every row
+# course_ids:   Course ID of every column
+DemandMatrix = namedtuple("DemandMatrix", ["matrix", "programs", "course_ids"])
+
+
+def _require_scipy():
+    try:
+        import scipy.sparse
+    except ImportError:
+        sys.exit("Error: the demand matrix needs scipy. Install it with: pip install scipy")
+    return scipy.sparse
+
+
+def build_demand_matrix(audit, category_weights=None):
+    """
+    Builds the demand matrix from compiled requirements.
+
+    Parameters:
+    audit (CompiledAudit): Requirements compiled by degree_audit.compile_audit.
+    category_weights (dict): Category name -> weight; categories left out keep DEFAULT_CATEGORY_WEIGHTS.
+
+    Returns:
+    DemandMatrix: The programs x courses matrix. A course that counts for several groups of a program
+    (e.g. a prerequisite to the major that is also a required gen ed) gets the sum of its shares, capped
+    at one seat per student.
+    """
+    sparse = _require_scipy()
+    weights = dict(DEFAULT_CATEGORY_WEIGHTS, **(category_weights or {}))
+    credits = audit.weights[:-1]
+    courses, groups = np.nonzero(credits)
+    # Share of a group's courses a student takes: its threshold over the credits of all its courses
+    group_credits = credits.sum(axis=0)
+    share = np.minimum(1.0, audit.thresholds / np.maximum(group_credits, 1e-9))
+    group_weight = np.array([weights.get(category, 1.0) for category in audit.group_category], dtype=np.float64)
+    matrix = sparse.csr_matrix(((share * group_weight)[groups], (audit.group_program[groups], courses)),
+                               shape=(len(audit.programs), len(audit.course_ids)), dtype=np.float64)
+    matrix.sum_duplicates()
+    np.minimum(matrix.data, 1.0, out=matrix.data)
+    matrix.eliminate_zeros()
+    return DemandMatrix(matrix, list(audit.programs), list(audit.course_ids))
+
+
+def enrollment_vector(demand, enrollment):
+    """
+    Turns {program: students} into a vector over the matrix rows; unknown programs are returned separately.
+
+    Returns:
+    tuple: (np.ndarray of students per row, list of programs that are not in the matrix)
+    """
+    row_of = {program: row for row, program in enumerate(demand.programs)}
+    vector = np.zeros(len(demand.programs), dtype=np.float64)
+    unknown = []
+    for program, students in enrollment.items():
+        if program in row_of:
+            vector[row_of[program]] += students
+        else:
+            unknown.append(program)
+    return vector, unknown
+
+
+def project_demand(demand, enrollment):
+    """
+    Projects per-course seat demand for an enrollment scenario with one sparse mat-vec.
+
+    Parameters:
+    demand (DemandMatrix): The demand matrix.
+    enrollment (dict or array-like): {program: students}, a vector over demand.programs, or a
+        (programs x scenarios) array to project several scenarios at once.
+
+    Returns:
+    pd.Series or pd.DataFrame: Projected seats per Course ID (one column per scenario for a 2-D input).
+    """
+    if isinstance(enrollment, dict):
+        enrollment = enrollment_vector(demand, enrollment)[0]
+    enrollment = np.asarray(enrollment, dtype=np.float64)
+    if enrollment.shape[0] != len(demand.programs):
+        raise ValueError(f"Enrollment has {enrollment.shape[0]} rows but the matrix has {len(demand.programs)} programs")
+    seats = demand.matrix.T @ enrollment
+    if seats.ndim == 1:
+        return pd.Series(seats, index=pd.Index(demand.course_ids, name="Course ID"), name="ProjectedSeats")
+    return pd.DataFrame(seats, index=pd.Index(demand.course_ids, name="Course ID"))
+
+
+def save_demand_matrix(demand, path):
+    """
+    Saves the matrix and its row and column names to one .npz file.
+    """
+    matrix = demand.matrix
+    with atomic_open(path, "wb") as f:
+        np.savez_compressed(f, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                            shape=np.array(matrix.shape), programs=np.array(demand.programs),
+                            course_ids=np.array(demand.course_ids))
+
+
+def load_demand_matrix(path):
+    """
+    Loads a matrix written by save_demand_matrix.
+
+    Returns:
+    DemandMatrix: The demand matrix.
+    """
+    sparse = _require_scipy()
+    with np.load(path) as saved:
+        matrix = sparse.csr_matrix((saved["data"], saved["indices"], saved["indptr"]), shape=tuple(saved["shape"]))
+        return DemandMatrix(matrix, saved["programs"].tolist(), saved["course_ids"].tolist())
+
+
+def _parse_weight(text):
+    name, _, value = text.partition("=")
+    if name not in DEFAULT_CATEGORY_WEIGHTS:
+        raise argparse.ArgumentTypeError(f"unknown category {name!r} (one of {', '.join(DEFAULT_CATEGORY_WEIGHTS)})")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"weight must be CATEGORY=NUMBER, got {text!r}") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the program x course demand matrix and project course demand.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="compile the requirement lists into a demand matrix")
+    build.add_argument("--programs", default=DEFAULT_PROGRAMS, help=f"requirement CSV (default: {DEFAULT_PROGRAMS})")
+    build.add_argument("--course-list", default=DEFAULT_COURSE_LIST, help=f"course credits (default: {DEFAULT_COURSE_LIST})")
+    build.add_argument("--weight", type=_parse_weight, action="append", default=[], metavar="CATEGORY=WEIGHT",
+                       help="weight of a requirement category (default 1.0 each); may be repeated")
+    build.add_argument("-o", "--output", default="course_demand.npz", help="matrix file (default: %(default)s)")
+    project = subparsers.add_parser("project", help="project per-course seat demand for an enrollment CSV")
+    project.add_argument("matrix", help="matrix file written by build")
+    project.add_argument("enrollment", help="CSV with the columns Program and Enrollment")
+    project.add_argument("-o", "--output", default="projected_demand.csv", help="output CSV (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        audit, skipped = load_audit(args.programs, args.course_list)
+        demand = build_demand_matrix(audit, dict(args.weight))
+        save_demand_matrix(demand, args.output)
+        print(f"{demand.matrix.shape[0]} program(s) x {demand.matrix.shape[1]} course(s), {demand.matrix.nnz} nonzero "
+              f"entries ({len(skipped)} unreadable list cell(s) skipped): {args.output}")
+        return 0
+
+    demand = load_demand_matrix(args.matrix)
+    rows = pd.read_csv(args.enrollment, dtype={"Program": str}, keep_default_na=False)
+    missing = [column for column in ["Program", "Enrollment"] if column not in rows.columns]
+    if missing:
+        print(f"Error: {args.enrollment} has no column(s) {', '.join(missing)}")
+        return 1
+    vector, unknown = enrollment_vector(demand, rows.groupby("Program")["Enrollment"].sum().to_dict())
+    for program in unknown:
+        print(f"Warning: {program} is not in the matrix and was left out")
+    seats = project_demand(demand, vector)
+    seats = seats[seats > 0].sort_values(ascending=False).round(1)
+    with atomic_open(args.output, "w", newline='', encoding='utf-8') as f:
+        seats.to_csv(f, lineterminator='\n')
+    print(f"Projected {seats.sum():.0f} seat(s) over {len(seats)} course(s) for {vector.sum():.0f} student(s): {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+# Description: Persistent index of every course in the ISRS catalog, keyed by normalized Course ID.
+# Replaces rebuilding cleaned_course_list.csv and searching it line by line: a course is found with one dict
+# lookup, all courses of a subject with one more, and prefix queries such as "MATH 1xx" with a binary search
+# over the sorted Course IDs. Every subject's source rows are fingerprinted, so rebuilding the index only
+# redoes the subjects whose rows changed.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/course_index.py" build New_Work/Seperate_Programs_and_degrees-CSV_Files
+#   python "Parsing Scripts/Scripts/course_index.py" lookup "MATH 121" "acct  200"
+#   python "Parsing Scripts/Scripts/course_index.py" find "MATH 1xx"
+#   python "Parsing Scripts/Scripts/course_index.py" export cleaned_course_list.csv
+
+import os
+import re
+import csv
+import sys
+import glob
+import pickle
+import bisect
+import hashlib
+import argparse
+import pandas as pd
+from collections import namedtuple
+from catalog_schema import load_catalog
+from program_output import atomic_open
+
+# Bump when the index layout changes; an index written by another version is rebuilt from scratch
+INDEX_VERSION = 2
+
+DEFAULT_INDEX = "New_Work/course_index.pkl"
+SOURCE_COLUMNS = ["SubjectAbbreviation", "CourseNumber", "Title", "Credits", "PreReq"]
+
+# course_id: normalized "SUBJ NUMBER"
+# title, credits, prereq: text of the first catalog row for the course (None when empty)
+CourseRecord = namedtuple("CourseRecord", ["course_id", "title", "credits", "prereq"])
+
+# courses:        course_id -> CourseRecord
+# subjects:       subject -> sorted list of its course_ids
+# sorted_ids:     every course_id in sorted order, for prefix search
+# subject_hashes: subject -> fingerprint of the source rows the subject was built from
+CourseIndex = namedtuple("CourseIndex", ["version", "courses", "subjects", "sorted_ids", "subject_hashes"])
+
+
+def normalize_course_id(course_id):
+    """
+    Normalizes a Course ID to upper case with single spaces, e.g. " math  121 " -> "MATH 121".
+    """
+    return " ".join(str(course_id).upper().split())
+
+
+def _text(value):
+    return None if pd.isna(value) else str(value)
+
+
+def read_source_rows(source):
+    """
+    Loads the course columns of the ISRS catalog from a CSV file or a directory of program CSVs.
+
+    Returns:
+    pd.DataFrame: SubjectAbbreviation, CourseNumber, Title, Credits and PreReq as text, in source order.
+    """
+    files = sorted(glob.glob(os.path.join(source, "*.csv"))) if os.path.isdir(source) else [source]
+    if not files:
+        raise FileNotFoundError(f"No CSV files found in {source}")
+    rows = pd.concat([load_catalog(file, columns=SOURCE_COLUMNS) for file in files], ignore_index=True)
+    rows = rows[SOURCE_COLUMNS].astype(object).where(rows[SOURCE_COLUMNS].notna(), None)
+    return rows[rows["SubjectAbbreviation"].notna() & rows["CourseNumber"].notna()]
+
+
+def _fingerprint(rows):
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(repr(row).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _build_subject(rows):
+    """
+    Builds the records of one subject; the first row of a course wins, as drop_duplicates(keep="first") did.
+    """
+    records = {}
+    for subject, number, title, credits, prereq in rows:
+        course_id = normalize_course_id(f"{subject} {number}")
+        if course_id not in records:
+            records[course_id] = CourseRecord(course_id, _text(title), _text(credits), _text(prereq))
+    return records
+
+
+def build_index(source_rows, previous=None):
+    """
+    Builds the course index from the ISRS rows, reusing the subjects of a previous index that did not change.
+
+    Parameters:
+    source_rows (pd.DataFrame): Rows as returned by read_source_rows.
+    previous (CourseIndex): Index to update, or None to build from scratch.
+
+    Returns:
+    tuple: (CourseIndex, list of subjects that were rebuilt, list of subjects that were removed)
+    """
+    if previous is not None and previous.version != INDEX_VERSION:
+        previous = None
+
+    rows_by_subject = {}
+    for row in source_rows.itertuples(index=False, name=None):
+        rows_by_subject.setdefault(normalize_course_id(row[0]), []).append(row)
+
+    courses = {}
+    subjects = {}
+    subject_hashes = {}
+    rebuilt = []
+    for subject in sorted(rows_by_subject):
+        rows = rows_by_subject[subject]
+        fingerprint = _fingerprint(rows)
+        if previous is not None and previous.subject_hashes.get(subject) == fingerprint:
+            course_ids = previous.subjects[subject]
+            courses.update((course_id, previous.courses[course_id]) for course_id in course_ids)
+        else:
+            records = _build_subject(rows)
+            course_ids = sorted(records)
+            courses.update(records)
+            rebuilt.append(subject)
+        subjects[subject] = course_ids
+        subject_hashes[subject] = fingerprint
+
+    removed = sorted(set(previous.subjects) - set(subjects)) if previous is not None else []
+    index = CourseIndex(INDEX_VERSION, courses, subjects, sorted(courses), subject_hashes)
+    return index, rebuilt, removed
+
+
+def save_index(index, index_path=DEFAULT_INDEX):
+    """
+    Writes the index to disk, replacing the previous file atomically. It is stored as plain dicts and
+    tuples, so the file does not depend on the module that wrote it (the CLI runs as __main__).
+    """
+    data = {"version": index.version, "subjects": index.subjects, "subject_hashes": index.subject_hashes,
+            "courses": {course_id: tuple(record) for course_id, record in index.courses.items()}}
+    with atomic_open(index_path, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_index(index_path=DEFAULT_INDEX):
+    """
+    Reads an index written by save_index. Returns None if there is no index or it is from another version.
+    """
+    try:
+        with open(index_path, "rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (AttributeError, pickle.UnpicklingError):
+        # Version 1 files pickled the namedtuples themselves, which only load in the module that wrote them
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    courses = {course_id: CourseRecord(*record) for course_id, record in data["courses"].items()}
+    return CourseIndex(INDEX_VERSION, courses, data["subjects"], sorted(courses), data["subject_hashes"])
+
+
+def lookup_course(index, course_id):
+    """
+    Returns the CourseRecord of a course, or None if the course is not in the catalog.
+    """
+    return index.courses.get(normalize_course_id(course_id))
+
+
+def lookup_courses(index, course_ids):
+    """
+    Looks up many courses at once.
+
+    Returns:
+    list: A CourseRecord or None for every Course ID, in the order given.
+    """
+    courses = index.courses
+    return [courses.get(normalize_course_id(course_id)) for course_id in course_ids]
+
+
+def courses_in_subject(index, subject):
+    """
+    Returns the sorted CourseRecords of a subject, e.g. "MATH".
+    """
+    return [index.courses[course_id] for course_id in index.subjects.get(normalize_course_id(subject), [])]
+
+
+def courses_with_prefix(index, prefix):
+    """
+    Returns the sorted CourseRecords whose Course ID starts with prefix.
+
+    Trailing x's are treated as wildcards, so "MATH 1xx" returns every MATH course numbered 1..
+    """
+    prefix = re.sub(r'(?<=[0-9 ])X+$', '', normalize_course_id(prefix))
+    start = bisect.bisect_left(index.sorted_ids, prefix)
+    end = bisect.bisect_left(index.sorted_ids, prefix + "\uffff", start)
+    return [index.courses[course_id] for course_id in index.sorted_ids[start:end]]
+
+
+def export_course_list(index, output_file):
+    """
+    Writes the index in the cleaned_course_list.csv layout (Course ID, Title, Credits, PreReq).
+    """
+    with atomic_open(output_file, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(["Course ID", "Title", "Credits", "PreReq"])
+        for course_id in index.sorted_ids:
+            record = index.courses[course_id]
+            writer.writerow([record.course_id, record.title or "", record.credits or "", record.prereq or ""])
+
+
+def _print_records(records):
+    for record in records:
+        print(f"{record.course_id}\t{record.title}\t{record.credits}\t{record.prereq or ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the course index.")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help=f"index file (default: {DEFAULT_INDEX})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="build or update the index from the ISRS catalog")
+    build.add_argument("source", help="catalog CSV or folder of program CSVs")
+    build.add_argument("--rebuild", action="store_true", help="ignore the existing index")
+    lookup = subparsers.add_parser("lookup", help="print courses by Course ID")
+    lookup.add_argument("course_ids", nargs="+")
+    find = subparsers.add_parser("find", help="print courses of a subject or Course ID prefix, e.g. \"MATH 1xx\"")
+    find.add_argument("prefix")
+    export = subparsers.add_parser("export", help="write the index in the cleaned_course_list.csv layout")
+    export.add_argument("output")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        previous = None if args.rebuild else load_index(args.index)
+        index, rebuilt, removed = build_index(read_source_rows(args.source), previous)
+        save_index(index, args.index)
+        print(f"{len(index.courses)} courses in {len(index.subjects)} subjects written to {args.index} "
+              f"({len(rebuilt)} subject(s) rebuilt, {len(removed)} removed)")
+        return 0
+
+    index = load_index(args.index)
+    if index is None:
+        sys.exit(f"Error: no course index at {args.index}; run the build command first")
+
+    if args.command == "lookup":
+        for course_id, record in zip(args.course_ids, lookup_courses(index, args.course_ids)):
+            if record is None:
+                print(f"{normalize_course_id(course_id)}\tnot found")
+            else:
+                _print_records([record])
+    elif args.command == "find":
+        if normalize_course_id(args.prefix) in index.subjects:
+            _print_records(courses_in_subject(index, args.prefix))
+        else:
+            _print_records(courses_with_prefix(index, args.prefix))
+    else:
+        export_course_list(index, args.output)
+        print(f"Wrote {len(index.courses)} courses to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# Description: Inverted index from Course ID to the programs whose requirement lists name the course.
+# Answers "which programs require ACCT 200, and in which category and credit group" with one dict lookup
+# instead of searching every *List column of the output. The index is written next to the output CSV
+# (new_csv.csv -> new_csv.course_programs.pkl) by maximus_batch.py and maximusV2.py from the same DataFrame
+# they upsert, so it is built in the same pass as the extraction and never re-parses the list strings; the
+# programs of a run replace their previous entries, like the output rows. For an output made before the
+# index existed, or a hand-edited file such as Final_Programs.csv, use the build command.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/course_programs.py" lookup "ACCT 200" "MATH 130"
+#   python "Parsing Scripts/Scripts/course_programs.py" --output New_Work/Work_In_Progress/Final_Programs.csv build
+
+import os
+import re
+import sys
+import time
+import pickle
+import argparse
+from collections import namedtuple
+from requirement_categories import REQUIREMENT_CATEGORIES
+from requirement_format import read_jsonl, read_requirement_csv, records_to_dataframe
+from course_index import normalize_course_id
+from program_output import KEY_COLUMN, atomic_open
+
+# Bump when the index layout changes; an index written by another version is rebuilt from scratch
+INDEX_VERSION = 1
+
+DEFAULT_OUTPUT = "Parsing Scripts/Scripts/new_csv.csv"
+# "HLTH 497-take 12": the course taken for 12 credits; indexed under HLTH 497
+TAKE_SUFFIX = re.compile(r'-take \d+$', re.IGNORECASE)
+# Categories whose lists hold courses; requiredMinor lists minor names
+COURSE_CATEGORIES = [category for category in REQUIREMENT_CATEGORIES if category.list_kind == "courses"]
+# Group of the courses that are listed on their own rather than inside a ['credits_N', ...] list
+REQUIRED_GROUP = "required"
+
+# program:  program name
+# category: name of the requirement category (see requirement_categories.py)
+# group:    credit label of the course's group, e.g. "credits_6", or REQUIRED_GROUP
+ProgramUse = namedtuple("ProgramUse", ["program", "category", "group"])
+
+# version:  INDEX_VERSION at build time
+# courses:  Course ID -> list of ProgramUse, sorted
+# programs: program -> Course IDs indexed for it, used to replace a program's entries
+CourseProgramIndex = namedtuple("CourseProgramIndex", ["version", "courses", "programs"])
+
+
+def index_path_for(output_file):
+    """
+    Returns the index file that belongs to an output CSV or JSON Lines file.
+    """
+    return os.path.splitext(output_file)[0] + ".course_programs.pkl"
+
+
+def _credit_label(item):
+    """
+    Returns the group label of a credits_N item as "credits_N" (hand-edited cells sometimes have "credits 6"),
+    or None if the item is not a label.
+    """
+    if isinstance(item, str) and item.startswith(("credits_", "credits ")):
+        return "credits_" + item[len("credits_"):]
+    return None
+
+
+def _program_uses(row, categories):
+    """
+    Yields (Course ID, ProgramUse) for every course named in one program's requirement lists.
+    Nested lists count for the group they are nested in; area-rule dicts are not courses and are skipped.
+    """
+    program = row[KEY_COLUMN]
+    for category in categories:
+        credit_list = row.get(category.list_column)
+        if not isinstance(credit_list, list):
+            continue
+        # A flat ['credits_N', course, ...] cell is one credit group, the same as [['credits_N', course, ...]]
+        stack = [(credit_list, REQUIRED_GROUP)]
+        while stack:
+            item, group = stack.pop()
+            if isinstance(item, list):
+                label = _credit_label(item[0]) if item else None
+                members = item[1:] if label else item
+                stack.extend((member, group if group != REQUIRED_GROUP else label or group)
+                             for member in reversed(members))
+            elif isinstance(item, str) and item.strip() and _credit_label(item) is None:
+                yield TAKE_SUFFIX.sub("", normalize_course_id(item)), ProgramUse(program, category.name, group)
+
+
+def update_index(index, new_df, categories=COURSE_CATEGORIES):
+    """
+    Adds the programs of new_df to the index, replacing any entries they already had.
+
+    Parameters:
+    index (CourseProgramIndex): The index to update, or None to start a new one.
+    new_df (pd.DataFrame): One row per program with real lists in the *List columns, as returned by
+        extract_requirements or read_requirement_csv.
+    categories (list of RequirementCategory): Categories whose list columns are indexed.
+
+    Returns:
+    CourseProgramIndex: The updated index.
+    """
+    if index is None:
+        index = CourseProgramIndex(INDEX_VERSION, {}, {})
+    rows = new_df.to_dict("records")
+    changed = set()
+    for row in rows:
+        program = row[KEY_COLUMN]
+        for course_id in index.programs.pop(program, ()):
+            index.courses[course_id] = [use for use in index.courses[course_id] if use.program != program]
+            changed.add(course_id)
+    for row in rows:
+        course_ids = set()
+        for course_id, use in _program_uses(row, categories):
+            index.courses.setdefault(course_id, []).append(use)
+            course_ids.add(course_id)
+            changed.add(course_id)
+        index.programs[row[KEY_COLUMN]] = sorted(course_ids)
+    for course_id in changed:
+        uses = sorted(set(index.courses[course_id]))
+        if uses:
+            index.courses[course_id] = uses
+        else:
+            del index.courses[course_id]
+    return index
+
+
+def save_index(index, index_path):
+    """
+    Writes the index to disk, replacing the previous file atomically. It is stored as plain dicts and
+    tuples, so the file does not depend on the module that wrote it (the CLI runs as __main__).
+    """
+    data = {"version": index.version, "programs": index.programs,
+            "courses": {course_id: [tuple(use) for use in uses] for course_id, uses in index.courses.items()}}
+    with atomic_open(index_path, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_index(index_path):
+    """
+    Reads an index written by save_index. Returns None if there is no index or it is from another version.
+    """
+    try:
+        with open(index_path, "rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    courses = {course_id: [ProgramUse(*use) for use in uses] for course_id, uses in data["courses"].items()}
+    return CourseProgramIndex(INDEX_VERSION, courses, data["programs"])
+
+
+def upsert_index(new_df, output_file, categories=COURSE_CATEGORIES):
+    """
+    Updates the index that belongs to output_file with the programs of new_df (called right after
+    the output rows are upserted).
+
+    Returns:
+    str: Path of the index file.
+    """
+    index_path = index_path_for(output_file)
+    save_index(update_index(load_index(index_path), new_df, categories), index_path)
+    return index_path
+
+
+def programs_requiring(index, course_id):
+    """
+    Returns the ProgramUse entries of a course, an empty list if no program names it.
+    """
+    return index.courses.get(normalize_course_id(course_id), [])
+
+
+def read_output(output_file):
+    """
+    Reads an output CSV or JSON Lines file into a DataFrame with real lists; programs whose list cells
+    cannot be parsed are skipped.
+
+    Returns:
+    tuple: (pd.DataFrame, list of messages about skipped programs)
+    """
+    if output_file.endswith(".jsonl"):
+        return records_to_dataframe(read_jsonl(output_file)), []
+    new_df = read_requirement_csv(output_file, errors="skip")
+    return new_df, new_df.attrs["invalid"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the Course ID -> programs index of an output file.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"output CSV or JSON Lines file (default: {DEFAULT_OUTPUT})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="rebuild the index from the whole output file")
+    lookup = subparsers.add_parser("lookup", help="print the programs, categories and groups of courses")
+    lookup.add_argument("course_ids", nargs="+")
+    args = parser.parse_args(argv)
+    index_path = index_path_for(args.output)
+
+    if args.command == "build":
+        new_df, skipped = read_output(args.output)
+        for message in skipped:
+            print(f"Skipped: {message}")
+        index = update_index(None, new_df)
+        save_index(index, index_path)
+        print(f"{len(index.courses)} course(s) of {len(index.programs)} program(s) written to {index_path}")
+        return 0
+
+    index = load_index(index_path)
+    if index is None:
+        sys.exit(f"Error: no index at {index_path}; run the build command first")
+    start = time.perf_counter()
+    results = [(normalize_course_id(course_id), programs_requiring(index, course_id)) for course_id in args.course_ids]
+    seconds = time.perf_counter() - start
+    for course_id, uses in results:
+        if not uses:
+            print(f"{course_id}\tnot required by any program")
+        for use in uses:
+            print(f"{course_id}\t{use.program}\t{use.category}\t{use.group}")
+    print(f"{sum(len(uses) for _, uses in results)} match(es) in {seconds * 1000:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
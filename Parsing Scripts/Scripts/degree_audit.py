@@ -0,0 +1,431 @@
+# Description: Degree audit over the requirement lists of the Maximus output (Final_Programs.csv / new_csv.csv).
+# Every program is compiled once into requirement groups: the required courses of a category form one group,
+# and every ['credits_N', ...] list a "choose N credits" group. A group is a bitset over the integer IDs of
+# all catalog courses plus a credit threshold. Students are then audited in batches: the credits each
+# student earned in every group of every program come from one NumPy gather-and-sum over the student's course
+# IDs, are capped at the group thresholds and summed per program, so ranking one student against all programs
+# takes about a millisecond and thousands of students take well under a second.
+#
+# Tokens that are not plain Course IDs are resolved where possible: "CIS 400-499" is any CIS course in that
+# range, "ANY 300-499" any course in that range, and "HLTH 497-take 12" is HLTH 497 taken for 12 credits.
+# Anything else ("ANY", "GOAL 2", minor names, area rules) cannot be audited and is listed per program.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/degree_audit.py" closest "ACCT 200" "MATH 130" "ECON 201" --top 5
+#   python "Parsing Scripts/Scripts/degree_audit.py" missing "Accounting (BS)" "ACCT 200" "MATH 130"
+#   python "Parsing Scripts/Scripts/degree_audit.py" batch students.csv -o closest_programs.csv
+#
+# students.csv has one row per completed course, with the columns StudentID and Course ID.
+
+import re
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from requirement_categories import REQUIREMENT_CATEGORIES
+from requirement_format import read_requirement_csv
+from course_index import normalize_course_id
+from program_output import KEY_COLUMN, atomic_open
+
+DEFAULT_PROGRAMS = "New_Work/Work_In_Progress/Final_Programs.csv"
+DEFAULT_COURSE_LIST = "New_Work/Final_CSV_Files/cleaned_course_list.csv"
+# Credits of a course that is not in the course list, and of one course picked from a range
+DEFAULT_COURSE_CREDITS = 3
+# Categories whose lists hold courses; requiredMinor lists minor names
+AUDIT_CATEGORIES = [category for category in REQUIREMENT_CATEGORIES if category.list_kind == "courses"]
+# Students gathered at a time, which bounds the temporary (students x courses x groups) arrays
+DEFAULT_BATCH_SIZE = 256
+
+COURSE_ID = re.compile(r'^([A-Z]{2,5}) (\d{3})([A-Z]?)$')
+COURSE_RANGE = re.compile(r'^([A-Z]{2,5}) (\d{3})-(\d{3})$')
+COURSE_TAKE = re.compile(r'^([A-Z]{2,5} \d{3}[A-Z]?)-take (\d+)$')
+# Group label of a choose-N list; hand-edited cells sometimes have "credits 6" for "credits_6"
+CREDITS_LABEL = re.compile(r'^credits[_ ](\d+)$')
+
+# programs:        program names, in the order of the result columns
+# course_ids:      Course ID of every integer course ID
+# course_index:    Course ID -> integer course ID
+# group_program:   program number of every group (groups are sorted by program)
+# group_category:  category name of every group
+# thresholds:      credits needed in every group
+# bits:            (groups x words) uint64 bitsets of the courses that count for every group
+# weights:         (courses + 1 x groups) credits a course earns in a group; the last row is all zeros
+# program_starts:  index of the first group of every program
+# program_credits: credits every program needs (the sum of its group thresholds)
+# unresolved:      program -> requirement tokens that could not be audited
+# unaudited:       number of unresolved tokens of every program
+CompiledAudit = namedtuple("CompiledAudit", [
+    "programs", "course_ids", "course_index", "group_program", "group_category", "thresholds", "bits", "weights",
+    "program_starts", "program_credits", "unresolved", "unaudited",
+])
+
+# completion: (students x programs) share of each program's credits the students have, 0..1
+# remaining:  (students x programs) credits still needed
+AuditResult = namedtuple("AuditResult", ["completion", "remaining"])
+
+
+def load_course_credits(course_list=DEFAULT_COURSE_LIST):
+    """
+    Reads the credits of every course from cleaned_course_list.csv; a range such as "1-3" counts its low end.
+
+    Returns:
+    dict: Course ID -> credits.
+    """
+    courses = pd.read_csv(course_list, dtype=str, keep_default_na=False)
+    credits = courses["Credits"].str.extract(r'(\d+)', expand=False).astype(float).fillna(DEFAULT_COURSE_CREDITS)
+    return dict(zip(courses["Course ID"].map(normalize_course_id), credits))
+
+
+class _CourseResolver:
+    """
+    Maps requirement tokens to (integer course ID, credits) pairs over a fixed course universe.
+    """
+
+    def __init__(self, course_credits):
+        self.course_ids = sorted(course_credits)
+        self.course_index = {course_id: index for index, course_id in enumerate(self.course_ids)}
+        self.credits = np.array([course_credits[course_id] for course_id in self.course_ids], dtype=np.float32)
+        parts = [COURSE_ID.match(course_id) for course_id in self.course_ids]
+        self.subjects = np.array([match.group(1) if match else "" for match in parts])
+        self.numbers = np.array([int(match.group(2)) if match else -1 for match in parts])
+
+    def resolve(self, token):
+        """
+        Returns the courses a token stands for as a list of (index, credits), and whether it is a range
+        (one course out of many) rather than specific courses. None if the token cannot be audited.
+        """
+        token = normalize_course_id(token)
+        if token in self.course_index:
+            index = self.course_index[token]
+            return [(index, float(self.credits[index]))], False
+        take = COURSE_TAKE.match(token)
+        if take and take.group(1) in self.course_index:
+            return [(self.course_index[take.group(1)], float(take.group(2)))], False
+        course_range = COURSE_RANGE.match(token)
+        if course_range:
+            subject, low, high = course_range.group(1), int(course_range.group(2)), int(course_range.group(3))
+            selected = (self.numbers >= low) & (self.numbers <= high)
+            if subject != "ANY":
+                selected &= self.subjects == subject
+            indexes = np.flatnonzero(selected)
+            if len(indexes):
+                return [(int(index), float(self.credits[index])) for index in indexes], True
+        return None
+
+
+def _is_credit_label(item):
+    return isinstance(item, str) and item.startswith(("credits_", "credits "))
+
+
+def _group_members(items, resolver, unresolved):
+    """
+    Resolves the courses of a credits_N list (nested lists are merged into it).
+    """
+    members = {}
+    for item in items:
+        if isinstance(item, list):
+            members.update(_group_members(item[1:] if item and _is_credit_label(item[0]) else item,
+                                          resolver, unresolved))
+        elif _is_credit_label(item):
+            continue
+        elif isinstance(item, str):
+            resolved = resolver.resolve(item)
+            if resolved is None:
+                unresolved.append(item)
+            else:
+                members.update(resolved[0])
+        else:
+            unresolved.append(repr(item))
+    return members
+
+
+def _program_groups(row, resolver, unresolved):
+    """
+    Builds the (category, threshold, {course index: credits}) groups of one program.
+    """
+    groups = []
+    for category in AUDIT_CATEGORIES:
+        credit_list = row.get(category.list_column)
+        if not isinstance(credit_list, list):
+            continue
+        required = {}
+        # A flat ['credits_N', course, ...] cell is one choose-N group, the same as [['credits_N', course, ...]]
+        items = [credit_list] if credit_list and _is_credit_label(credit_list[0]) else credit_list
+        for item in items:
+            if isinstance(item, list):
+                match = CREDITS_LABEL.match(item[0]) if item and _is_credit_label(item[0]) else None
+                if match is None:
+                    members = _group_members(item, resolver, unresolved)
+                    required.update(members)
+                    continue
+                members = _group_members(item[1:], resolver, unresolved)
+                if int(match.group(1)) > 0 and members:
+                    groups.append((category.name, float(match.group(1)), members))
+            elif _is_credit_label(item):
+                continue
+            elif isinstance(item, str):
+                resolved = resolver.resolve(item)
+                if resolved is None:
+                    unresolved.append(item)
+                elif resolved[1]:
+                    # A bare range is one course picked from it
+                    groups.append((category.name, float(DEFAULT_COURSE_CREDITS), dict(resolved[0])))
+                else:
+                    required.update(resolved[0])
+            else:
+                unresolved.append(repr(item))
+        if required:
+            groups.append((category.name, float(sum(required.values())), required))
+    return groups
+
+
+def compile_audit(programs_df, course_credits):
+    """
+    Compiles the requirement lists of every program into group bitsets, credit weights and thresholds.
+
+    Parameters:
+    programs_df (pd.DataFrame): Programs as returned by read_requirement_csv.
+    course_credits (dict): Course ID -> credits, as returned by load_course_credits. Courses named in the
+        requirements but missing here are added with DEFAULT_COURSE_CREDITS.
+
+    Returns:
+    CompiledAudit: The compiled requirements. Programs without any auditable requirement are left out.
+    """
+    course_credits = dict(course_credits)
+    for row in programs_df.to_dict("records"):
+        for category in AUDIT_CATEGORIES:
+            stack = [row.get(category.list_column)]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, list):
+                    stack.extend(item)
+                elif isinstance(item, str) and COURSE_ID.match(normalize_course_id(item)):
+                    # "ANY 500" is a placeholder, not a course of a subject called ANY
+                    if not normalize_course_id(item).startswith("ANY "):
+                        course_credits.setdefault(normalize_course_id(item), float(DEFAULT_COURSE_CREDITS))
+    resolver = _CourseResolver(course_credits)
+
+    programs, group_program, group_category, thresholds, members = [], [], [], [], []
+    unresolved = {}
+    for row in programs_df.to_dict("records"):
+        program_unresolved = []
+        groups = _program_groups(row, resolver, program_unresolved)
+        if program_unresolved:
+            unresolved[row[KEY_COLUMN]] = program_unresolved
+        if not groups:
+            continue
+        for category, threshold, group_members in groups:
+            group_program.append(len(programs))
+            group_category.append(category)
+            thresholds.append(threshold)
+            members.append(group_members)
+        programs.append(row[KEY_COLUMN])
+
+    course_count = len(resolver.course_ids)
+    weights = np.zeros((course_count + 1, len(members)), dtype=np.float32)
+    membership = np.zeros((len(members), course_count), dtype=bool)
+    for group, group_members in enumerate(members):
+        indexes = np.fromiter(group_members.keys(), dtype=np.int64, count=len(group_members))
+        weights[indexes, group] = np.fromiter(group_members.values(), dtype=np.float32, count=len(group_members))
+        membership[group, indexes] = True
+    bits = _pack_bits(membership)
+
+    group_program = np.array(group_program, dtype=np.int32)
+    thresholds = np.array(thresholds, dtype=np.float32)
+    program_starts = np.searchsorted(group_program, np.arange(len(programs)))
+    program_credits = np.add.reduceat(thresholds, program_starts) if len(programs) else np.zeros(0, np.float32)
+    unaudited = np.array([len(unresolved.get(program, ())) for program in programs], dtype=np.int32)
+    return CompiledAudit(programs, resolver.course_ids, resolver.course_index, group_program, group_category,
+                         thresholds, bits, weights, program_starts, program_credits, unresolved, unaudited)
+
+
+def _pack_bits(membership):
+    """
+    Packs a (rows x courses) bool matrix into (rows x words) uint64 bitsets, bit i of word w = course 64 * w + i.
+    """
+    words = -(-membership.shape[1] // 64)
+    padded = np.zeros((membership.shape[0], words * 64), dtype=bool)
+    padded[:, :membership.shape[1]] = membership
+    return np.packbits(padded, axis=1, bitorder="little").view(np.uint64)
+
+
+def course_bits(audit, courses):
+    """
+    Returns the uint64 bitset of a set of Course IDs; courses outside the catalog are ignored.
+    """
+    membership = np.zeros((1, len(audit.course_ids)), dtype=bool)
+    membership[0, [audit.course_index[course] for course in map(normalize_course_id, courses)
+                   if course in audit.course_index]] = True
+    return _pack_bits(membership)[0]
+
+
+def audit_students(audit, student_courses, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Audits many students against every program at once.
+
+    Parameters:
+    audit (CompiledAudit): The compiled requirements.
+    student_courses (list of iterables of str): The completed Course IDs of each student.
+    batch_size (int): Students gathered at a time.
+
+    Returns:
+    AuditResult: (students x programs) completion and remaining credits, programs in audit.programs order.
+    """
+    sentinel = len(audit.course_ids)
+    course_index = audit.course_index
+    completion = np.zeros((len(student_courses), len(audit.programs)), dtype=np.float32)
+    remaining = np.zeros_like(completion)
+    for start in range(0, len(student_courses), batch_size):
+        batch = student_courses[start:start + batch_size]
+        # Each student's course IDs followed by the all-zero sentinel row, so no student has an empty segment
+        indexes = [sorted({course_index[course] for course in map(normalize_course_id, courses)
+                           if course in course_index}) + [sentinel] for courses in batch]
+        offsets = np.cumsum([0] + [len(student) for student in indexes[:-1]])
+        flat = np.fromiter((index for student in indexes for index in student), dtype=np.int64)
+        earned = np.add.reduceat(audit.weights[flat], offsets, axis=0)
+        capped = np.minimum(earned, audit.thresholds)
+        have = np.add.reduceat(capped, audit.program_starts, axis=1) if len(audit.programs) else capped[:, :0]
+        completion[start:start + len(batch)] = have / np.maximum(audit.program_credits, 1e-9)
+        remaining[start:start + len(batch)] = audit.program_credits - have
+    return AuditResult(completion, remaining)
+
+
+def closest_programs(audit, courses, top=10):
+    """
+    Ranks the programs for one student by completion (ties: fewer remaining credits). Programs with
+    requirements that cannot be audited are demoted: for the ranking, each unaudited item counts as a course
+    of DEFAULT_COURSE_CREDITS the student still needs, so a program that is mostly unauditable does not rise
+    to the top on the few courses that could be checked.
+
+    Returns:
+    pd.DataFrame: Program, Completion, RemainingCredits, RequiredCredits and UnauditedItems of the top programs.
+    """
+    result = audit_students(audit, [courses])
+    return _ranking(audit, result.completion[0], result.remaining[0], top)
+
+
+def _ranking(audit, completion, remaining, top):
+    unaudited_credits = audit.unaudited * DEFAULT_COURSE_CREDITS
+    score = completion * audit.program_credits / (audit.program_credits + unaudited_credits)
+    order = np.lexsort((remaining, -score))[:top]
+    return pd.DataFrame({
+        "Program": [audit.programs[index] for index in order],
+        "Completion": np.round(completion[order], 4),
+        "RemainingCredits": np.round(remaining[order], 1),
+        "RequiredCredits": audit.program_credits[order],
+        "UnauditedItems": audit.unaudited[order],
+    })
+
+
+def missing_courses(audit, program, courses):
+    """
+    Lists what a student still needs for one program, group by group.
+
+    Returns:
+    list of tuple: (category, credits still needed, Course IDs of the group the student has not taken)
+    for every group that is not complete.
+    """
+    try:
+        number = audit.programs.index(program)
+    except ValueError:
+        raise KeyError(f"Program not found: {program}") from None
+    student = course_bits(audit, courses)
+    groups = range(audit.program_starts[number],
+                   audit.program_starts[number + 1] if number + 1 < len(audit.programs) else len(audit.thresholds))
+    taken = sorted({audit.course_index[course] for course in map(normalize_course_id, courses)
+                    if course in audit.course_index})
+    group_earned = audit.weights[taken + [len(audit.course_ids)]].sum(axis=0)
+    needed = []
+    for group in groups:
+        still_needed = float(audit.thresholds[group] - min(group_earned[group], audit.thresholds[group]))
+        if still_needed <= 0:
+            continue
+        # Courses of the group the student has not taken: the group's bits without the student's bits
+        open_bits = audit.bits[group] & ~student
+        open_courses = np.flatnonzero(np.unpackbits(open_bits.view(np.uint8), bitorder="little"))
+        needed.append((audit.group_category[group], still_needed, [audit.course_ids[index] for index in open_courses]))
+    return needed
+
+
+def read_students(student_file):
+    """
+    Reads a StudentID, Course ID CSV (one row per completed course).
+
+    Returns:
+    tuple: (list of student IDs, list of lists of Course IDs) in first-appearance order.
+    """
+    rows = pd.read_csv(student_file, dtype=str, keep_default_na=False)
+    missing = [column for column in ["StudentID", "Course ID"] if column not in rows.columns]
+    if missing:
+        raise ValueError(f"{student_file} has no column(s) {', '.join(missing)}")
+    grouped = rows.groupby("StudentID", sort=False)["Course ID"].agg(list)
+    return list(grouped.index), list(grouped.values)
+
+
+def load_audit(programs_file=DEFAULT_PROGRAMS, course_list=DEFAULT_COURSE_LIST):
+    """
+    Reads and compiles the requirements; programs with list cells that cannot be parsed are skipped.
+
+    Returns:
+    tuple: (CompiledAudit, list of messages about skipped programs)
+    """
+    programs_df = read_requirement_csv(programs_file, errors="skip")
+    return compile_audit(programs_df, load_course_credits(course_list)), programs_df.attrs["invalid"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit completed courses against every program's requirements.")
+    parser.add_argument("--programs", default=DEFAULT_PROGRAMS, help=f"requirement CSV (default: {DEFAULT_PROGRAMS})")
+    parser.add_argument("--course-list", default=DEFAULT_COURSE_LIST, help=f"course credits (default: {DEFAULT_COURSE_LIST})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    closest = subparsers.add_parser("closest", help="rank the programs for one student's completed courses")
+    closest.add_argument("courses", nargs="+")
+    closest.add_argument("--top", type=int, default=10)
+    missing = subparsers.add_parser("missing", help="list what one student still needs for a program")
+    missing.add_argument("program")
+    missing.add_argument("courses", nargs="*")
+    batch = subparsers.add_parser("batch", help="rank the programs for every student of a StudentID, Course ID CSV")
+    batch.add_argument("students")
+    batch.add_argument("-o", "--output", default="closest_programs.csv", help="output CSV (default: %(default)s)")
+    batch.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    audit, skipped = load_audit(args.programs, args.course_list)
+    print(f"Compiled {len(audit.programs)} program(s), {len(audit.thresholds)} requirement group(s) over "
+          f"{len(audit.course_ids)} courses in {time.perf_counter() - start:.2f} s "
+          f"({len(skipped)} unreadable list cell(s) skipped, {len(audit.unresolved)} program(s) with unaudited items)")
+
+    if args.command == "closest":
+        print(closest_programs(audit, args.courses, args.top).to_string(index=False))
+    elif args.command == "missing":
+        try:
+            needed = missing_courses(audit, args.program, args.courses)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}")
+            return 1
+        for category, credits, courses in needed:
+            shown = ", ".join(courses[:12]) + (f", ... ({len(courses)} courses)" if len(courses) > 12 else "")
+            print(f"{category}: {credits:g} credit(s) from {shown}")
+        for token in audit.unresolved.get(args.program, []):
+            print(f"not audited: {token}")
+    else:
+        student_ids, student_courses = read_students(args.students)
+        start = time.perf_counter()
+        result = audit_students(audit, student_courses)
+        seconds = time.perf_counter() - start
+        rankings = [_ranking(audit, result.completion[row], result.remaining[row], args.top).assign(StudentID=student_id)
+                    for row, student_id in enumerate(student_ids)]
+        output = pd.concat(rankings, ignore_index=True) if rankings else pd.DataFrame()
+        columns = ["StudentID", "Program", "Completion", "RemainingCredits", "RequiredCredits", "UnauditedItems"]
+        with atomic_open(args.output, "w", newline='', encoding='utf-8') as f:
+            output.reindex(columns=columns).to_csv(f, index=False, lineterminator='\n')
+        print(f"Audited {len(student_ids)} student(s) against {len(audit.programs)} program(s) in {seconds * 1000:.1f} ms; "
+              f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# Description: On-disk cache of Maximus results for the batch script (maximus_batch.py).
+# Each program CSV's computed rows are stored under a hash of the file's content combined with a hash of the
+# requirement category configuration, so only files that changed (or all files, after a keyword edit) are
+# processed again. The cache directory has a size cap; the least recently used entries are removed first.
+
+import os
+import pickle
+import hashlib
+import tempfile
+from collections import namedtuple
+from requirement_categories import DEFAULT_MATCHER, fingerprint_categories
+
+# Bump when requirement_extraction.py changes in a way that alters its output, so old entries are ignored
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = "Parsing Scripts/Scripts/.maximus_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# directory:   where entries are stored
+# config_hash: hash of the category configuration and CACHE_VERSION
+# max_bytes:   size cap of the directory
+# rebuild:     ignore existing entries (they are still replaced with fresh results)
+ExtractionCache = namedtuple("ExtractionCache", ["directory", "config_hash", "max_bytes", "rebuild"])
+
+
+def open_cache(directory=DEFAULT_CACHE_DIR, matcher=DEFAULT_MATCHER, max_bytes=DEFAULT_MAX_BYTES, rebuild=False):
+    """
+    Creates the cache directory if needed and returns the cache settings.
+
+    Parameters:
+    directory (str): Cache directory.
+    matcher (CategoryMatcher): Compiled requirement categories.
+    max_bytes (int): Size cap of the cache directory.
+    rebuild (bool): Recompute every file instead of reading existing entries.
+
+    Returns:
+    ExtractionCache: The cache settings.
+    """
+    fingerprint = fingerprint_categories(matcher.categories)
+    config_hash = hashlib.sha256(f"{CACHE_VERSION}:{fingerprint}".encode("utf-8")).hexdigest()
+    os.makedirs(directory, exist_ok=True)
+    return ExtractionCache(directory, config_hash, max_bytes, rebuild)
+
+
+def cache_key(cache, content):
+    """
+    Returns the cache key of a source file from its raw bytes.
+    """
+    digest = hashlib.sha256(cache.config_hash.encode("utf-8"))
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _entry_path(cache, key):
+    return os.path.join(cache.directory, key + ".pkl")
+
+
+def load_cached(cache, key):
+    """
+    Returns the cached result for key, or None when there is no usable entry.
+
+    A hit refreshes the entry's modification time, which is what eviction uses as "last used".
+    """
+    if cache.rebuild:
+        return None
+    path = _entry_path(cache, key)
+    try:
+        with open(path, "rb") as f:
+            result = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Unreadable entry (for example left by an older pandas version): treat as a miss
+        return None
+    os.utime(path)
+    return result
+
+
+def store_cached(cache, key, result):
+    """
+    Stores a result under key. The entry is written to a temporary file first so readers never see half of it.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=cache.directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, _entry_path(cache, key))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def evict(cache):
+    """
+    Removes the least recently used entries until the cache directory fits under its size cap.
+
+    Returns:
+    int: Number of entries removed.
+    """
+    entries = []
+    for entry in os.scandir(cache.directory):
+        if entry.is_file() and entry.name.endswith(".pkl"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= cache.max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
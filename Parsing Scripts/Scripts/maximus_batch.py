@@ -0,0 +1,212 @@
+# Description: Batch entry point for the Maximus script.
+# Runs the requirement extraction of maximusV2.py over many program CSV files in one process,
+# sharing one pandas import and one compiled category matcher, and reports the time spent per file.
+# With --workers N the files are spread across N worker processes. Results are cached per file content
+# (see extraction_cache.py), so unchanged programs are skipped; use --rebuild or --no-cache to recompute.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/maximus_batch.py" New_Work/Seperate_Programs_and_degrees-CSV_Files
+#   python "Parsing Scripts/Scripts/maximus_batch.py" "New_Work/Seperate_Programs_and_degrees-CSV_Files/Art_*.csv"
+#   python "Parsing Scripts/Scripts/maximus_batch.py" --workers 8 New_Work/Seperate_Programs_and_degrees-CSV_Files
+
+import io
+import os
+import sys
+import glob
+import time
+import argparse
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from requirement_categories import DEFAULT_MATCHER
+from catalog_schema import load_catalog
+from requirement_extraction import normalize_catalog, extract_requirements
+from program_output import upsert_programs
+from requirement_format import upsert_records
+from course_programs import upsert_index
+from extraction_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, open_cache, cache_key, load_cached, store_cached, evict
+
+DEFAULT_OUTPUT = "Parsing Scripts/Scripts/new_csv.csv"
+# Chunks handed to each worker process over a run; fewer, larger chunks mean less inter-process traffic,
+# more of them keep the workers evenly busy when some files take longer than others
+CHUNKS_PER_WORKER = 4
+
+# Matcher and cache of a worker process, set once by _init_worker instead of being pickled with every file
+_worker_matcher = DEFAULT_MATCHER
+_worker_cache = None
+
+
+def find_program_files(inputs):
+    """
+    Expands files, directories and glob patterns into a sorted list of CSV files.
+
+    Parameters:
+    inputs (list of str): Paths to CSV files or directories, or glob patterns.
+
+    Returns:
+    list of str: The CSV files, without duplicates.
+    """
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            files.update(glob.glob(os.path.join(item, "*.csv")))
+        elif os.path.isfile(item):
+            files.add(item)
+        else:
+            files.update(path for path in glob.glob(item) if path.endswith(".csv"))
+    return sorted(files)
+
+
+def process_file(file_path, matcher=DEFAULT_MATCHER, cache=None):
+    """
+    Runs the Maximus steps on one program CSV file, or returns the cached result if the file is unchanged.
+
+    Parameters:
+    file_path (str): Path to a program CSV file.
+    matcher (CategoryMatcher): Compiled requirement categories.
+    cache (ExtractionCache): Result cache, or None to always compute.
+
+    Returns:
+    tuple: (DataFrame with one row per program, seconds spent on the file, whether it came from the cache)
+    """
+    start = time.perf_counter()
+    with open(file_path, "rb") as f:
+        content = f.read()
+
+    if cache is not None:
+        key = cache_key(cache, content)
+        new_df = load_cached(cache, key)
+        if new_df is not None:
+            return new_df, time.perf_counter() - start, True
+
+    main_record = normalize_catalog(load_catalog(io.BytesIO(content)))
+    new_df = extract_requirements(main_record, matcher)
+
+    if cache is not None:
+        store_cached(cache, key, new_df)
+    return new_df, time.perf_counter() - start, False
+
+
+def _init_worker(matcher, cache):
+    global _worker_matcher, _worker_cache
+    _worker_matcher, _worker_cache = matcher, cache
+
+
+def _process_in_worker(file_path):
+    try:
+        return process_file(file_path, _worker_matcher, _worker_cache) + (None,)
+    except Exception as e:
+        return None, 0.0, False, e
+
+
+def iter_file_results(files, matcher=DEFAULT_MATCHER, workers=1, cache=None):
+    """
+    Processes the files and yields each result in file order.
+
+    With one worker the files are processed in this process. With more workers the matcher and cache
+    are sent to each worker process once, and the files are handed out in chunks.
+
+    Parameters:
+    files (list of str): Program CSV files.
+    matcher (CategoryMatcher): Compiled requirement categories.
+    workers (int): Number of worker processes.
+    cache (ExtractionCache): Result cache, or None to always compute.
+
+    Yields:
+    tuple: (index of the file in files, DataFrame or None, seconds, cached, exception or None)
+    """
+    if workers <= 1:
+        for index, file_path in enumerate(files):
+            try:
+                new_df, seconds, cached = process_file(file_path, matcher, cache)
+            except Exception as e:
+                yield index, None, 0.0, False, e
+                continue
+            yield index, new_df, seconds, cached, None
+        return
+
+    chunksize = max(1, len(files) // (workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher, cache)) as executor:
+        results = executor.map(_process_in_worker, files, chunksize=chunksize)
+        for index, (new_df, seconds, cached, error) in enumerate(results):
+            yield index, new_df, seconds, cached, error
+
+
+def run_batch(files, matcher=DEFAULT_MATCHER, workers=1, cache=None):
+    """
+    Processes every file and prints the time spent on each one.
+
+    Files that fail to load or process are reported and skipped. Results are merged in file
+    order, so the output does not depend on workers.
+
+    Parameters:
+    files (list of str): Program CSV files.
+    matcher (CategoryMatcher): Compiled requirement categories.
+    workers (int): Number of worker processes (1 runs everything in this process).
+    cache (ExtractionCache): Result cache, or None to always compute.
+
+    Returns:
+    pd.DataFrame: The rows of every processed file, in file order.
+    """
+    results = {}
+    hits = 0
+    for index, new_df, seconds, cached, error in iter_file_results(files, matcher, workers, cache):
+        if error is not None:
+            print(f"Error processing {files[index]}: {error}")
+            continue
+        hits += cached
+        status = " (cached)" if cached else ""
+        print(f"{os.path.basename(files[index])}: {len(new_df)} program(s) in {seconds * 1000:.1f} ms{status}")
+        results[index] = new_df
+
+    if cache is not None:
+        print(f"Cache: {hits} of {len(files)} file(s) unchanged, {len(results) - hits} recomputed")
+
+    if not results:
+        return pd.DataFrame()
+    return pd.concat([results[index] for index in sorted(results)], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Maximus requirement extraction over many program CSV files.")
+    parser.add_argument("inputs", nargs="+", help="program CSV files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"output CSV file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--jsonl", help="also upsert the programs into this JSON Lines file (schema in requirement_format.py)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes, 0 for one per CPU (default: 1, no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the result cache")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every file and refresh the result cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"result cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="size cap of the result cache; least recently used entries are removed first (default: %(default)s)")
+    args = parser.parse_args(argv)
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+
+    files = find_program_files(args.inputs)
+    if not files:
+        print("Error: no CSV files found.")
+        return 1
+
+    cache = None
+    if not args.no_cache:
+        cache = open_cache(args.cache_dir, max_bytes=int(args.cache_size_mb * 1024 * 1024), rebuild=args.rebuild)
+
+    start = time.perf_counter()
+    new_df = run_batch(files, workers=workers, cache=cache)
+    if cache is not None:
+        evict(cache)
+    print(f"Processed {len(files)} file(s), {len(new_df)} program(s) with {workers} worker(s) "
+          f"in {time.perf_counter() - start:.2f} s")
+    if new_df.empty:
+        return 1
+
+    added, replaced = upsert_programs(new_df, args.output)
+    print(f"Data written to {args.output} successfully! ({added} added, {replaced} replaced)")
+    print(f"Course -> program index updated: {upsert_index(new_df, args.output)}")
+    if args.jsonl:
+        added, replaced = upsert_records(new_df, args.jsonl)
+        print(f"Data written to {args.jsonl} successfully! ({added} added, {replaced} replaced)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,10 +9,11 @@
 
 # %%
 import pandas as pd
+from catalog_schema import load_catalog
 
 def load_csv_to_dataframe(file_path):
     """
-    Loads a CSV file into a Pandas DataFrame.
+    Loads a CSV file into a Pandas DataFrame, with the ISRS column dtypes from catalog_schema.py.
     
     Parameters:
     file_path (str): The path to the CSV file.
@@ -21,7 +22,7 @@ def load_csv_to_dataframe(file_path):
     pd.DataFrame: A DataFrame containing the CSV data.
     """
     try:
-        df = pd.read_csv(file_path)
+        df = load_catalog(file_path)
         print("CSV file loaded successfully.")
         return df
     except Exception as e:
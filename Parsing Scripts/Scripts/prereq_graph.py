@@ -0,0 +1,506 @@
+# Description: Parser for the free-text PreReq column and a compiled prerequisite graph built from it.
+# A PreReq string such as "MATH 247 and MATH 290 with “C” (2.0) or better, or consent" is turned into an
+# expression tree of AllOf/AnyOf nodes over Course and Condition leaves (anything that is not a course, such as
+# "consent" or "Admission to major"). The trees of every course are compiled into adjacency arrays in CSR form
+# (indptr/indices) with the transitive closure of every course precomputed, so "what must be taken before X"
+# and topological orderings are answered without reading the PreReq strings again.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/prereq_graph.py" parse "MATH 112 or MATH 115 or MATH 121"
+#   python "Parsing Scripts/Scripts/prereq_graph.py" before "MATH 223" [--required]
+#   python "Parsing Scripts/Scripts/prereq_graph.py" order "MATH 223" "MATH 121" "MATH 122"
+#   python "Parsing Scripts/Scripts/prereq_graph.py" stats
+#
+# The course list defaults to New_Work/Final_CSV_Files/cleaned_course_list.csv (columns Course ID and PreReq).
+
+import re
+import sys
+import heapq
+import timeit
+import argparse
+import numpy as np
+import pandas as pd
+from collections import namedtuple, deque
+
+DEFAULT_COURSE_LIST = "New_Work/Final_CSV_Files/cleaned_course_list.csv"
+
+# Expression tree nodes. items is a tuple of nodes.
+Course = namedtuple("Course", ["course_id"])
+Condition = namedtuple("Condition", ["text"])
+AllOf = namedtuple("AllOf", ["items"])
+AnyOf = namedtuple("AnyOf", ["items"])
+
+# text:  the PreReq string as written
+# tree:  the requirement as an expression tree, or None when the string holds no requirement
+# notes: advice that is not a requirement (recommended courses, co-requisites) and minimum grades
+Prerequisite = namedtuple("Prerequisite", ["text", "tree", "notes"])
+
+# course_ids:        course of every node, in node order
+# positions:         course_id -> node number
+# indptr, indices:   CSR adjacency of every course leaf in a course's PreReq (any alternative)
+# required_indptr,
+# required_indices:  CSR adjacency of the courses needed in every alternative of a course's PreReq
+# closure:           node -> tuple of nodes reachable through indptr/indices
+# required_closure:  node -> tuple of nodes reachable through required_indptr/required_indices
+PrereqGraph = namedtuple("PrereqGraph", [
+    "course_ids", "positions", "indptr", "indices", "required_indptr", "required_indices",
+    "closure", "required_closure",
+])
+
+_GRADE = re.compile(
+    r'(?:\bwith\s+)?(?:\ban?\s+)?(?:\b(?:minimum\s+)?grade\s+of\s+)?["“”]?\b([A-F][+-]?)["“”]?\s*(?:\(\d\.\d+\))?'
+    r'\s+or\s+(?:better|higher|above)(?:\s+in\b)?',
+    re.IGNORECASE,
+)
+_ADVISORY = re.compile(r'recommend|encourag|co-?requisite|may also apply|substitut', re.IGNORECASE)
+# Semicolons and sentence ends ("M.S. in" is not one)
+_CLAUSE_BREAK = re.compile(r';|\.(?=\s+[A-Z"“]|\s*$)')
+_TOKEN = re.compile(r"""
+    (?P<course>\b(?P<subjects>[A-Za-z]{2,5}(?:\s*/\s*[A-Za-z]{2,5})*)\s?(?P<numbers>\d{3}[A-Z]?(?:\s*/\s*\d{3}[A-Z]?)*)\b)
+  | (?P<number>\b\d{3}[A-Z]?(?:\s*/\s*\d{3}[A-Z]?)*\b)
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<comma>,)
+  | (?P<word>[^\s,()]+)
+""", re.VERBOSE)
+_OPERATORS = {"and": "and", "&": "and", "or": "or"}
+_SKIPPED_WORDS = {"either", "both"}
+# Words that are left over around courses once operators and grades are removed ("MATH 121 with")
+_FILLER_WORDS = {"with", "in", "of", "a", "an", "the", "grade", "completion", "prerequisite", "prerequisites",
+                 "prerequisite:", "prerequisites:", "and/or"}
+
+
+def _split_numbers(numbers):
+    return [number.strip() for number in numbers.split("/")]
+
+
+def _course_node(subjects, numbers):
+    courses = [Course(f"{subject.upper()} {number}") for subject in subjects for number in numbers]
+    return courses[0] if len(courses) == 1 else AnyOf(tuple(courses))
+
+
+def tokenize(clause, known_subjects=None):
+    """
+    Splits one clause of a PreReq string into tokens.
+
+    A subject must be written in capitals ("MATH 121") unless known_subjects is given, in which case any
+    spelling of a known subject counts ("Geog 101"). "MATH/STAT 354" and "GEOG 473/573" become AnyOf nodes, and
+    a bare number right after a course and a separator ("ANTH 101, 230") takes that course's subject.
+
+    Returns:
+    list of tuple: ("node", node), ("and",), ("or",), (",",), ("(",), (")",) or ("text", word).
+    """
+    tokens = []
+    last_subjects = None
+
+    def add_word(word):
+        nonlocal last_subjects
+        lowered = word.lower()
+        if lowered in _OPERATORS:
+            tokens.append((_OPERATORS[lowered],))
+        elif lowered not in _SKIPPED_WORDS:
+            tokens.append(("text", word))
+            last_subjects = None
+
+    def add_number(numbers):
+        previous = len(tokens) - 1
+        while previous >= 0 and tokens[previous][0] in (",", "and", "or"):
+            previous -= 1
+        follows_course = 0 <= previous < len(tokens) - 1 and tokens[previous][0] == "node"
+        if last_subjects is not None and follows_course:
+            tokens.append(("node", _course_node(last_subjects, _split_numbers(numbers))))
+        else:
+            tokens.append(("text", numbers))
+
+    for match in _TOKEN.finditer(clause):
+        kind = match.lastgroup
+        if kind in ("course", "subjects", "numbers"):
+            subjects = [subject.strip() for subject in match.group("subjects").split("/")]
+            if all(subject.isupper() if known_subjects is None else subject.upper() in known_subjects
+                   for subject in subjects):
+                last_subjects = subjects
+                tokens.append(("node", _course_node(subjects, _split_numbers(match.group("numbers")))))
+            else:
+                # Not a subject ("or 473", "least 300"): a word followed by a number
+                add_word(match.group("subjects"))
+                add_number(match.group("numbers"))
+        elif kind == "number":
+            add_number(match.group(0))
+        elif kind == "word":
+            add_word(match.group(0))
+        else:
+            tokens.append(({"open": "(", "close": ")", "comma": ","}[kind],))
+    return _merge_text(tokens)
+
+
+def _merge_text(tokens):
+    """
+    Joins runs of text into single Condition nodes.
+
+    "and", "or" and commas between two pieces of text are part of the text ("Admission to major, minor or
+    certificate programs"), not operators. Text made only of filler words is dropped.
+    """
+    merged = []
+    for position, token in enumerate(tokens):
+        is_text = token[0] == "text"
+        if not is_text and token[0] in ("and", "or", ","):
+            before = merged[-1] if merged else None
+            after = tokens[position + 1] if position + 1 < len(tokens) else None
+            if before is not None and before[0] == "text" and after is not None and after[0] == "text":
+                token, is_text = ("text", token[0]), True
+        if is_text and merged and merged[-1][0] == "text":
+            separator = "" if token[1] == "," else " "
+            merged[-1] = ("text", merged[-1][1] + separator + token[1])
+        else:
+            merged.append(token)
+
+    result = []
+    for token in merged:
+        if token[0] == "text":
+            text = token[1].strip(" :")
+            if all(word.lower() in _FILLER_WORDS for word in text.split()):
+                continue
+            token = ("node", Condition(text))
+        result.append(token)
+    return result
+
+
+def _simplify(kind, items):
+    flat = []
+    for item in items:
+        if item is None:
+            continue
+        if isinstance(item, kind):
+            flat.extend(item.items)
+        elif item not in flat:
+            flat.append(item)
+    if not flat:
+        return None
+    return flat[0] if len(flat) == 1 else kind(tuple(flat))
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def parse_list(self):
+        # Comma separated parts: "A, B" needs both, "A, B, or C" and "A, or B, or C" are a choice between
+        # all of them, and "A and B, or C" is a choice between (A and B) and C
+        parts = [[]]
+        while self.peek() not in (None, ")"):
+            if self.peek() == ",":
+                self.position += 1
+                parts.append([])
+                continue
+            start = self.position
+            node = self.parse_or()
+            parts[-1].append((node, self.tokens[start][0]))
+            if self.position == start:
+                self.position += 1
+        nodes = [(part[0][1], _simplify(AllOf, [node for node, _ in part])) for part in parts if part]
+        if not nodes:
+            return None
+        last_kind, last = nodes[-1]
+        if last_kind == "or" and len(nodes) > 1:
+            earlier = [node for _, node in nodes[:-1]]
+            if (all(isinstance(node, (Course, Condition)) for node in earlier)
+                    or all(kind == "or" for kind, _ in nodes[1:])):
+                return _simplify(AnyOf, earlier + [last])
+            return _simplify(AnyOf, [_simplify(AllOf, earlier), last])
+        return _simplify(AllOf, [node for _, node in nodes])
+
+    def parse_or(self):
+        items = [self.parse_and()]
+        while self.peek() == "or":
+            self.position += 1
+            items.append(self.parse_and())
+        return _simplify(AnyOf, items)
+
+    def parse_and(self):
+        items = [self.parse_atom()]
+        while self.peek() in ("and", "node", "("):
+            if self.peek() == "and":
+                self.position += 1
+            items.append(self.parse_atom())
+        return _simplify(AllOf, items)
+
+    def parse_atom(self):
+        kind = self.peek()
+        if kind == "node":
+            node = self.tokens[self.position][1]
+            self.position += 1
+            return node
+        if kind == "(":
+            self.position += 1
+            node = self.parse_list()
+            if self.peek() == ")":
+                self.position += 1
+            return node
+        return None
+
+
+def parse_prerequisites(text, known_subjects=None):
+    """
+    Parses a PreReq string into an expression tree.
+
+    The string is split into clauses at semicolons and sentence ends; clauses that only give advice
+    (recommended courses, co-requisites, substitutions) go to notes, and the rest must all be met.
+    Minimum grade phrases ("with “C” (2.0) or better") are removed from the clauses and kept in notes,
+    so their "or" is not read as a choice.
+
+    Args:
+        text (str): A PreReq value; empty values and NaN give an empty Prerequisite.
+        known_subjects (set of str): Subject abbreviations of the catalog, to recognize "Geog 101".
+
+    Returns:
+        Prerequisite: The original text, the tree (or None) and the notes.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return Prerequisite("" if not isinstance(text, str) else text, None, ())
+
+    cleaned = " ".join(text.replace("\xa0", " ").split())
+    notes = []
+    for grade in _GRADE.findall(cleaned):
+        note = f"minimum grade {grade.upper()}"
+        if note not in notes:
+            notes.append(note)
+    cleaned = _GRADE.sub(" ", cleaned)
+
+    clauses = []
+    for clause in _CLAUSE_BREAK.split(cleaned):
+        clause = clause.strip()
+        if not clause:
+            continue
+        if _ADVISORY.search(clause):
+            notes.append(clause)
+            continue
+        clauses.append(_Parser(tokenize(clause, known_subjects)).parse_list())
+    return Prerequisite(text, _simplify(AllOf, clauses), tuple(notes))
+
+
+def course_leaves(tree):
+    """
+    Returns every Course ID in the tree, whether it is required or one of several choices.
+    """
+    if tree is None or isinstance(tree, Condition):
+        return set()
+    if isinstance(tree, Course):
+        return {tree.course_id}
+    return set().union(*(course_leaves(item) for item in tree.items))
+
+
+def required_courses(tree):
+    """
+    Returns the Course IDs needed in every way of meeting the tree (all of an AllOf, the common part of an AnyOf).
+    """
+    if tree is None or isinstance(tree, Condition):
+        return set()
+    if isinstance(tree, Course):
+        return {tree.course_id}
+    sets = [required_courses(item) for item in tree.items]
+    if isinstance(tree, AllOf):
+        return set().union(*sets)
+    return set.intersection(*sets)
+
+
+def format_tree(tree):
+    """
+    Formats a tree as a compact expression, e.g. (MATH 112 OR MATH 115) AND "consent".
+    """
+    if tree is None:
+        return "(none)"
+    if isinstance(tree, Course):
+        return tree.course_id
+    if isinstance(tree, Condition):
+        return f'"{tree.text}"'
+    joiner = " AND " if isinstance(tree, AllOf) else " OR "
+    return "(" + joiner.join(format_tree(item) for item in tree.items) + ")"
+
+
+def _csr(edge_lists):
+    indptr = np.zeros(len(edge_lists) + 1, dtype=np.int32)
+    indptr[1:] = np.cumsum([len(edges) for edges in edge_lists])
+    indices = np.fromiter((node for edges in edge_lists for node in edges), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def _closures(indptr, indices):
+    """
+    Returns, for every node, the sorted tuple of nodes reachable from it (cycles included once).
+    """
+    starts = indptr.tolist()
+    targets = indices.tolist()
+    closures = []
+    for node in range(len(starts) - 1):
+        seen = set()
+        queue = deque(targets[starts[node]:starts[node + 1]])
+        while queue:
+            current = queue.popleft()
+            if current in seen:
+                continue
+            seen.add(current)
+            queue.extend(targets[starts[current]:starts[current + 1]])
+        seen.discard(node)
+        closures.append(tuple(sorted(seen)))
+    return closures
+
+
+def compile_prerequisite_graph(prerequisites):
+    """
+    Compiles parsed prerequisites into a PrereqGraph.
+
+    Args:
+        prerequisites (dict): Course ID -> Prerequisite. Courses that only appear inside a tree become nodes too.
+
+    Returns:
+        PrereqGraph: The compiled graph.
+    """
+    course_ids = sorted(set(prerequisites).union(*(course_leaves(p.tree) for p in prerequisites.values())))
+    positions = {course_id: node for node, course_id in enumerate(course_ids)}
+
+    edges = []
+    required_edges = []
+    for course_id in course_ids:
+        tree = prerequisites[course_id].tree if course_id in prerequisites else None
+        edges.append(sorted(positions[leaf] for leaf in course_leaves(tree) if leaf != course_id))
+        required_edges.append(sorted(positions[leaf] for leaf in required_courses(tree) if leaf != course_id))
+
+    indptr, indices = _csr(edges)
+    required_indptr, required_indices = _csr(required_edges)
+    return PrereqGraph(
+        course_ids, positions, indptr, indices, required_indptr, required_indices,
+        _closures(indptr, indices), _closures(required_indptr, required_indices),
+    )
+
+
+def load_prerequisites(course_list=DEFAULT_COURSE_LIST):
+    """
+    Parses the PreReq column of a course list CSV (Course ID and PreReq columns).
+
+    Returns:
+    dict: Course ID -> Prerequisite.
+    """
+    courses = pd.read_csv(course_list, usecols=["Course ID", "PreReq"], dtype=str)
+    known_subjects = {course_id.split(" ")[0].upper() for course_id in courses["Course ID"]}
+    return {course_id: parse_prerequisites(text, known_subjects)
+            for course_id, text in zip(courses["Course ID"], courses["PreReq"])}
+
+
+def prerequisites_before(graph, course_id, required_only=False):
+    """
+    Returns every course that comes before course_id through its prerequisites, directly or indirectly.
+
+    Args:
+        graph (PrereqGraph): The compiled graph.
+        course_id (str): The course to look up.
+        required_only (bool): Follow only the courses needed in every alternative.
+
+    Returns:
+        list of str: Sorted Course IDs; empty for an unknown course.
+    """
+    node = graph.positions.get(course_id)
+    if node is None:
+        return []
+    closure = graph.required_closure if required_only else graph.closure
+    return [graph.course_ids[other] for other in closure[node]]
+
+
+def program_prerequisites(graph, course_ids, required_only=False):
+    """
+    Returns what must come before every course of a program.
+
+    Returns:
+    dict: Course ID -> sorted list of the Course IDs that come before it.
+    """
+    return {course_id: prerequisites_before(graph, course_id, required_only) for course_id in course_ids}
+
+
+def topological_order(graph, course_ids, required_only=False):
+    """
+    Orders courses so that every course comes after the prerequisites it has among them.
+
+    Courses in a prerequisite cycle are placed once everything else is, in Course ID order.
+
+    Args:
+        graph (PrereqGraph): The compiled graph.
+        course_ids (list of str): Courses to order, e.g. every course of a program.
+        required_only (bool): Order by required prerequisites only.
+
+    Returns:
+        list of str: The courses in a valid taking order; unknown courses come first.
+    """
+    indptr, indices = ((graph.required_indptr, graph.required_indices) if required_only
+                       else (graph.indptr, graph.indices))
+    closure = graph.required_closure if required_only else graph.closure
+    unknown = [course_id for course_id in course_ids if course_id not in graph.positions]
+    nodes = {graph.positions[course_id] for course_id in course_ids if course_id in graph.positions}
+
+    # Edges between the selected courses, also through prerequisites that are not selected
+    before = {node: set(closure[node]) & nodes for node in nodes}
+    waiting = {node: len(prior) for node, prior in before.items()}
+    after = {node: [] for node in nodes}
+    for node, prior in before.items():
+        for other in prior:
+            after[other].append(node)
+
+    ready = [node for node, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        node = heapq.heappop(ready)
+        order.append(node)
+        for other in after[node]:
+            waiting[other] -= 1
+            if waiting[other] == 0:
+                heapq.heappush(ready, other)
+    order.extend(sorted(nodes - set(order)))
+    return unknown + [graph.course_ids[node] for node in order]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse PreReq text and query the prerequisite graph.")
+    parser.add_argument("--courses", default=DEFAULT_COURSE_LIST, help=f"course list CSV (default: {DEFAULT_COURSE_LIST})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    parse = subparsers.add_parser("parse", help="print the expression tree of a PreReq string")
+    parse.add_argument("text")
+    before = subparsers.add_parser("before", help="print every course that comes before a course")
+    before.add_argument("course_id")
+    before.add_argument("--required", action="store_true", help="only courses needed in every alternative")
+    order = subparsers.add_parser("order", help="print courses in prerequisite order")
+    order.add_argument("course_ids", nargs="+")
+    order.add_argument("--required", action="store_true", help="order by required prerequisites only")
+    subparsers.add_parser("stats", help="print parse and query statistics for the course list")
+    args = parser.parse_args(argv)
+
+    if args.command == "parse":
+        prerequisite = parse_prerequisites(args.text)
+        print(format_tree(prerequisite.tree))
+        for note in prerequisite.notes:
+            print(f"note: {note}")
+        return 0
+
+    prerequisites = load_prerequisites(args.courses)
+    graph = compile_prerequisite_graph(prerequisites)
+    if args.command == "before":
+        print("\n".join(prerequisites_before(graph, args.course_id.upper(), args.required)))
+    elif args.command == "order":
+        print("\n".join(topological_order(graph, [course_id.upper() for course_id in args.course_ids], args.required)))
+    else:
+        with_courses = sum(1 for p in prerequisites.values() if course_leaves(p.tree))
+        text_only = sum(1 for p in prerequisites.values() if p.tree is not None and not course_leaves(p.tree))
+        print(f"{len(prerequisites)} courses: {with_courses} with course prerequisites, "
+              f"{text_only} with conditions only")
+        print(f"Graph: {len(graph.course_ids)} nodes, {len(graph.indices)} edges, "
+              f"{len(graph.required_indices)} required edges")
+        sample = graph.course_ids
+        seconds = min(timeit.repeat(lambda: [prerequisites_before(graph, c) for c in sample], number=1, repeat=5))
+        print(f"prerequisites_before: {seconds / len(sample) * 1e6:.2f} us per course")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# Description: Output stage of the Maximus script.
+# Rows are upserted into the output CSV by their Program value and the file is rewritten in Program order
+# through a temporary file that replaces the original in one step. Running a program again replaces its
+# row instead of appending a duplicate, and the file never needs a separate sort or cleanup pass.
+
+import io
+import os
+import csv
+import tempfile
+from contextlib import contextmanager
+from requirement_categories import HAND_FILLED_COLUMNS
+
+KEY_COLUMN = "Program"
+
+
+def read_program_rows(output_file, key_column=KEY_COLUMN):
+    """
+    Reads an existing output CSV into an index keyed by program.
+
+    When a program appears more than once (left over from append-mode runs) the last row wins.
+
+    Parameters:
+    output_file (str): Path to the output CSV file.
+    key_column (str): Column identifying a program.
+
+    Returns:
+    tuple: (list of column names, dict of program -> row dict). Both are empty if the file does not exist.
+    """
+    if not os.path.exists(output_file):
+        return [], {}
+
+    with open(output_file, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        columns = list(reader.fieldnames or [])
+        rows = {row[key_column]: row for row in reader}
+    return columns, rows
+
+
+def dataframe_to_rows(new_df, key_column=KEY_COLUMN):
+    """
+    Converts a DataFrame to CSV row dicts, with every cell formatted exactly as DataFrame.to_csv writes it.
+
+    Parameters:
+    new_df (pd.DataFrame): Rows to convert.
+    key_column (str): Column identifying a program.
+
+    Returns:
+    tuple: (list of column names, dict of program -> row dict)
+    """
+    reader = csv.DictReader(io.StringIO(new_df.to_csv(index=False)))
+    return list(reader.fieldnames or []), {row[key_column]: row for row in reader}
+
+
+def _file_mode(path):
+    """
+    Returns the permission bits of an existing file, or 0o666 minus the umask for a new one.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(output_file, mode="w", **kwargs):
+    """
+    Opens a temporary file next to output_file and moves it over output_file once the block finishes.
+
+    Readers see either the old file or the complete new one, never a partially written file.
+    If the block raises, the temporary file is removed and output_file is left untouched.
+    The new file gets the permissions of the file it replaces, or the usual ones for a new file
+    (mkstemp would leave it readable by the owner only).
+
+    Parameters:
+    output_file (str): Path of the file to replace.
+    mode (str): "w" for text or "wb" for binary.
+    **kwargs: Passed on to open (for example newline or encoding).
+    """
+    directory = os.path.dirname(os.path.abspath(output_file))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, _file_mode(output_file))
+        os.replace(temp_path, output_file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_rows_atomically(output_file, columns, rows):
+    """
+    Writes the CSV rows through atomic_open.
+
+    Parameters:
+    output_file (str): Path to the output CSV file.
+    columns (list of str): Header of the file.
+    rows (list of dict): Rows in the order they should be written.
+    """
+    with atomic_open(output_file, "w", newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def upsert_programs(new_df, output_file, key_column=KEY_COLUMN, hand_filled=HAND_FILLED_COLUMNS):
+    """
+    Adds or replaces the programs in new_df in the output CSV and keeps the file sorted by program.
+
+    Columns of new_df come first; columns only found in the existing file are kept after them and
+    left empty for the new rows.
+
+    Parameters:
+    new_df (pd.DataFrame): One row per program, as returned by extract_requirements.
+    output_file (str): Path to the output CSV file.
+    key_column (str): Column identifying a program.
+    hand_filled (list of tuple): (has column, list column) pairs filled in by hand; when a replaced row
+        already has a list there, both of its cells are kept.
+
+    Returns:
+    tuple: (number of programs added, number of programs replaced)
+    """
+    existing_columns, index = read_program_rows(output_file, key_column)
+    new_columns, new_rows = dataframe_to_rows(new_df, key_column)
+
+    columns = new_columns + [column for column in existing_columns if column not in new_columns]
+    replaced = sum(1 for program in new_rows if program in index)
+    for program, row in new_rows.items():
+        old_row = index.get(program, {})
+        for has_column, list_column in hand_filled:
+            if old_row.get(list_column):
+                row[has_column], row[list_column] = old_row.get(has_column, ""), old_row[list_column]
+    index.update(new_rows)
+
+    write_rows_atomically(output_file, columns, [index[program] for program in sorted(index)])
+    return len(new_rows) - replaced, replaced
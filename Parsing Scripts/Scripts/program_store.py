@@ -0,0 +1,185 @@
+# Description: Single-file Parquet store of the per-program ISRS CSVs, with a loader for one, some or all programs.
+# The rows of New_Work/Seperate_Programs_and_degrees-CSV_Files are written to one Parquet file sorted by
+# (ProgramName, Degree), with every (ProgramName, Degree) pair in its own row group. The file footer holds an
+# index from program to row group, so loading a program reads only that row group instead of scanning the
+# data. Low-cardinality text columns are stored dictionary-encoded and load as pandas categoricals.
+#
+# Requires pyarrow (pip install pyarrow).
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/program_store.py" build New_Work/Seperate_Programs_and_degrees-CSV_Files New_Work/Programs.parquet
+#   python "Parsing Scripts/Scripts/program_store.py" show New_Work/Programs.parquet "Accounting" BS
+#
+# From Python:
+#   load_programs("New_Work/Programs.parquet", [("Accounting", "BS"), "Art"], columns=["ProgramName", "Degree", "Course"])
+#   load_programs("New_Work/Programs.parquet", filters=[("Description", "==", "Major Common Core")])
+
+import os
+import sys
+import glob
+import json
+import argparse
+import pandas as pd
+from program_output import atomic_open
+from catalog_schema import CATALOG_COLUMNS
+
+DEFAULT_STORE = "New_Work/Programs.parquet"
+KEY_COLUMNS = ["ProgramName", "Degree"]
+INDEX_METADATA_KEY = b"program_store.index"
+
+INTEGER_COLUMNS = ["ProgID", "TotalCredits"]
+# Columns with few distinct values (a few hundred at most across the whole catalog)
+DICTIONARY_COLUMNS = [
+    "ProgramName", "Degree", "Program", "EmphasisName", "CatalogType", "CatalogYear", "Description",
+    "SeriesHeading", "Group_CategoryTitle", "GroupCredits", "SubjectAbbreviation", "Credits", "CoReq",
+    "DiverseCultures",
+]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Error: the program store needs pyarrow. Install it with: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def store_schema():
+    """
+    Returns the Arrow schema of the store.
+    """
+    pa, _ = _require_pyarrow()
+    fields = []
+    for column in CATALOG_COLUMNS:
+        if column in INTEGER_COLUMNS:
+            fields.append(pa.field(column, pa.int64()))
+        elif column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def read_program_csvs(source_dir):
+    """
+    Reads every program CSV in a folder into one DataFrame, keeping the cell text as it is in the files.
+
+    Parameters:
+    source_dir (str): Folder with the per-program CSV files.
+
+    Returns:
+    pd.DataFrame: All rows, in file name order.
+    """
+    files = sorted(glob.glob(os.path.join(source_dir, "*.csv")))
+    if not files:
+        raise FileNotFoundError(f"No CSV files found in {source_dir}")
+    catalog = pd.concat([pd.read_csv(file, dtype=str) for file in files], ignore_index=True)
+    for column in INTEGER_COLUMNS:
+        catalog[column] = pd.to_numeric(catalog[column]).astype("Int64")
+    return catalog[CATALOG_COLUMNS]
+
+
+def build_store(catalog, store_path=DEFAULT_STORE):
+    """
+    Writes the catalog to the store, one row group per (ProgramName, Degree) pair.
+
+    Parameters:
+    catalog (pd.DataFrame): Rows with the ISRS columns, as returned by read_program_csvs.
+    store_path (str): Path of the Parquet file to write. It is replaced atomically.
+
+    Returns:
+    int: Number of row groups (programs) written.
+    """
+    pa, pq = _require_pyarrow()
+    groups = list(catalog.groupby(KEY_COLUMNS, sort=True))
+    index = [[program, degree, row_group] for row_group, ((program, degree), _) in enumerate(groups)]
+
+    schema = store_schema().with_metadata({INDEX_METADATA_KEY: json.dumps(index).encode("utf-8")})
+    with atomic_open(store_path, "wb") as f:
+        with pq.ParquetWriter(f, schema, use_dictionary=DICTIONARY_COLUMNS, compression="zstd") as writer:
+            for _, group in groups:
+                writer.write_table(pa.Table.from_pandas(group, schema=schema, preserve_index=False))
+    return len(groups)
+
+
+def read_store_index(store_path=DEFAULT_STORE):
+    """
+    Returns the store's index as a dict of (ProgramName, Degree) -> row group number.
+    """
+    _, pq = _require_pyarrow()
+    metadata = pq.read_schema(store_path).metadata or {}
+    return {(program, degree): row_group for program, degree, row_group in json.loads(metadata[INDEX_METADATA_KEY])}
+
+
+def _row_groups_for(index, programs):
+    """
+    Resolves program selectors (a ProgramName, or a (ProgramName, Degree) pair) to row group numbers.
+    """
+    if isinstance(programs, (str, tuple)):
+        programs = [programs]
+    row_groups = []
+    for selector in programs:
+        if isinstance(selector, tuple):
+            matches = [index[selector]] if selector in index else []
+        else:
+            matches = [row_group for (program, _), row_group in index.items() if program == selector]
+        if not matches:
+            raise KeyError(f"Program not found in the store: {selector}")
+        row_groups.extend(matches)
+    return sorted(set(row_groups))
+
+
+def load_programs(store_path=DEFAULT_STORE, programs=None, columns=None, filters=None):
+    """
+    Loads rows from the store.
+
+    Parameters:
+    store_path (str): Path of the Parquet file.
+    programs (str, tuple or list): A ProgramName (all of its degrees), a (ProgramName, Degree) pair, or a list
+        of either. None loads every program.
+    columns (list of str): Columns to read; None reads all of them.
+    filters (list of tuple): Row filters in pyarrow form, e.g. [("Description", "==", "Major Common Core")].
+        Row groups whose statistics rule the filter out are skipped without being read.
+
+    Returns:
+    pd.DataFrame: The selected rows, sorted by (ProgramName, Degree), in the original order within a program.
+    """
+    _, pq = _require_pyarrow()
+    if programs is None:
+        table = pq.read_table(store_path, columns=columns, filters=filters)
+    else:
+        row_groups = _row_groups_for(read_store_index(store_path), programs)
+        read_columns = columns
+        if filters and columns is not None:
+            read_columns = list(columns) + [f[0] for f in filters if f[0] not in columns]
+        table = pq.ParquetFile(store_path).read_row_groups(row_groups, columns=read_columns)
+        if filters:
+            table = table.filter(pq.filters_to_expression(filters)).select(columns or table.column_names)
+    return table.to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or read the Parquet store of the per-program ISRS CSVs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="write every program CSV of a folder to the store")
+    build.add_argument("source_dir", help="folder with the per-program CSV files")
+    build.add_argument("store", nargs="?", default=DEFAULT_STORE, help=f"store file (default: {DEFAULT_STORE})")
+    show = subparsers.add_parser("show", help="print the rows of one program")
+    show.add_argument("store")
+    show.add_argument("program", help="ProgramName")
+    show.add_argument("degree", nargs="?", help="Degree (default: every degree of the program)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        catalog = read_program_csvs(args.source_dir)
+        count = build_store(catalog, args.store)
+        print(f"Wrote {len(catalog)} rows of {count} programs to {args.store} ({os.path.getsize(args.store)} bytes)")
+    else:
+        selector = (args.program, args.degree) if args.degree else args.program
+        print(load_programs(args.store, selector).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# Description: Reconciliation engine that diffs two course or program sources.
+# Both sources are reduced to one row per normalized key (Course ID or Program) and joined once, with a hash
+# lookup of one source's keys in the other's. The join gives the keys missing from the right source, the extra
+# keys only found there, and, for keys in both, every field whose values differ (title, credits, prereq, or any
+# shared column). All steps are column-wise operations, so catalogs with millions of rows are compared in seconds.
+#
+# Supported sources (detected from the CSV header, or forced with --left-kind / --right-kind):
+#   isrs     ISRS catalog export, or a folder of per-program CSVs (key: SubjectAbbreviation + CourseNumber)
+#   courses  cleaned_course_list.csv or any list with a "Course ID" column
+#   programs Final_Programs.csv / new_csv.csv (key: Program, every shared column is compared)
+#   Any other CSV can be compared with --left-key / --right-key naming its key column.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/reconcile.py" New_Work/Seperate_Programs_and_degrees-CSV_Files New_Work/Final_CSV_Files/cleaned_course_list.csv
+#   python "Parsing Scripts/Scripts/reconcile.py" "Parsing Scripts/Scripts/new_csv.csv" New_Work/Work_In_Progress/Final_Programs.csv -o report.csv
+
+import os
+import sys
+import glob
+import argparse
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from course_index import normalize_course_id
+
+# key:       how the key is built (a column name, or a list of columns joined with a space)
+# fields:    report field name -> source column
+# course_id: whether the key is a Course ID (normalized with course_index.normalize_course_id and reported
+#            that way); other keys are matched without case and extra whitespace but reported as written
+SourceKind = namedtuple("SourceKind", ["key", "fields", "course_id"])
+
+COURSE_FIELDS = {"title": "Title", "credits": "Credits", "prereq": "PreReq"}
+SOURCE_KINDS = {
+    "isrs": SourceKind(["SubjectAbbreviation", "CourseNumber"], COURSE_FIELDS, True),
+    "courses": SourceKind("Course ID", COURSE_FIELDS, True),
+    "programs": SourceKind("Program", None, False),
+}
+
+# name:   path the source was read from
+# keys:   normalized key of every row, as a Series aligned with fields
+# labels: key of every row as reported (the normalized Course ID, or the first spelling of any other key)
+# fields: DataFrame of the compared fields (report names as columns), one row per key
+Source = namedtuple("Source", ["name", "keys", "labels", "fields"])
+
+# missing:    keys only in the left source (column key)
+# extra:      keys only in the right source (column key)
+# mismatches: one row per differing field (columns key, field, left, right)
+# matched:    number of keys found in both sources
+ReconcileResult = namedtuple("ReconcileResult", ["missing", "extra", "mismatches", "matched"])
+
+
+def normalize_keys(keys, course_id=True):
+    """
+    Normalizes key values for matching. Course IDs go through course_index.normalize_course_id, so
+    " math  121\\xa0" and "MATH 121" are the same key; other keys have their whitespace collapsed and are
+    casefolded. Each distinct value is normalized once.
+    """
+    keys = keys.astype(str)
+    normalize = normalize_course_id if course_id else (lambda key: " ".join(key.split()).casefold())
+    return keys.map({key: normalize(key) for key in pd.unique(keys)})
+
+
+def normalize_values(values):
+    """
+    Normalizes field values for comparison only: whitespace is collapsed (and removed around list brackets and
+    commas), and numbers written as "3.0" compare equal to "3". The reported values stay as written.
+    """
+    text = values.fillna("").astype(str).str.replace(r'[\s\xa0]+', ' ', regex=True).str.strip()
+    text = text.str.replace(r'\s*([\[\],])\s*', r'\1', regex=True)
+    return text.str.replace(r'^(\d+)\.0+$', r'\1', regex=True)
+
+
+def detect_kind(columns):
+    """
+    Returns the source kind matching a CSV header, or None.
+    """
+    if "SubjectAbbreviation" in columns and "CourseNumber" in columns:
+        return "isrs"
+    if "Course ID" in columns:
+        return "courses"
+    if "Program" in columns:
+        return "programs"
+    return None
+
+
+def read_table(path):
+    """
+    Reads a CSV file, or every CSV file in a folder, with all cells as text (empty cells stay empty strings).
+    """
+    files = sorted(glob.glob(os.path.join(path, "*.csv"))) if os.path.isdir(path) else [path]
+    if not files:
+        raise FileNotFoundError(f"No CSV files found in {path}")
+    tables = [pd.read_csv(file, dtype=str, keep_default_na=False) for file in files]
+    return tables[0] if len(tables) == 1 else pd.concat(tables, ignore_index=True)
+
+
+def load_source(path, kind=None, key=None, fields=None):
+    """
+    Loads a source and reduces it to one row per normalized key (the first row of a key wins).
+
+    Parameters:
+    path (str): CSV file or folder of CSV files.
+    kind (str): One of SOURCE_KINDS; detected from the header when None and key is not given.
+    key (str): Key column, for sources that are not one of the known kinds.
+    fields (list of str): Fields to keep; None keeps all of the kind's fields (all other columns for
+        programs and custom keys).
+
+    Returns:
+    Source: The keyed source.
+    """
+    table = read_table(path)
+    if key is not None:
+        source_kind = SourceKind(key, None, False)
+    else:
+        kind = kind or detect_kind(table.columns)
+        if kind is None:
+            raise ValueError(f"Cannot tell what kind of source {path} is; pass its key column")
+        source_kind = SOURCE_KINDS[kind]
+
+    if isinstance(source_kind.key, list):
+        raw_keys = table[source_kind.key[0]].str.cat([table[column] for column in source_kind.key[1:]], sep=" ")
+    else:
+        raw_keys = table[source_kind.key]
+    key_columns = source_kind.key if isinstance(source_kind.key, list) else [source_kind.key]
+
+    # Without a field map, every other column is a field; Title/Credits/PreReq keep the course field names
+    course_names = {column: name for name, column in COURSE_FIELDS.items()}
+    field_columns = source_kind.fields or {course_names.get(column, column): column
+                                           for column in table.columns if column not in key_columns}
+    if fields is not None:
+        field_columns = {name: column for name, column in field_columns.items() if name in fields}
+    data = pd.DataFrame({name: table[column] for name, column in field_columns.items() if column in table.columns})
+
+    keys = normalize_keys(raw_keys, source_kind.course_id)
+    labels = keys if source_kind.course_id else raw_keys.astype(str).str.strip()
+    keep = ~keys.duplicated() & (keys != "")
+    data = data[keep.to_numpy()].reset_index(drop=True)
+    return Source(path, keys[keep].reset_index(drop=True), labels[keep].reset_index(drop=True), data)
+
+
+def reconcile(left, right, fields=None):
+    """
+    Diffs two sources in one join.
+
+    Parameters:
+    left (Source): The reference source.
+    right (Source): The source checked against it.
+    fields (list of str): Fields to compare; None compares every field the two sources share.
+
+    Returns:
+    ReconcileResult: Missing keys, extra keys and field mismatches.
+    """
+    shared = [field for field in left.fields.columns if field in right.fields.columns]
+    if fields is not None:
+        shared = [field for field in shared if field in fields]
+
+    # Keys are unique within a source, so one hash lookup of the right keys in the left ones is the whole join
+    positions = pd.Index(left.keys).get_indexer(right.keys)
+    in_left = positions >= 0
+    found = np.zeros(len(left.keys), dtype=bool)
+    found[positions[in_left]] = True
+
+    missing = pd.DataFrame({"key": np.sort(left.labels.to_numpy()[~found])})
+    extra = pd.DataFrame({"key": np.sort(right.labels.to_numpy()[~in_left])})
+    # Keys in both sources are reported as the reference source writes them
+    keys = left.labels.to_numpy()[positions[in_left]]
+    left_rows = positions[in_left]
+
+    mismatch_frames = []
+    for field in shared:
+        left_values = pd.Series(left.fields[field].to_numpy()[left_rows])
+        right_values = pd.Series(right.fields[field].to_numpy()[in_left])
+        # Only values that differ as written need the (slower) normalized comparison
+        candidates = (left_values.fillna("") != right_values.fillna("")).to_numpy()
+        if not candidates.any():
+            continue
+        left_values, right_values = left_values[candidates], right_values[candidates]
+        differs = (normalize_values(left_values) != normalize_values(right_values)).to_numpy()
+        if differs.any():
+            mismatch_frames.append(pd.DataFrame({
+                "key": keys[candidates][differs],
+                "field": field,
+                "left": left_values.to_numpy()[differs],
+                "right": right_values.to_numpy()[differs],
+            }))
+    columns = ["key", "field", "left", "right"]
+    mismatches = (pd.concat(mismatch_frames, ignore_index=True).sort_values(["key", "field"], kind="stable")
+                  .reset_index(drop=True) if mismatch_frames else pd.DataFrame(columns=columns))
+    return ReconcileResult(missing, extra, mismatches, int(in_left.sum()))
+
+
+def write_report(result, output_file):
+    """
+    Writes one CSV with a status column: missing (only in left), extra (only in right) or mismatch.
+    """
+    report = pd.concat([
+        result.missing.assign(status="missing"),
+        result.extra.assign(status="extra"),
+        result.mismatches.assign(status="mismatch"),
+    ], ignore_index=True)
+    report = report.reindex(columns=["status", "key", "field", "left", "right"])
+    report.to_csv(output_file, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report missing, extra and differing courses or programs between two sources.")
+    parser.add_argument("left", help="reference source (CSV file or folder of CSV files)")
+    parser.add_argument("right", help="source to check against it")
+    parser.add_argument("--left-kind", choices=sorted(SOURCE_KINDS), help="kind of the left source (default: detected)")
+    parser.add_argument("--right-kind", choices=sorted(SOURCE_KINDS), help="kind of the right source (default: detected)")
+    parser.add_argument("--left-key", help="key column of the left source, for other CSV layouts")
+    parser.add_argument("--right-key", help="key column of the right source, for other CSV layouts")
+    parser.add_argument("--fields", nargs="+", help="fields to compare (default: every shared field)")
+    parser.add_argument("-o", "--output", help="write the full report to this CSV file")
+    args = parser.parse_args(argv)
+
+    left = load_source(args.left, args.left_kind, args.left_key)
+    right = load_source(args.right, args.right_kind, args.right_key)
+    result = reconcile(left, right, args.fields)
+
+    print(f"{result.matched} key(s) in both, {len(result.missing)} only in {args.left}, "
+          f"{len(result.extra)} only in {args.right}, {len(result.mismatches)} field mismatch(es)")
+    if len(result.mismatches):
+        print(result.mismatches.groupby("field").size().to_string())
+    if args.output:
+        write_report(result, args.output)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
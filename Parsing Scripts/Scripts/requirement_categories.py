@@ -0,0 +1,143 @@
+# Description: Registry of the requirement categories the Maximus script looks for in the ISRS Description column.
+# Adding a category here adds its has*/*List column pair to the output; every category is matched by one
+# combined regular expression, so a Description is classified once no matter how many categories exist.
+
+import re
+import json
+import hashlib
+from collections import namedtuple
+
+# name:        short identifier of the category
+# keywords:    phrases that place a row in the category when found anywhere in its Description
+# has_column:  output column telling whether the program has the category at all
+# list_column: output column holding the program's courses for the category
+# list_kind:   "courses" for a credit list, or "names" for a list of names in the Final_Programs.csv shape
+#              (['ANY'], ['ANY_BUT', name, ...] or ['ANY_OF', name, ...]) that is filled in by hand
+RequirementCategory = namedtuple("RequirementCategory", ["name", "keywords", "has_column", "list_column", "list_kind"],
+                                 defaults=["courses"])
+
+# Categories in the order their columns are written to new_csv.csv (the order of Final_Programs.csv)
+REQUIREMENT_CATEGORIES = [
+    RequirementCategory(
+        "prereqToMajor",
+        ["Prerequisites to the Major"],
+        "hasPrereqToMajor", "prereqToMajorList",
+    ),
+    RequirementCategory(
+        "reqGenEds",
+        ["Required General Education", "General Electives"],
+        "hasReqGenEds", "reqGenEdsList",
+    ),
+    RequirementCategory(
+        "majorCommonCore",
+        ["Major Common Core", "Common Core", "Emphasis Common Core",
+         "Major Emphasis", "Major EmphasisHUMAN RESOURCE MANAGEMENT"],
+        "hasMajorCommonCore", "majorCommonCoreList",
+    ),
+    RequirementCategory(
+        "thesisCapstone",
+        ["Capstone Course"],
+        "hasThesisCapstone", "ChooseThesisCapstone",
+    ),
+    RequirementCategory(
+        "majorRestrictiveElectives",
+        ["Major Restricted Electives", "Emphasis Restricted Electives", "Restricted Electives"],
+        "hasMajorRestrictiveElectives", "majorRestrictiveElectivesList",
+    ),
+    RequirementCategory(
+        "majorUnrestrictedElectives",
+        ["Major Unrestricted Electives", "Emphasis Unrestricted Electives", "Major Unrestricted"],
+        "hasMajorUnrestrictedElectives", "majorUnrestrictedElectivesList",
+    ),
+    RequirementCategory(
+        "requiredMinor",
+        ["Required Minor", "Minor Required"],
+        "hasRequiredMinor", "minorName", "names",
+    ),
+    RequirementCategory(
+        "otherGradReq",
+        ["Other Graduation Requirements", "Research/Methods Course(s)"],
+        "hasOtherGradReq", "otherGradReq",
+    ),
+]
+
+# pattern:           combined regular expression over every keyword of every category
+# keyword_categories: matched keyword -> names of the categories it implies
+CategoryMatcher = namedtuple("CategoryMatcher", ["categories", "pattern", "keyword_categories"])
+
+
+def compile_category_matcher(categories=REQUIREMENT_CATEGORIES):
+    """
+    Compiles the keywords of all categories into a single regular expression.
+
+    The alternation sits inside a lookahead so a match is attempted at every position of the
+    Description, and longer keywords are tried first. A shorter keyword starting at the same
+    position is always a prefix of the longer one, so each keyword also carries the categories
+    of every keyword that is a prefix of it. Together this gives exactly the categories whose
+    keywords appear anywhere in the Description.
+
+    Args:
+        categories (list of RequirementCategory): The categories to match.
+
+    Returns:
+        CategoryMatcher: The compiled matcher.
+    """
+    names_by_keyword = {}
+    for category in categories:
+        for keyword in category.keywords:
+            names_by_keyword.setdefault(keyword, set()).add(category.name)
+
+    keywords = sorted(names_by_keyword, key=len, reverse=True)
+    keyword_categories = {}
+    for keyword in keywords:
+        implied = set()
+        for other in keywords:
+            if keyword.startswith(other):
+                implied |= names_by_keyword[other]
+        keyword_categories[keyword] = frozenset(implied)
+
+    pattern = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in keywords) + "))")
+    return CategoryMatcher(list(categories), pattern, keyword_categories)
+
+
+def match_categories(matcher, description):
+    """
+    Returns the names of every category whose keywords appear in the description.
+
+    Args:
+        matcher (CategoryMatcher): Matcher built by compile_category_matcher.
+        description (str): A Description value from the ISRS record.
+
+    Returns:
+        frozenset: Names of the matching categories.
+    """
+    names = set()
+    for match in matcher.pattern.finditer(description):
+        names |= matcher.keyword_categories[match.group(1)]
+    return frozenset(names)
+
+
+def fingerprint_categories(categories=REQUIREMENT_CATEGORIES):
+    """
+    Returns a hash of the category configuration (names, keywords and output columns).
+
+    Anything computed from the categories, such as cached extraction results, is only valid
+    while this hash stays the same.
+
+    Args:
+        categories (list of RequirementCategory): The categories to hash.
+
+    Returns:
+        str: Hex digest of the configuration.
+    """
+    config = [[category.name, list(category.keywords), category.has_column, category.list_column, category.list_kind]
+              for category in categories]
+    return hashlib.sha256(json.dumps(config).encode("utf-8")).hexdigest()
+
+
+# (has column, list column) of the categories filled in by hand. The ISRS rows only tell that a minor is
+# required, not which one, so the extraction writes ['ANY'] and a list already in the output is kept
+HAND_FILLED_COLUMNS = [(category.has_column, category.list_column)
+                       for category in REQUIREMENT_CATEGORIES if category.list_kind == "names"]
+
+DEFAULT_MATCHER = compile_category_matcher()
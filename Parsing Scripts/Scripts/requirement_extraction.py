@@ -0,0 +1,231 @@
+# Description: Requirement extraction engine used by the Maximus script (maximusV2.py).
+# The ISRS rows are grouped by program once and every has*/*List column is built in a single
+# pass, instead of rescanning the whole record once per program for every requirement category.
+
+import re
+import ast
+import numpy as np
+import pandas as pd
+from requirement_categories import DEFAULT_MATCHER, match_categories
+from catalog_schema import load_catalog
+
+
+def load_csv_to_dataframe(file_path):
+    """
+    Loads a CSV file into a Pandas DataFrame, with the ISRS column dtypes from catalog_schema.py.
+
+    Parameters:
+    file_path (str): The path to the CSV file.
+
+    Returns:
+    pd.DataFrame: A DataFrame containing the CSV data.
+    """
+    try:
+        df = load_catalog(file_path)
+        print("CSV file loaded successfully.")
+        return df
+    except Exception as e:
+        print(f"Error loading CSV file: {e}")
+        return None
+
+
+# Modify ProgramName to include Degree and EmphasisName when applicable
+# Row-wise version kept for reference and for benchmark_normalization.py; normalize_catalog does this for all rows at once
+def update_program_name(row):
+    if pd.notna(row['EmphasisName']):
+        return f"{row['ProgramName']} ({row['Degree']}) {row['EmphasisName']}"
+    return f"{row['ProgramName']} ({row['Degree']})"
+
+
+def clean_credit_list(credit_list):
+    """
+    Cleans the credit list by:
+    - Removing category notes from 'credits_X_CategoryNote', keeping only 'credits_X'.
+    - If 'credits_unknown' is detected, returns only the course names.
+    - Handles nested lists represented as strings and converts them to actual lists.
+
+    Args:
+        credit_list (list of lists or list of strings): A list where each sublist starts with a 'credits_X_CategoryNote' string.
+
+    Returns:
+        list: A cleaned list with properly formatted course data.
+    """
+    cleaned_list = []
+
+    for sublist in credit_list:
+        if isinstance(sublist, str):
+            try:
+                sublist = ast.literal_eval(sublist)  # Convert string representation to a list
+            except (SyntaxError, ValueError):
+                continue  # Skip invalid entries
+
+        if isinstance(sublist, list) and sublist:  # Ensure valid list
+            if sublist[0] == 'credits_unknown':
+                cleaned_list.extend(sublist[1:])  # Extract only course names
+
+            else:
+                parts = sublist[0].split('_')
+                cleaned_credit = parts[0] + "_" + parts[1] if len(parts) > 1 else sublist[0]
+                cleaned_list.append([cleaned_credit] + sublist[1:])  # Keep 'credits_X' format
+
+    return cleaned_list
+
+
+# Function to extract credit labels with category notes
+# Row-wise version kept for reference and for benchmark_normalization.py; normalize_catalog does this for all rows at once
+def extract_credits(description, category_note):
+    """
+    Extracts the first number from a 'Choose X Credit(s)' description and appends category notes to the label.
+
+    Args:
+        description (str): The input string containing the credit description.
+        category_note (str): The category note to append for distinction.
+
+    Returns:
+        str: A string in the format 'credits_X_categorynote' if category note exists,
+             otherwise 'credits_X'. Returns 'credits_unknown' if no number is found.
+    """
+    match = re.search(r'Choose\s*(\d+)', str(description))
+
+    if match:
+        credits = match.group(1)
+        category_suffix = f"_{category_note}" if category_note else ""
+        return f'credits_{credits}{category_suffix}'
+    else:
+        return 'credits_unknown'
+
+
+def _as_text(column):
+    """
+    Converts a column to strings the way an f-string would, so missing values become 'nan'.
+    """
+    return column.astype(object).fillna("nan").astype(str)
+
+
+def normalize_catalog(main_record):
+    """
+    Prepares the ISRS record for extraction with column-wise string operations.
+
+    - ProgramName gets the Degree and, when present, the EmphasisName appended
+      (same result as update_program_name).
+    - 'Course ID' holds 'SUBJ NUMBER' for every row.
+    - CreditLabel holds the 'credits_X_CategoryNote' label built from GroupCredits and
+      Group_CategoryNotes (same result as extract_credits).
+
+    Parameters:
+    main_record (pd.DataFrame): The ISRS rows as loaded from the CSV file.
+
+    Returns:
+    pd.DataFrame: The same DataFrame with the columns above updated or added.
+    """
+    emphasis = main_record["EmphasisName"]
+    emphasis_suffix = (" " + _as_text(emphasis)).where(emphasis.notna(), "")
+    main_record["ProgramName"] = (
+        _as_text(main_record["ProgramName"]) + " (" + _as_text(main_record["Degree"]) + ")" + emphasis_suffix
+    )
+
+    main_record["Course ID"] = _as_text(main_record["SubjectAbbreviation"]) + " " + _as_text(main_record["CourseNumber"])
+
+    credits = _as_text(main_record["GroupCredits"]).str.extract(r'Choose\s*(\d+)', expand=False)
+    notes = main_record["Group_CategoryNotes"]
+    notes = _as_text(notes).str.strip().where(notes.notna(), "")
+    note_suffix = ("_" + notes).where(notes != "", "")
+    main_record["CreditLabel"] = ("credits_" + credits + note_suffix).where(credits.notna(), "credits_unknown")
+
+    return main_record
+
+
+def classify_descriptions(descriptions, matcher=DEFAULT_MATCHER):
+    """
+    Matches every Description against every requirement category in one pass.
+
+    The catalog only uses a handful of distinct Description values, so each distinct value is
+    run through the combined category matcher once and the result is broadcast back to all rows.
+
+    Args:
+        descriptions (pd.Series): The Description column of the ISRS record.
+        matcher (CategoryMatcher): Compiled requirement categories.
+
+    Returns:
+        pd.DataFrame: One boolean column per category name, aligned with descriptions.
+    """
+    codes, uniques = pd.factorize(descriptions.fillna("").astype(str))
+    matched = [match_categories(matcher, desc) for desc in uniques]
+
+    return pd.DataFrame({
+        category.name: np.array([category.name in names for names in matched], dtype=bool)[codes]
+        for category in matcher.categories
+    }, index=descriptions.index)
+
+
+def group_requirement_rows(programs, category_matches, credit_labels, courses, matcher=DEFAULT_MATCHER):
+    """
+    Groups the matched course rows of every program, category and credit label in one pass.
+
+    Each row only counts towards its own program. Credit groups are kept in a dict keyed by
+    (program, category, credit_label), so finding a row's group is a single lookup rather than
+    a search through the groups collected so far.
+
+    Args:
+        programs (np.ndarray): ProgramName of each row.
+        category_matches (pd.DataFrame): Boolean category columns from classify_descriptions.
+        credit_labels (np.ndarray): Credit label of each row.
+        courses (np.ndarray): 'SUBJ NUMBER' string of each row.
+        matcher (CategoryMatcher): Compiled requirement categories.
+
+    Returns:
+        dict: (program, category name) -> list of [credit_label, course, course, ...] lists,
+              with labels in the order they first appear for that program and category.
+    """
+    category_names = [category.name for category in matcher.categories]
+    credit_groups = {}
+    requirement_lists = {}
+
+    rows, columns = np.nonzero(category_matches[category_names].to_numpy())
+    for row, column in zip(rows, columns):
+        program = programs[row]
+        category_name = category_names[column]
+        credit_label = credit_labels[row]
+
+        group = credit_groups.get((program, category_name, credit_label))
+        if group is None:
+            group = credit_groups[(program, category_name, credit_label)] = [credit_label]
+            requirement_lists.setdefault((program, category_name), []).append(group)
+        group.append(courses[row])
+
+    return requirement_lists
+
+
+def extract_requirements(main_record, matcher=DEFAULT_MATCHER):
+    """
+    Builds the Maximus output table (one row per program) from the ISRS record.
+
+    Args:
+        main_record (pd.DataFrame): The ISRS rows prepared by normalize_catalog.
+        matcher (CategoryMatcher): Compiled requirement categories.
+
+    Returns:
+        pd.DataFrame: Program column followed by a has*/*List column pair per category.
+    """
+    category_matches = classify_descriptions(main_record["Description"], matcher)
+    programs = main_record["ProgramName"].to_numpy()
+
+    courses = main_record["Course ID"].to_numpy(dtype=object)
+    credit_labels = main_record["CreditLabel"].to_numpy(dtype=object)
+
+    requirement_lists = group_requirement_rows(programs, category_matches, credit_labels, courses, matcher)
+
+    new_df = pd.DataFrame({"Program": pd.unique(programs)})
+    for category in matcher.categories:
+        # A program has a category exactly when at least one of its rows was grouped under it
+        credit_lists = [requirement_lists.get((program, category.name)) for program in new_df["Program"]]
+        new_df[category.has_column] = [credit_list is not None for credit_list in credit_lists]
+        if category.list_kind == "names":
+            # The rows hold courses, not the names; which minor is left to be filled in by hand
+            new_df[category.list_column] = [["ANY"] if credit_list is not None else None for credit_list in credit_lists]
+            continue
+        new_df[category.list_column] = [
+            clean_credit_list(credit_list) if credit_list is not None else None for credit_list in credit_lists
+        ]
+
+    return new_df
@@ -0,0 +1,365 @@
+# Description: Structured (JSON Lines) form of the Maximus output.
+# new_csv.csv stores each requirement list as the Python repr of a nested list, so every consumer has to
+# ast.literal_eval it back. The JSON Lines file written here holds the same data as plain JSON that loads
+# with no extra parsing, and converts back to the CSV layout without loss (has* cells are read as booleans, so
+# a stray " False" comes back as "False"; the check command reports any cell that changes).
+#
+# Schema (one JSON object per line, lines sorted by program):
+#
+#   {
+#     "schemaVersion": 1,
+#     "program": "Accounting (BS)",
+#     "requirements": {
+#       "<category name>": {                      # one entry per category in requirement_categories.py
+#         "present": true,                        # the has* column
+#         "groups": [                             # the *List column, null when the list cell is empty
+#           {"label": null,        "credits": null, "courses": ["ACCT 210", "BLAW 200"]},
+#           {"label": "credits_28", "credits": 28,  "courses": ["ACCT 220", "ACCT 300"]}
+#         ]
+#       },
+#       "requiredMinor": {"present": true, "names": ["ANY_BUT", "Computer Science"]}
+#     },
+#     "other": {"Notes": "checked by hand"},     # optional: cells of columns that belong to no category
+#     "columns": ["Program", "hasPrereqToMajor"] # optional: the header of the CSV the record was read from
+#   }
+#
+# A group with label null holds courses that are listed without a credit rule (the bare strings of the CSV
+# list); any other group is a "choose <credits> credits from courses" rule. Categories whose columns are
+# missing from a CSV are left out of "requirements". Hand-edited files (Final_Programs.csv) also contain items
+# that are neither, such as area-rule dicts or lists nested in a group; each is kept verbatim as
+# {"label": null, "credits": null, "courses": [], "raw": <item>} so the conversion stays lossless.
+# A category whose list holds names rather than courses (list_kind "names", only requiredMinor) has "names"
+# instead of "groups": the list exactly as in the CSV, or null.
+# Records read from a CSV keep its header in "columns", so to-csv writes the same columns in the same order
+# (Final_Programs.csv has no hasOtherGradReq column and names one list column after its category), and the
+# text of any other column in "other". A category without a has* column is "present" when its list is not empty.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/requirement_format.py" to-jsonl "Parsing Scripts/Scripts/new_csv.csv" programs.jsonl
+#   python "Parsing Scripts/Scripts/requirement_format.py" to-csv programs.jsonl new_csv.csv
+#   python "Parsing Scripts/Scripts/requirement_format.py" check New_Work/Work_In_Progress/Final_Programs.csv
+
+import io
+import re
+import ast
+import sys
+import json
+import argparse
+import pandas as pd
+from requirement_categories import REQUIREMENT_CATEGORIES
+from program_output import KEY_COLUMN, atomic_open
+
+SCHEMA_VERSION = 1
+
+
+def _is_plain_group(item):
+    return bool(item) and all(isinstance(member, str) for member in item)
+
+
+def credit_list_to_groups(credit_list):
+    """
+    Converts a cleaned credit list (bare course strings and [credits_X, course, ...] lists) to groups.
+
+    Consecutive bare courses are kept together in one group with label null.
+
+    Args:
+        credit_list (list): A list as produced by clean_credit_list.
+
+    Returns:
+        list of dict: Groups as described in the schema above.
+    """
+    groups = []
+    for item in credit_list:
+        if not isinstance(item, (list, str)) or isinstance(item, list) and not _is_plain_group(item):
+            groups.append({"label": None, "credits": None, "courses": [], "raw": item})
+        elif isinstance(item, list):
+            label = item[0]
+            match = re.fullmatch(r'credits_(\d+)', label)
+            groups.append({"label": label, "credits": int(match.group(1)) if match else None, "courses": list(item[1:])})
+        elif groups and groups[-1]["label"] is None:
+            groups[-1]["courses"].append(item)
+        else:
+            groups.append({"label": None, "credits": None, "courses": [item]})
+    return groups
+
+
+def groups_to_credit_list(groups):
+    """
+    Converts groups back to the cleaned credit list used in the CSV.
+
+    Args:
+        groups (list of dict): Groups as described in the schema above.
+
+    Returns:
+        list: Bare course strings and [credits_X, course, ...] lists.
+    """
+    credit_list = []
+    for group in groups:
+        if "raw" in group:
+            credit_list.append(group["raw"])
+        elif group["label"] is None:
+            credit_list.extend(group["courses"])
+        else:
+            credit_list.append([group["label"]] + list(group["courses"]))
+    return credit_list
+
+
+def _category_columns(categories):
+    return {column for category in categories for column in (category.has_column, category.list_column)}
+
+
+def row_to_record(row, categories=REQUIREMENT_CATEGORIES, columns=None):
+    """
+    Converts one output row (has* values as bools, *List values as lists or None) to a record.
+
+    Args:
+        row (dict): A row of the DataFrame returned by extract_requirements or read_requirement_csv.
+        categories (list of RequirementCategory): Categories to look for in the row.
+        columns (list of str): Header of the CSV the row was read from, kept in the record; None for
+            rows in the new_csv.csv layout.
+
+    Returns:
+        dict: The record described in the schema above.
+    """
+    requirements = {}
+    for category in categories:
+        if category.has_column not in row and category.list_column not in row:
+            continue
+        credit_list = row.get(category.list_column)
+        present = row[category.has_column] if category.has_column in row else bool(credit_list)
+        requirement = {"present": bool(present)}
+        if category.list_kind == "names":
+            requirement["names"] = list(credit_list) if isinstance(credit_list, list) else None
+        else:
+            requirement["groups"] = credit_list_to_groups(credit_list) if isinstance(credit_list, list) else None
+        requirements[category.name] = requirement
+    record = {"schemaVersion": SCHEMA_VERSION, "program": row[KEY_COLUMN], "requirements": requirements}
+    known = _category_columns(categories) | {KEY_COLUMN}
+    other = {column: value for column, value in row.items() if column not in known}
+    if other:
+        record["other"] = other
+    if columns is not None:
+        record["columns"] = list(columns)
+    return record
+
+
+def record_to_row(record, categories=REQUIREMENT_CATEGORIES):
+    """
+    Converts a record back to an output row, the inverse of row_to_record.
+
+    Args:
+        record (dict): A record described in the schema above.
+        categories (list of RequirementCategory): Categories in output column order.
+
+    Returns:
+        dict: The columns of record["columns"] in that order if the record has them, otherwise Program
+        followed by the has*/*List pair of every category present in the record and the other columns.
+    """
+    row = {KEY_COLUMN: record["program"]}
+    for category in categories:
+        requirement = record["requirements"].get(category.name)
+        if requirement is None:
+            continue
+        row[category.has_column] = requirement["present"]
+        if category.list_kind == "names":
+            row[category.list_column] = requirement["names"]
+            continue
+        groups = requirement["groups"]
+        row[category.list_column] = groups_to_credit_list(groups) if groups is not None else None
+    row.update(record.get("other", {}))
+    if "columns" not in record:
+        return row
+    # A list column named after its category (see read_requirement_csv) gets its value back under that name
+    renamed = {category.name: category.list_column for category in categories}
+    return {column: row.get(column, row.get(renamed.get(column))) for column in record["columns"]}
+
+
+def dataframe_to_records(new_df, categories=REQUIREMENT_CATEGORIES):
+    """
+    Converts the DataFrame returned by extract_requirements (or read_requirement_csv, whose header is kept
+    in every record) to records.
+    """
+    columns = new_df.attrs.get("columns")
+    return [row_to_record(row, categories, columns) for row in new_df.to_dict("records")]
+
+
+def records_to_dataframe(records, categories=REQUIREMENT_CATEGORIES):
+    """
+    Converts records to a DataFrame in the new_csv.csv layout, with real lists in the *List columns.
+    """
+    return pd.DataFrame([record_to_row(record, categories) for record in records])
+
+
+def read_requirement_csv(file_path, categories=REQUIREMENT_CATEGORIES, errors="raise"):
+    """
+    Reads a CSV in the new_csv.csv layout, turning has* cells into bools and *List cells into lists.
+
+    This is the one place the repr strings are parsed; afterwards the data can be stored as JSON Lines.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        categories (list of RequirementCategory): Categories whose columns should be converted.
+        errors (str): "raise" stops at the first list cell that cannot be parsed; "skip" drops the
+            programs with such cells and lists the error messages in df.attrs["invalid"].
+
+    Returns:
+        pd.DataFrame: The CSV data with typed has*/*List columns; df.attrs["columns"] is the header as read.
+
+    Raises:
+        ValueError: If a list cell is not a valid Python list literal and errors is "raise".
+    """
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    header = list(df.columns)
+    # Older outputs (Final_Programs.csv) name a list column after its category, e.g. majorUnrestrictedElectives
+    df = df.rename(columns={category.name: category.list_column for category in categories
+                            if category.list_column not in df.columns and category.name != category.has_column})
+    invalid = []
+    valid = pd.Series(True, index=df.index)
+    for category in categories:
+        if category.has_column in df.columns:
+            df[category.has_column] = df[category.has_column] == "True"
+        if category.list_column in df.columns:
+            values = []
+            for position, (cell, program) in enumerate(zip(df[category.list_column], df[KEY_COLUMN])):
+                try:
+                    values.append(_parse_list_cell(cell, program, category.list_column))
+                except ValueError as e:
+                    if errors != "skip":
+                        raise
+                    invalid.append(str(e))
+                    valid.iloc[position] = False
+                    values.append(None)
+            df[category.list_column] = values
+    if invalid:
+        df = df[valid].reset_index(drop=True)
+    df.attrs["invalid"] = invalid
+    df.attrs["columns"] = header
+    return df
+
+
+def _parse_list_cell(cell, program, column):
+    if not cell:
+        return None
+    try:
+        return ast.literal_eval(cell)
+    except (SyntaxError, ValueError) as e:
+        raise ValueError(f"Program {program}, column {column}: cannot parse {cell!r} ({e})") from None
+
+
+def check_round_trip(file_path, categories=REQUIREMENT_CATEGORIES):
+    """
+    Converts a CSV to records and back and compares the result with the file: the header must be the same
+    and so must every cell, list cells by their parsed value and all other cells by their text.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        categories (list of RequirementCategory): Categories whose columns are converted.
+
+    Returns:
+        tuple: (list of differences, list of messages about programs left out because a list cell cannot
+        be parsed)
+    """
+    df = read_requirement_csv(file_path, categories, errors="skip")
+    original = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    original = original[original[KEY_COLUMN].isin(df[KEY_COLUMN])].reset_index(drop=True)
+    back = records_to_dataframe(dataframe_to_records(df, categories), categories)
+    back = pd.read_csv(io.StringIO(back.to_csv(index=False)), dtype=str, keep_default_na=False)
+    if list(back.columns) != list(original.columns):
+        return [f"columns {list(original.columns)} came back as {list(back.columns)}"], df.attrs["invalid"]
+
+    list_columns = {column for category in categories for column in (category.list_column, category.name)}
+    differences = []
+    for column in original.columns:
+        for program, written, read_back in zip(original[KEY_COLUMN], original[column], back[column]):
+            if column in list_columns:
+                same = _parse_list_cell(written, program, column) == _parse_list_cell(read_back, program, column)
+            else:
+                same = written == read_back
+            if not same:
+                differences.append(f"Program {program}, column {column}: {written!r} came back as {read_back!r}")
+    return differences, df.attrs["invalid"]
+
+
+def read_jsonl(file_path):
+    """
+    Reads the records of a JSON Lines file.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_jsonl(records, file_path):
+    """
+    Writes records to a JSON Lines file sorted by program, replacing the file atomically.
+    """
+    with atomic_open(file_path, "w", encoding="utf-8", newline="\n") as f:
+        for record in sorted(records, key=lambda record: record["program"]):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def upsert_records(new_df, file_path, categories=REQUIREMENT_CATEGORIES):
+    """
+    Adds or replaces the programs of new_df in a JSON Lines file, the JSON counterpart of upsert_programs.
+
+    Returns:
+        tuple: (number of programs added, number of programs replaced)
+    """
+    try:
+        index = {record["program"]: record for record in read_jsonl(file_path)}
+    except FileNotFoundError:
+        index = {}
+
+    new_records = dataframe_to_records(new_df, categories)
+    replaced = sum(1 for record in new_records if record["program"] in index)
+    index.update((record["program"], record) for record in new_records)
+
+    write_jsonl(index.values(), file_path)
+    return len(new_records) - replaced, replaced
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Maximus output between CSV and JSON Lines.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_jsonl = subparsers.add_parser("to-jsonl", help="convert a new_csv.csv style file to JSON Lines")
+    to_jsonl.add_argument("input")
+    to_jsonl.add_argument("output")
+    to_jsonl.add_argument("--skip-invalid", action="store_true",
+                          help="leave out programs whose list cells cannot be parsed instead of stopping")
+    to_csv = subparsers.add_parser("to-csv", help="convert a JSON Lines file back to the CSV layout")
+    to_csv.add_argument("input")
+    to_csv.add_argument("output")
+    check = subparsers.add_parser("check", help="convert a CSV to JSON Lines and back in memory and report any cell that changes")
+    check.add_argument("input")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        differences, skipped = check_round_trip(args.input)
+        for message in skipped:
+            print(f"Skipped: {message}")
+        for message in differences:
+            print(f"Differs: {message}")
+        print(f"{len(differences)} difference(s) in the round trip of {args.input}")
+        return 1 if differences else 0
+
+    if args.command == "to-jsonl":
+        try:
+            df = read_requirement_csv(args.input, errors="skip" if args.skip_invalid else "raise")
+        except ValueError as e:
+            print(f"Error: {e} (use --skip-invalid to leave such programs out)")
+            return 1
+        for message in df.attrs["invalid"]:
+            print(f"Skipped: {message}")
+        records = dataframe_to_records(df)
+        write_jsonl(records, args.output)
+    else:
+        records = read_jsonl(args.input)
+        df = records_to_dataframe(sorted(records, key=lambda record: record["program"]))
+        with atomic_open(args.output, "w", newline='', encoding='utf-8') as f:
+            df.to_csv(f, index=False, lineterminator='\n')
+
+    print(f"Wrote {len(records)} program(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+# Description: Work queue that runs the Maximus extraction tranche by tranche from "Tranche 1-3.csv".
+# The tranche file has one column per tranche ("Tranche: 1 ...", "Tranche:  2", ...) listing ISRS program names
+# such as "Psychology - BS". Each name is matched to the per-program CSVs whose Program column holds it (a program
+# with emphases has several files); names without a file are reported with the closest known names. All files are
+# queued on one process pool in tranche order, so later tranches start as soon as workers are free instead of
+# waiting for the earlier ones to finish. Results are upserted into the output in checkpoints, and every
+# checkpointed file is appended to a journal (one JSON line, flushed to disk) with a hash of its content and of
+# the category configuration, taken when the file was queued, and the size and modification time of the output
+# after the checkpoint. An interrupted run therefore resumes where it stopped: files already in the journal are
+# skipped unless they or the categories changed since, and nothing counts as done once the output was deleted,
+# replaced or changed by anything else. Progress is printed per tranche with its throughput and ETA.
+#
+# Usage (from the repository root):
+#   python "Parsing Scripts/Scripts/tranche_queue.py" "Tranche 1-3.csv" --workers 4
+#   python "Parsing Scripts/Scripts/tranche_queue.py" "Tranche 1-3.csv" --tranches 2 3 --fresh
+
+import os
+import re
+import csv
+import sys
+import json
+import time
+import difflib
+import hashlib
+import argparse
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from requirement_categories import DEFAULT_MATCHER, fingerprint_categories
+from maximus_batch import DEFAULT_OUTPUT, find_program_files, process_file
+from extraction_cache import DEFAULT_CACHE_DIR, open_cache, evict
+from program_output import upsert_programs
+from course_programs import upsert_index
+
+DEFAULT_TRANCHES = "Tranche 1-3.csv"
+DEFAULT_PROGRAM_FILES = "New_Work/Seperate_Programs_and_degrees-CSV_Files"
+DEFAULT_CHECKPOINT_FILES = 20
+
+TRANCHE_HEADER = re.compile(r'^\s*Tranche:?\s*(\d+)', re.IGNORECASE)
+
+# tranche: tranche number as written in the header, e.g. "2"
+# program: program name as listed in the tranche file
+# file:    per-program CSV that holds the program's rows
+# key:     work_key of the file when it was queued (None until then)
+WorkItem = namedtuple("WorkItem", ["tranche", "program", "file", "key"], defaults=[None])
+
+# items:     WorkItems in tranche order, each file once
+# unmatched: (tranche, program, closest known program names) for names without a file
+WorkPlan = namedtuple("WorkPlan", ["items", "unmatched"])
+
+
+def normalize_program_name(name):
+    """
+    Reduces a program name to lower-case words, so "Post Bac  Communication Sciences & Disorders - CERT"
+    and "Post Bac Communication Sciences and Disorders - CERT" match.
+    """
+    return " ".join(re.sub(r'[^a-z0-9]+', ' ', name.casefold().replace("&", " and ")).split())
+
+
+def read_tranches(tranche_file):
+    """
+    Reads the tranche file.
+
+    Returns:
+    dict: Tranche number -> list of program names, in file order.
+    """
+    with open(tranche_file, newline='', encoding='utf-8-sig') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return {}
+    columns = {index: TRANCHE_HEADER.match(cell) for index, cell in enumerate(rows[0])}
+    tranches = {match.group(1): [] for match in columns.values() if match}
+    for row in rows[1:]:
+        for index, match in columns.items():
+            if match and index < len(row) and row[index].strip():
+                tranches[match.group(1)].append(" ".join(row[index].split()))
+    return tranches
+
+
+def map_program_files(inputs):
+    """
+    Maps normalized program names to the per-program CSVs holding them, from the Program column of each
+    file's first row.
+
+    Returns:
+    dict: Normalized program name -> (Program as written in the file, list of files)
+    """
+    programs = {}
+    for file_path in find_program_files(inputs):
+        with open(file_path, newline='', encoding='utf-8') as f:
+            row = next(csv.DictReader(f), None)
+        if row and row.get("Program"):
+            entry = programs.setdefault(normalize_program_name(row["Program"]), (row["Program"], []))
+            entry[1].append(file_path)
+    return programs
+
+
+def plan_work(tranches, program_files, selected=None):
+    """
+    Lists the files to process for the selected tranches. A program listed in two tranches is done in the first.
+
+    Parameters:
+    tranches (dict): As returned by read_tranches.
+    program_files (dict): As returned by map_program_files.
+    selected (list of str): Tranche numbers to include; None includes every tranche.
+
+    Returns:
+    WorkPlan: The work items and the program names that have no file.
+    """
+    known = [name for name, _ in program_files.values()]
+    items, unmatched, seen = [], [], set()
+    for tranche, programs in tranches.items():
+        if selected and tranche not in selected:
+            continue
+        for program in programs:
+            entry = program_files.get(normalize_program_name(program))
+            if entry is None:
+                unmatched.append((tranche, program, difflib.get_close_matches(program, known, n=3, cutoff=0.6)))
+                continue
+            for file_path in entry[1]:
+                if file_path not in seen:
+                    seen.add(file_path)
+                    items.append(WorkItem(tranche, program, file_path))
+    return WorkPlan(items, unmatched)
+
+
+def journal_path_for(output_file):
+    """
+    Returns the journal file that belongs to an output CSV.
+    """
+    return os.path.splitext(output_file)[0] + ".tranche_journal.jsonl"
+
+
+def work_key(file_path, matcher=DEFAULT_MATCHER):
+    """
+    Hashes a file's content together with the category configuration; a journal entry only counts while
+    both are unchanged.
+    """
+    digest = hashlib.sha256(fingerprint_categories(matcher.categories).encode("utf-8"))
+    with open(file_path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def output_identity(output_file):
+    """
+    Returns [size, modification time in ns] of the output, or None if it does not exist. Every checkpoint
+    rewrites the output, so this changes with each checkpoint and with any other change to the file.
+    """
+    try:
+        stat = os.stat(output_file)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def read_journal(journal_path, output_file):
+    """
+    Reads the journal entries of an output. A line cut off by an interrupted write is ignored, and so are
+    all entries when the output is no longer the one the last checkpoint wrote (deleted, replaced or edited).
+
+    Returns:
+    dict: File path -> work key of every checkpointed file.
+    """
+    done, identity = {}, None
+    output = os.path.abspath(output_file)
+    try:
+        with open(journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("output") == output:
+                    done[entry["file"]] = entry["key"]
+                    identity = entry.get("output_id")
+    except FileNotFoundError:
+        pass
+    return done if done and identity == output_identity(output_file) else {}
+
+
+class TrancheProgress:
+    """
+    Counts finished files per tranche and prints throughput and ETA. All tranches share the pool, so a
+    tranche's rate is the files it finished per second since the run started.
+    """
+
+    def __init__(self, items):
+        self.start = time.perf_counter()
+        self.total = {}
+        self.done = {}
+        for item in items:
+            self.total[item.tranche] = self.total.get(item.tranche, 0) + 1
+            self.done.setdefault(item.tranche, 0)
+
+    def finish(self, item, seconds, cached, error=None):
+        self.done[item.tranche] += 1
+        done, total = self.done[item.tranche], self.total[item.tranche]
+        elapsed = time.perf_counter() - self.start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        status = f"error: {error}" if error is not None else f"{seconds * 1000:.0f} ms" + (" (cached)" if cached else "")
+        print(f"[Tranche {item.tranche}] {done}/{total} {os.path.basename(item.file)}: {status} | "
+              f"{rate:.1f} file(s)/s, ETA {eta:.0f} s")
+
+
+def run_queue(items, output_file, journal_path, workers=1, cache=None, checkpoint_files=DEFAULT_CHECKPOINT_FILES,
+              matcher=DEFAULT_MATCHER):
+    """
+    Processes the work items on a process pool and checkpoints the results.
+
+    Every checkpoint upserts the finished programs into the output and its course -> program index, then
+    appends their files to the journal with the key they were queued with, so the journal never lists a file
+    whose rows are not in the output, nor a key of content other than the one that was processed.
+    On Ctrl-C the queued files are cancelled and the finished ones are still checkpointed.
+
+    Parameters:
+    items (list of WorkItem): Files to process, in the order they should start, with their keys.
+    output_file (str): Maximus output CSV.
+    journal_path (str): Journal file.
+    workers (int): Number of worker processes.
+    cache (ExtractionCache): Result cache, or None to always compute.
+    checkpoint_files (int): Finished files per checkpoint.
+    matcher (CategoryMatcher): Compiled requirement categories.
+
+    Returns:
+    tuple: (number of files checkpointed, number of files that failed)
+    """
+    import pandas as pd
+    progress = TrancheProgress(items)
+    pending_results, pending_items = [], []
+    checkpointed = failed = 0
+
+    def checkpoint():
+        nonlocal checkpointed
+        if not pending_items:
+            return
+        new_df = pd.concat(pending_results, ignore_index=True)
+        if not new_df.empty:
+            upsert_programs(new_df, output_file)
+            upsert_index(new_df, output_file)
+        output, identity = os.path.abspath(output_file), output_identity(output_file)
+        with open(journal_path, "a", encoding="utf-8") as journal:
+            for item in pending_items:
+                journal.write(json.dumps({"file": item.file, "key": item.key, "tranche": item.tranche,
+                                          "program": item.program, "output": output, "output_id": identity,
+                                          "finished": time.strftime("%Y-%m-%d %H:%M:%S")}) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        checkpointed += len(pending_items)
+        pending_results.clear()
+        pending_items.clear()
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(process_file, item.file, matcher, cache): item for item in items}
+        remaining = set(futures)
+        while remaining:
+            finished, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+            for future in finished:
+                item = futures[future]
+                try:
+                    new_df, seconds, cached = future.result()
+                except Exception as e:
+                    failed += 1
+                    progress.finish(item, 0.0, False, e)
+                    continue
+                progress.finish(item, seconds, cached)
+                pending_results.append(new_df)
+                pending_items.append(item)
+            if len(pending_items) >= checkpoint_files:
+                checkpoint()
+    except KeyboardInterrupt:
+        print("Interrupted; saving the finished files. Run again to resume.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        checkpoint()
+        executor.shutdown(wait=True, cancel_futures=True)
+    return checkpointed, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Maximus extraction tranche by tranche, resuming interrupted runs.")
+    parser.add_argument("tranches", nargs="?", default=DEFAULT_TRANCHES, help=f"tranche CSV (default: {DEFAULT_TRANCHES})")
+    parser.add_argument("--programs", nargs="+", default=[DEFAULT_PROGRAM_FILES],
+                        help=f"per-program CSV files or folders (default: {DEFAULT_PROGRAM_FILES})")
+    parser.add_argument("--tranches", dest="selected", nargs="+", metavar="N", help="only run these tranche numbers")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"output CSV file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--journal", help="checkpoint journal (default: next to the output, *.tranche_journal.jsonl)")
+    parser.add_argument("--fresh", action="store_true", help="ignore the journal and process every file again")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="number of worker processes, 0 for one per CPU (default: 1)")
+    parser.add_argument("--checkpoint-files", type=int, default=DEFAULT_CHECKPOINT_FILES,
+                        help="finished files per checkpoint (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the result cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"result cache directory (default: {DEFAULT_CACHE_DIR})")
+    args = parser.parse_args(argv)
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    journal_path = args.journal or journal_path_for(args.output)
+
+    if not os.path.exists(args.tranches):
+        print(f"Error: {args.tranches} not found.")
+        return 1
+    tranches = read_tranches(args.tranches)
+    plan = plan_work(tranches, map_program_files(args.programs), args.selected)
+    for tranche, program, suggestions in plan.unmatched:
+        hint = f" (closest: {'; '.join(suggestions)})" if suggestions else ""
+        print(f"[Tranche {tranche}] no program file for {program}{hint}")
+
+    if args.fresh and os.path.exists(journal_path):
+        os.remove(journal_path)
+    done = read_journal(journal_path, args.output)
+    # The key is taken before the file is read for processing, so an edit during the run is redone next time
+    items = [item._replace(key=work_key(item.file)) for item in plan.items]
+    items = [item for item in items if done.get(item.file) != item.key]
+    for tranche in dict.fromkeys(item.tranche for item in plan.items):
+        queued = sum(item.tranche == tranche for item in items)
+        total = sum(item.tranche == tranche for item in plan.items)
+        print(f"[Tranche {tranche}] {total} file(s), {total - queued} already done, {queued} queued")
+    if not items:
+        print("Nothing to do.")
+        return 0
+
+    cache = None if args.no_cache else open_cache(args.cache_dir)
+    start = time.perf_counter()
+    try:
+        checkpointed, failed = run_queue(items, args.output, journal_path, workers, cache, max(1, args.checkpoint_files))
+    except KeyboardInterrupt:
+        return 130
+    if cache is not None:
+        evict(cache)
+    print(f"Processed {checkpointed} file(s) ({failed} failed) with {workers} worker(s) in "
+          f"{time.perf_counter() - start:.2f} s; output {args.output}, journal {journal_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
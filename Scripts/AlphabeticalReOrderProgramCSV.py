@@ -1,4 +1,5 @@
 # Description: This script reads a CSV file, sorts the Program column alphabetically, and saves to a new file.
+# new_csv.csv no longer needs it: maximusV2.py and maximus_batch.py keep that file sorted by Program as they write it.
 
 import pandas as pd
 
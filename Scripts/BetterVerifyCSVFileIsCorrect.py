@@ -1,6 +1,5 @@
-import pandas as pd
-import ast
-import os 
+import os
+from requirement_list_validator import validate_csv, format_error
 # Prompt the user to input the file path
 input_file_path = input("Enter the path to the CSV file you want to verify: ")
 
@@ -9,21 +8,12 @@ if not os.path.exists(input_file_path):
     print(f"Error: The file '{input_file_path}' does not exist.")
     exit()
 
-# Read the CSV file
-df = pd.read_csv(input_file_path)
-possible_subgraphs=["prereqToMajorList","reqGenEdsList","majorCommonCoreList","ChooseThesisCapstone","majorRestrictiveElectivesList","majorUnrestrictedElectivesList"]            
-
-#this is a for loop
-for i, row in df.iterrows():
-    program_name = row["Program"]
-    #this is another for loop
-    for subgraph in possible_subgraphs:
-        required_course_list=row[subgraph]
-        #this is a if statment
-        if type(required_course_list)==str:
-            #this is a try catch block
-            try: 
-                required_course_list=ast.literal_eval(required_course_list)
-            except:
-                print(f"Program: {program_name} has error in following string: {required_course_list}")
+# Check every requirement list cell in one pass over the file
+#(requirement_list_validator.py parses the lists itself, so no ast.literal_eval is needed)
+errors = 0
+for error in validate_csv(input_file_path):
+    print(format_error(error))
+    errors += 1
 
+if errors == 0:
+    print(f"All requirement lists in '{input_file_path}' are valid.")
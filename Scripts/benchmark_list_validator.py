@@ -0,0 +1,91 @@
+# Description: Benchmark of requirement_list_validator against the bracket scan + ast.literal_eval check
+# of programValidationScript.ipynb. Both checks run over every list cell of the file; the cells are
+# repeated so the timings are not dominated by a handful of rows. Prints how often the two checks
+# disagree along with the timings.
+#
+# Usage (from the repository root):
+#   python Scripts/benchmark_list_validator.py [program CSV] [repeat count]
+
+import csv
+import ast
+import sys
+import timeit
+from requirement_list_validator import LIST_COLUMNS, validate_cell
+
+DEFAULT_FILE = "New_Work/Work_In_Progress/Final_Programs.csv"
+
+
+# --- The original check from programValidationScript.ipynb ---
+def is_balanced(s):
+    stack = []
+    brackets = {'[': ']', '{': '}', '(': ')'}
+    quotes = {"'": 0, '"': 0}
+
+    i = 0
+    while i < len(s):
+        char = s[i]
+        if char in quotes:
+            if i == 0 or s[i - 1] != '\\':
+                quotes[char] ^= 1
+        elif char in brackets:
+            stack.append(char)
+        elif char in brackets.values():
+            if not stack or brackets[stack.pop()] != char:
+                return False
+        i += 1
+    return not stack and all(v == 0 for v in quotes.values())
+
+
+def all_items_are_strings(obj):
+    if isinstance(obj, str):
+        return True
+    elif isinstance(obj, list):
+        return all(all_items_are_strings(item) for item in obj)
+    else:
+        return False
+
+
+def ast_check(cell):
+    if not is_balanced(cell):
+        return False
+    try:
+        parsed = ast.literal_eval(cell.strip())
+    except Exception:
+        return False
+    return isinstance(parsed, list) and all_items_are_strings(parsed)
+
+
+def tokenizer_check(cell):
+    return validate_cell(cell) is None
+
+
+def load_list_cells(file_path):
+    """
+    Returns every non-empty cell of the list columns, plus any other cell starting with '['.
+    """
+    cells = []
+    with open(file_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        for row in reader:
+            for column, cell in zip(header, row):
+                if (column in LIST_COLUMNS and cell.strip()) or cell.lstrip().startswith('['):
+                    cells.append(cell)
+    return cells
+
+
+if __name__ == "__main__":
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FILE
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cells = load_list_cells(file_path)
+    print(f"Loaded {len(cells)} list cells from {file_path}, checking each {repeat} times")
+
+    disagreements = [cell for cell in cells if ast_check(cell) != tokenizer_check(cell)]
+    print(f"{len(disagreements)} cell(s) where the two checks disagree")
+    for cell in disagreements:
+        print(f"    ast: {ast_check(cell)}, tokenizer: {tokenizer_check(cell)}: {cell[:80]!r}")
+
+    workload = cells * repeat
+    for name, function in [("ast", ast_check), ("tokenizer", tokenizer_check)]:
+        best = min(timeit.repeat(lambda: [function(cell) for cell in workload], number=1, repeat=5))
+        print(f"{name:>10}: {best * 1000:8.1f} ms ({best / len(workload) * 1e6:.1f} us per cell)")
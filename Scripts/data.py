@@ -1,25 +1,45 @@
 # OLD WORK FROM PREVIOUS TEAM
 # OLD AS OF 12-07-2024
+# Now a thin wrapper around reconcile.py (in Parsing Scripts/Scripts), which normalizes the Course IDs and compares
+# titles, credits and prerequisites as well. Writes the two lists the original script produced.
+#
+# Usage (from the repository root):
+#   python Scripts/data.py Undergraduate_Courses.csv "Final (Sorted and Reformatted).csv" [-o output folder]
 
-import pandas as pd
+import os
+import sys
+import argparse
 
-# Load the data
-isrs_courses = pd.read_csv(r"C:\Users\Araya\Desktop\software & parallel engineering\Undergraduate_Courses.csv")
-user_courses = pd.read_csv(r"C:\Users\Araya\Desktop\software & parallel engineering\Final (Sorted and Reformatted).csv")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Parsing Scripts", "Scripts"))
+from reconcile import load_source, reconcile
+
+parser = argparse.ArgumentParser(description="List the courses missing from the ISRS list or from the user list.")
+parser.add_argument("isrs_courses", help="ISRS course list (SUBJ_COU_NBR column, or any source reconcile.py knows)")
+parser.add_argument("user_courses", help="user course list (Course ID column)")
+parser.add_argument("-o", "--output-dir", default=".", help="folder for the two output CSV files (default: current folder)")
+args = parser.parse_args()
 
-isrs_courses['SUBJ_COU_NBR'] = isrs_courses['SUBJ_COU_NBR'].str.strip()
-user_courses['Course ID'] = user_courses['Course ID'].str.strip()
+# Load the data
+# A folder of per-program CSVs is an ISRS catalog export; only a single file can have the old SUBJ_COU_NBR header
+isrs_key = None
+if os.path.isfile(args.isrs_courses):
+    with open(args.isrs_courses, encoding="utf-8") as f:
+        isrs_key = "SUBJ_COU_NBR" if "SUBJ_COU_NBR" in f.readline() else None
+isrs_courses = load_source(args.isrs_courses, key=isrs_key)
+user_courses = load_source(args.user_courses)
+result = reconcile(isrs_courses, user_courses)
 
-missing_from_user = isrs_courses[~isrs_courses['SUBJ_COU_NBR'].isin(user_courses['Course ID'])]
-missing_from_user = missing_from_user[['SUBJ_COU_NBR']].rename(columns={'SUBJ_COU_NBR': 'Course ID'})
-missing_from_user.to_csv(r"C:\Users\Araya\Desktop\software & parallel engineering\Missing_Courses_From_User_List.csv", index=False)
+missing_from_user = result.missing.rename(columns={"key": "Course ID"})
+missing_from_user.to_csv(os.path.join(args.output_dir, "Missing_Courses_From_User_List.csv"), index=False)
 
-missing_from_isrs = user_courses[~user_courses['Course ID'].isin(isrs_courses['SUBJ_COU_NBR'])]
-missing_from_isrs = missing_from_isrs[['Course ID']]
-missing_from_isrs.to_csv(r"C:\Users\Araya\Desktop\software & parallel engineering\Missing_Courses_From_ISRS_List.csv", index=False)
+missing_from_isrs = result.extra.rename(columns={"key": "Course ID"})
+missing_from_isrs.to_csv(os.path.join(args.output_dir, "Missing_Courses_From_ISRS_List.csv"), index=False)
 
 print("File saved: 'Missing_Courses_From_User_List.csv'")
 print(f"Total missing courses from user list: {len(missing_from_user)}")
 
 print("File saved: 'Missing_Courses_From_ISRS_List.csv'")
-print(f"Total missing courses from ISRS list: {len(missing_from_isrs)}")
\ No newline at end of file
+print(f"Total missing courses from ISRS list: {len(missing_from_isrs)}")
+
+if len(result.mismatches):
+    print(f"{len(result.mismatches)} field(s) differ between the two lists; run Parsing Scripts/Scripts/reconcile.py with -o for the details")
@@ -1,25 +1,112 @@
 # This script differentiates between the "easy" and "hard" programs and creates a nice list of them
 # Easy basically means our scripts are able to run them "easily" without any manual intervention
 # Hard means that we need to manually check them before running our scripts
+#
+# A program is one (ProgramName, Degree) pair, so the BS and BA of the same program are classified separately.
+# It is hard when any of its rows has a Group_CategoryTitle or SeriesHeading. Every program also gets a
+# complexity score from its requirement structure (series, category groups, emphases, "Choose N" groups,
+# distinct notes and courses) to order the manual checks. The catalog is read through the columnar cache (catalog_cache.py),
+# so only the first run after the workbook changes pays for reading the xlsx.
+#
+# Usage (from the repository root):
+#   python Scripts/easyhard.py ["Data/2024-25_Academic_Program_Catalog_....xlsx" | catalog CSV] [-o output_dir]
 
+import os
+import sys
+import time
+import argparse
 import pandas as pd
 
-def categorize_files(input_file):
-    # Read the input CSV file
-    df = pd.read_excel(input_file)
-    
-    # Check if 'Group_CategoryTitle' or 'SeriesHeading' is empty
-    easy_df = df[df[['Group_CategoryTitle', 'SeriesHeading']].isnull().all(axis=1)][['ProgramName', 'Degree']]
-    hard_df = df[~df[['Group_CategoryTitle', 'SeriesHeading']].isnull().all(axis=1)][['ProgramName', 'Degree']]
-    
-    # Remove duplicates, keeping the first occurrence based on ProgramName
-    easy_df = easy_df.drop_duplicates(subset=['ProgramName'], keep='first')
-    hard_df = hard_df.drop_duplicates(subset=['ProgramName'], keep='first')
-    
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Parsing Scripts", "Scripts"))
+from catalog_cache import DEFAULT_CACHE_DIR, load_cached_catalog
+
+DEFAULT_INPUT = 'Data/2024-25_Academic_Program_Catalog_with_Courses_with_pre-req,_co-req_diverse_cultures_10-1-24.xlsx'
+KEY_COLUMNS = ['ProgramName', 'Degree']
+CLASSIFIER_COLUMNS = KEY_COLUMNS + ['EmphasisName', 'Description', 'SeriesHeading', 'Group_CategoryTitle',
+                                    'Group_CategoryNotes', 'GroupCredits', 'Course']
+
+# Weight of each per-program count in the complexity score
+COMPLEXITY_WEIGHTS = {
+    'Series': 3.0,
+    'CategoryGroups': 3.0,
+    'Emphases': 2.0,
+    'ChooseGroups': 1.0,
+    'Notes': 1.0,
+    'Courses': 0.05,
+}
+
+
+def classify_programs(df):
+    """
+    Classifies every program of the catalog in one groupby.
+
+    Parameters:
+    df (pd.DataFrame): Catalog rows with at least the CLASSIFIER_COLUMNS.
+
+    Returns:
+    pd.DataFrame: One row per (ProgramName, Degree) with the counts of COMPLEXITY_WEIGHTS, Rows,
+    ComplexityScore and Hard, most complex first.
+    """
+    structured = df['Group_CategoryTitle'].notna() | df['SeriesHeading'].notna()
+    # A "Choose N Credit(s)" group is one distinct GroupCredits value within one requirement Description
+    is_choose = df['GroupCredits'].astype('string').str.contains('Choose', na=False)
+    choose_group = (df['Description'].astype('string') + '|' + df['GroupCredits'].astype('string')).where(is_choose)
+
+    grouped = df.assign(_structured=structured, _choose_group=choose_group).groupby(KEY_COLUMNS, observed=True, sort=False)
+    programs = grouped.agg(
+        Rows=('Course', 'size'),
+        Courses=('Course', 'nunique'),
+        Series=('SeriesHeading', 'nunique'),
+        CategoryGroups=('Group_CategoryTitle', 'nunique'),
+        Emphases=('EmphasisName', 'nunique'),
+        ChooseGroups=('_choose_group', 'nunique'),
+        Notes=('Group_CategoryNotes', 'nunique'),
+        Hard=('_structured', 'any'),
+    ).reset_index()
+
+    weights = pd.Series(COMPLEXITY_WEIGHTS)
+    programs['ComplexityScore'] = programs[weights.index].mul(weights).sum(axis=1).round(2)
+    return programs.sort_values(['ComplexityScore'] + KEY_COLUMNS, ascending=[False, True, True],
+                                kind='stable').reset_index(drop=True)
+
+
+def categorize_files(input_file, output_dir='.', cache_dir=DEFAULT_CACHE_DIR, rebuild=False):
+    """
+    Writes easy.csv and hard.csv (ProgramName, Degree, ComplexityScore and the counts behind it).
+
+    Returns:
+    tuple: (number of easy programs, number of hard programs, whether the catalog cache was used)
+    """
+    df, cached = load_cached_catalog(input_file, CLASSIFIER_COLUMNS, cache_dir, rebuild)
+    programs = classify_programs(df)
+    columns = KEY_COLUMNS + ['ComplexityScore'] + list(COMPLEXITY_WEIGHTS) + ['Rows']
+    easy_df = programs.loc[~programs['Hard'], columns]
+    hard_df = programs.loc[programs['Hard'], columns]
+
     # Save to CSV files
-    easy_df.to_csv('easy.csv', index=False)
-    hard_df.to_csv('hard.csv', index=False)
+    os.makedirs(output_dir, exist_ok=True)
+    easy_df.to_csv(os.path.join(output_dir, 'easy.csv'), index=False)
+    hard_df.to_csv(os.path.join(output_dir, 'hard.csv'), index=False)
+    return len(easy_df), len(hard_df), cached
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split the catalog's programs into easy and hard ones.")
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT, help="catalog xlsx workbook or CSV export")
+    parser.add_argument("-o", "--output-dir", default=".", help="folder for easy.csv and hard.csv (default: current folder)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"catalog cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--rebuild", action="store_true", help="convert the catalog again even if the cache is valid")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print(f"Error: {args.input} not found.")
+        return 1
+    start = time.perf_counter()
+    easy, hard, cached = categorize_files(args.input, args.output_dir, args.cache_dir, args.rebuild)
+    print(f"{easy} easy and {hard} hard program(s) written to {args.output_dir} in "
+          f"{time.perf_counter() - start:.2f} s ({'cached catalog' if cached else 'catalog converted'})")
+    return 0
+
 
-# Example usage
-input_file = 'Data/2024-25_Academic_Program_Catalog_with_Courses_with_pre-req,_co-req_diverse_cultures_10-1-24.xlsx'  # Replace with the actual input file path
-categorize_files(input_file)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,125 @@
 # Description: This script will read the Academic Catalog file and create separate CSV files for each program and degree.
+# The catalog is streamed row by row and every row is appended to the file of its (ProgramName, Degree) pair, so
+# memory use does not grow with the size of the catalog. Only a limited number of output files are kept open;
+# when the limit is reached the least recently written one is closed and reopened in append mode if needed.
+#
+# Usage (from the repository root):
+#   python Scripts/main.py AcademicCatalog.csv
+#   python Scripts/main.py AcademicCatalog.csv -o New_Work/Seperate_Programs_and_degrees-CSV_Files --max-open-files 64
 
-import pandas as pd
 import os
+import csv
+import sys
+import argparse
+from collections import OrderedDict
 
-# Load the CSV file
-# path will differ per file system
-df = pd.read_csv("C:/Users/Snagg/Downloads/AcademicCatalog.csv")
+DEFAULT_OUTPUT_DIR = "New_Work/Seperate_Programs_and_degrees-CSV_Files"
+DEFAULT_MAX_OPEN_FILES = 64
 
-# Ensure that the path is correct to reflect the file system:
-# ***/New_Work/Seperate_Programs_and_degress-CSV_Files
-output_dir = "C:\Repos\LinsAutomationProject\Course-Catalog-Automation\SeperateProgramsCSVFiles"
-os.makedirs(output_dir, exist_ok=True)
 
-# Group by 'ProgramName' and 'Degree' and save each group as a separate CSV
-for (program, degree), group in df.groupby(["ProgramName", "Degree"]):
-    filename = f"{output_dir}/{program.replace('/', '_').replace(' ', '_')}_{degree.replace('/', '_').replace(' ', '_')}.csv"
-    group.to_csv(filename, index=False)
-    print(f"Saved: {filename}")
+def output_filename(output_dir, program, degree):
+    """
+    Returns the path of the CSV file for a program and degree, e.g. Accounting_BS.csv.
+    """
+    return f"{output_dir}/{program.replace('/', '_').replace(' ', '_')}_{degree.replace('/', '_').replace(' ', '_')}.csv"
+
+
+class WriterPool:
+    """
+    Keeps at most max_open CSV writers open, closing the least recently used one when another is needed.
+
+    A file is truncated and given the header the first time it is opened, and appended to afterwards.
+    """
+
+    def __init__(self, header, max_open=DEFAULT_MAX_OPEN_FILES):
+        self.header = header
+        self.max_open = max(1, max_open)
+        self.open_files = OrderedDict()
+        self.row_counts = {}
+
+    def writer(self, filename):
+        entry = self.open_files.get(filename)
+        if entry is not None:
+            self.open_files.move_to_end(filename)
+            return entry[1]
+
+        if len(self.open_files) >= self.max_open:
+            _, (oldest, _) = self.open_files.popitem(last=False)
+            oldest.close()
+
+        first_time = filename not in self.row_counts
+        f = open(filename, "w" if first_time else "a", newline='', encoding='utf-8')
+        writer = csv.writer(f, lineterminator='\n')
+        if first_time:
+            writer.writerow(self.header)
+            self.row_counts[filename] = 0
+        self.open_files[filename] = (f, writer)
+        return writer
+
+    def write(self, filename, row):
+        self.writer(filename).writerow(row)
+        self.row_counts[filename] += 1
+
+    def close(self):
+        while self.open_files:
+            _, (f, _) = self.open_files.popitem(last=False)
+            f.close()
+
+
+def split_catalog(catalog_file, output_dir=DEFAULT_OUTPUT_DIR, max_open_files=DEFAULT_MAX_OPEN_FILES):
+    """
+    Splits the catalog into one CSV file per (ProgramName, Degree) pair in a single pass.
+
+    Rows keep their original text and order. Rows without a ProgramName or Degree are skipped, as
+    DataFrame.groupby did before.
+
+    Parameters:
+    catalog_file (str): Path to the Academic Catalog CSV file.
+    output_dir (str): Folder the program files are written to.
+    max_open_files (int): Largest number of output files open at the same time.
+
+    Returns:
+    tuple: (dict of filename -> number of rows written, number of rows skipped)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    skipped = 0
+    with open(catalog_file, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        program_index = header.index("ProgramName")
+        degree_index = header.index("Degree")
+
+        pool = WriterPool(header, max_open_files)
+        try:
+            for row in reader:
+                if len(row) <= max(program_index, degree_index):
+                    skipped += 1
+                    continue
+                program, degree = row[program_index], row[degree_index]
+                if not program or not degree:
+                    skipped += 1
+                    continue
+                pool.write(output_filename(output_dir, program, degree), row)
+        finally:
+            pool.close()
+    return pool.row_counts, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split the Academic Catalog CSV into one CSV file per program and degree.")
+    parser.add_argument("catalog", help="path to AcademicCatalog.csv")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"folder for the program files (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--max-open-files", type=int, default=DEFAULT_MAX_OPEN_FILES,
+                        help=f"largest number of output files kept open at once (default: {DEFAULT_MAX_OPEN_FILES})")
+    args = parser.parse_args(argv)
+
+    row_counts, skipped = split_catalog(args.catalog, args.output_dir, args.max_open_files)
+    for filename in sorted(row_counts):
+        print(f"Saved: {filename} ({row_counts[filename]} rows)")
+    print(f"{len(row_counts)} program file(s) written, {skipped} row(s) without a program or degree skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
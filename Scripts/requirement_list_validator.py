@@ -0,0 +1,186 @@
+# Description: Validator for the requirement-list cells of new_csv.csv / Final_Programs.csv.
+# A list cell must be a Python-style list whose items are quoted strings or nested lists of the same kind,
+# for example ['ACCT 200', ['credits_3', 'PHIL 120W', 'PHIL 205W']]. The cells are checked with a small
+# tokenizer for exactly that grammar instead of a bracket/quote scan followed by ast.literal_eval, so every
+# error comes with the character offset where the cell stops being valid, and the whole file is checked in
+# one streaming pass over the rows.
+#
+# Usage (from the repository root):
+#   python Scripts/requirement_list_validator.py New_Work/Work_In_Progress/Final_Programs.csv
+
+import re
+import csv
+import ast
+import sys
+import argparse
+from collections import namedtuple
+
+# Columns holding requirement lists; any other cell is only checked when it starts with '['
+LIST_COLUMNS = [
+    "prereqToMajorList", "reqGenEdsList", "majorCommonCoreList", "ChooseThesisCapstone",
+    "majorRestrictiveElectivesList", "majorUnrestrictedElectivesList", "majorUnrestrictedElectives",
+    "otherGradReq", "minorName",
+]
+
+# row:     line number of the row in the file (the header is line 1)
+# program: Program value of the row
+# column:  name of the column holding the cell
+# offset:  index of the first invalid character within the cell
+# message: what was expected at that offset
+CellError = namedtuple("CellError", ["row", "program", "column", "offset", "message"])
+
+# One token, after optional whitespace: a bracket, a comma or a complete quoted string
+_TOKEN = re.compile(r"""[ \t\r\n]*(?:(\[)|(\])|(,)|('(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"))""")
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+class ListCellError(ValueError):
+    """
+    Raised by parse_list_cell; offset is the index of the first invalid character of the cell.
+    """
+
+    def __init__(self, offset, message):
+        super().__init__(f"offset {offset}: {message}")
+        self.offset = offset
+        self.message = message
+
+
+def parse_list_cell(text):
+    """
+    Parses a requirement-list cell into nested lists of strings.
+
+    Only brackets, commas, whitespace and quoted strings are accepted. Unlike ast.literal_eval this
+    rejects adjacent strings with no comma between them ('A' 'B'), which Python would silently join.
+
+    Args:
+        text (str): The cell text.
+
+    Returns:
+        list: The parsed list.
+
+    Raises:
+        ListCellError: If the cell is not a valid list of strings.
+    """
+    stack = []
+    expect_item = True
+    position = 0
+    end = len(text)
+
+    while True:
+        match = _TOKEN.match(text, position)
+        if match is None:
+            offset = _WHITESPACE.match(text, position).end()
+            if offset == end:
+                if not stack:
+                    raise ListCellError(offset, "empty cell, expected '['")
+                raise ListCellError(offset, f"missing ']' ({len(stack)} list(s) still open)")
+            found = text[offset]
+            if found in "'\"":
+                raise ListCellError(offset, "string is never closed")
+            if not stack:
+                raise ListCellError(offset, f"expected '[', found {found!r}")
+            if expect_item:
+                raise ListCellError(offset, f"expected a quoted string or '[', found {found!r}")
+            raise ListCellError(offset, f"expected ',' or ']', found {found!r}")
+
+        opening, closing, comma, string = match.groups()
+        offset = match.end() - 1 if string is None else match.start(4)
+
+        if not stack and opening is None:
+            raise ListCellError(offset, f"expected '[', found {text[offset]!r}")
+
+        if opening is not None or string is not None:
+            if not expect_item:
+                raise ListCellError(offset, "missing ',' between items")
+            if opening is not None:
+                stack.append([])
+                expect_item = True
+            else:
+                stack[-1].append(string[1:-1] if "\\" not in string else ast.literal_eval(string))
+                expect_item = False
+        elif comma is not None:
+            if expect_item:
+                raise ListCellError(offset, "expected a quoted string or '[', found ','")
+            expect_item = True
+        else:
+            # A trailing comma before ']' is allowed, as in Python
+            items = stack.pop()
+            if not stack:
+                rest = _WHITESPACE.match(text, match.end()).end()
+                if rest != end:
+                    raise ListCellError(rest, "unexpected text after the closing ']'")
+                return items
+            stack[-1].append(items)
+            expect_item = False
+
+        position = match.end()
+
+
+def validate_cell(text):
+    """
+    Returns None when the cell is a valid list of strings, otherwise (offset, message).
+    """
+    try:
+        parse_list_cell(text)
+    except ListCellError as e:
+        return e.offset, e.message
+    return None
+
+
+def validate_csv(file_path, list_columns=LIST_COLUMNS, key_column="Program"):
+    """
+    Checks the list cells of a CSV file row by row.
+
+    Cells in list_columns are checked when they are not empty; cells of other columns are checked
+    when they start with '['.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        list_columns (list of str): Columns that must hold lists.
+        key_column (str): Column naming the program of a row.
+
+    Yields:
+        CellError: One entry for every invalid cell.
+    """
+    list_columns = set(list_columns)
+    with open(file_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        key_index = header.index(key_column) if key_column in header else 0
+        row_start = reader.line_num + 1
+        for row in reader:
+            program = row[key_index] if key_index < len(row) else ""
+            for column, cell in zip(header, row):
+                if column in list_columns:
+                    if not cell.strip():
+                        continue
+                elif not cell.lstrip().startswith('['):
+                    continue
+                error = validate_cell(cell)
+                if error is not None:
+                    yield CellError(row_start, program, column, error[0], error[1])
+            row_start = reader.line_num + 1
+
+
+def format_error(error):
+    """
+    Formats a CellError on one line.
+    """
+    return f"Row {error.row}, Program {error.program}, column {error.column}, offset {error.offset}: {error.message}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the requirement-list cells of a program CSV file.")
+    parser.add_argument("file", help="CSV file to check, e.g. New_Work/Work_In_Progress/Final_Programs.csv")
+    args = parser.parse_args(argv)
+
+    errors = 0
+    for error in validate_csv(args.file):
+        print(format_error(error))
+        errors += 1
+    print(f"{errors} invalid cell(s) in {args.file}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())